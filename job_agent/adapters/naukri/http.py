@@ -2,6 +2,7 @@ import requests
 from typing import Optional
 from job_agent.models.config import RequestCfg
 from job_agent.adapters.rate_limiter import RateLimiter
+from job_agent.core import deadline
 
 class NaukriHTTPClient:
     """HTTP client for Naukri.com with rate limiting."""
@@ -14,10 +15,19 @@ class NaukriHTTPClient:
             "User-Agent": cfg.user_agent,
         })
     
-    def get(self, url: str) -> requests.Response:
-        """Fetch a URL with rate limiting."""
+    def get(self, url: str, stream: bool = False) -> requests.Response:
+        """Fetch a URL with rate limiting, within the current cycle's deadline.
+        
+        With ``stream`` only the headers are read; the caller reads the body
+        with ``iter_content`` and must close the response.
+        """
         self.rate_limiter.wait_if_needed()
-        response = self.session.get(url, timeout=self.cfg.timeout_seconds)
-        response.raise_for_status()
+        timeout = deadline.current().timeout(self.cfg.timeout_seconds)
+        response = self.session.get(url, timeout=timeout, stream=stream)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
         return response
 
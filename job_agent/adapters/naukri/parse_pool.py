@@ -0,0 +1,83 @@
+"""Parsing result pages in worker processes.
+
+BeautifulSoup parsing is CPU-bound and holds the GIL, so pages fetched in
+parallel threads are still parsed one at a time. ``ParsePool`` ships the
+raw page bytes to a process pool instead; each worker builds its
+``NaukriParser`` once, in the pool initializer, and returns jobs as plain
+tuples, which pickle smaller and faster than dataclass instances.
+
+Pages under ``process_min_bytes`` are parsed inline: for those, pickling
+and the round trip cost more than the parse itself. Workers are started
+with ``spawn`` because the agent forks from a process that already runs
+scheduler and fetch threads. Waiting for a worker is bounded by the current
+deadline. If a worker dies (e.g. OOM-killed), the broken pool is dropped,
+the page is parsed inline, and the next large page starts a fresh pool.
+"""
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as ResultTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+from job_agent.adapters.naukri.parser import NaukriParser
+from job_agent.core import deadline
+from job_agent.core.deadline import DeadlineExceeded
+from job_agent.models.config import ParsingCfg
+from job_agent.models.job import JobPosting
+
+log = logging.getLogger("job_agent.naukri")
+
+# Per-process parser, built once by the pool initializer.
+_worker_parser: Optional[NaukriParser] = None
+
+def _init_worker(cfg: ParsingCfg):
+    global _worker_parser
+    _worker_parser = NaukriParser(cfg)
+
+def _parse_in_worker(content: bytes, encoding: Optional[str], base_url: str) -> List[tuple]:
+    return [
+        (j.source, j.title, j.company, j.location, j.url, j.posted_text, j.description, j.search_url)
+        for j in _worker_parser.parse_jobs(content, base_url, encoding)
+    ]
+
+class ParsePool:
+    """Parses large pages in ``cfg.processes`` worker processes, small ones inline."""
+
+    def __init__(self, cfg: ParsingCfg, parser: Optional[NaukriParser] = None):
+        self.cfg = cfg
+        self.parser = parser or NaukriParser(cfg)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def parse(self, content: bytes, encoding: Optional[str], base_url: str) -> List[JobPosting]:
+        if len(content) < self.cfg.process_min_bytes:
+            return self.parser.parse_jobs(content, base_url, encoding)
+        pool = self._pool
+        if pool is None:
+            # Started on the first large page, so configs that never need it never pay for it.
+            pool = self._pool = ProcessPoolExecutor(
+                max_workers=self.cfg.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.cfg,),
+            )
+        try:
+            future = pool.submit(_parse_in_worker, content, encoding, base_url)
+            rows = future.result(timeout=deadline.current().remaining())
+        except ResultTimeout:
+            future.cancel()
+            raise DeadlineExceeded(f"deadline reached while parsing {base_url}") from None
+        except BrokenProcessPool as e:
+            log.warning(f"Parse worker pool broke ({e}); restarting it and parsing {base_url} inline")
+            self._discard(pool)
+            return self.parser.parse_jobs(content, base_url, encoding)
+        return [JobPosting(*row) for row in rows]
+
+    def _discard(self, pool: ProcessPoolExecutor):
+        # Fetch-ahead threads share the pool: only the first to notice replaces it.
+        if self._pool is pool:
+            self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
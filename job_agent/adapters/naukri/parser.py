@@ -1,5 +1,7 @@
+import re
 from bs4 import BeautifulSoup
-from typing import List, Optional
+from typing import List, Optional, Union
+from urllib.parse import urljoin
 from job_agent.models.job import JobPosting
 from job_agent.models.config import ParsingCfg
 
@@ -8,10 +10,12 @@ class NaukriParser:
     
     def __init__(self, cfg: ParsingCfg):
         self.cfg = cfg
+        # Compiled up front so unsupported selectors fail at startup, not on every page.
+        self._stream_selectors = StreamSelectors(cfg) if cfg.streaming else None
     
-    def parse_jobs(self, html: str, base_url: str = "") -> List[JobPosting]:
-        """Parse job listings from HTML."""
-        soup = BeautifulSoup(html, "lxml")
+    def parse_jobs(self, html: Union[str, bytes], base_url: str = "", encoding: Optional[str] = None) -> List[JobPosting]:
+        """Parse job listings from HTML text, or raw bytes in ``encoding`` (sniffed if None)."""
+        soup = BeautifulSoup(html, "lxml", from_encoding=encoding if isinstance(html, bytes) else None)
         jobs = []
         
         # Find all job cards
@@ -47,6 +51,7 @@ class NaukriParser:
             url=url,
             posted_text=posted_text or "",
             description="",  # Description would need separate fetch
+            search_url=base_url,
         )
     
     def _extract_text(self, element, selectors: List[str]) -> str:
@@ -66,13 +71,150 @@ class NaukriParser:
             if found:
                 href = found.get("href", "")
                 if href:
-                    if href.startswith("http"):
-                        return href
-                    elif base_url:
-                        # Relative URL
-                        from urllib.parse import urljoin
-                        return urljoin(base_url, href)
-                    else:
-                        return href
+                    return _absolute(href, base_url)
         return ""
+    
+    def feed_parser(self, base_url: str = "", encoding: Optional[str] = None) -> "NaukriFeedParser":
+        """Incremental parser for one page, fed raw bytes as they arrive."""
+        return NaukriFeedParser(self._stream_selectors or StreamSelectors(self.cfg), base_url, encoding)
+
+def _absolute(href: str, base_url: str) -> str:
+    if href.startswith("http") or not base_url:
+        return href
+    return urljoin(base_url, href)  # relative URL
+
+class SimpleSelector:
+    """A CSS compound selector without combinators: ``tag``, ``.class`` and ``[attr]`` parts.
+    
+    The streaming parser works on lxml elements, which have no CSS engine
+    without the cssselect package, and only ever tests one element at a time.
+    """
+    
+    _RE = re.compile(r"([a-zA-Z][\w-]*)?((?:\.[\w-]+)*)((?:\[[\w-]+\])*)")
+    
+    def __init__(self, selector: str):
+        m = self._RE.fullmatch(selector.strip())
+        if not m or not selector.strip():
+            raise ValueError(f"Streaming parse supports tag, .class and [attr] selectors only, not {selector!r}")
+        self.tag = m.group(1).lower() if m.group(1) else None
+        self.classes = set(re.findall(r"\.([\w-]+)", m.group(2)))
+        self.attrs = re.findall(r"\[([\w-]+)\]", m.group(3))
+    
+    def matches(self, el) -> bool:
+        if not isinstance(el.tag, str) or (self.tag and el.tag != self.tag):
+            return False
+        if self.classes and not self.classes.issubset((el.get("class") or "").split()):
+            return False
+        return all(el.get(a) is not None for a in self.attrs)
+    
+    def first(self, root):
+        """First matching descendant in document order, like BeautifulSoup's ``select_one``."""
+        return next((el for el in root.iterdescendants() if self.matches(el)), None)
+
+class StreamSelectors:
+    """The parsing config's selectors, compiled for the streaming parser."""
+    
+    def __init__(self, cfg: ParsingCfg):
+        self.cards = [SimpleSelector(s) for s in cfg.card_selectors]
+        self.fields = {
+            name: [SimpleSelector(s) for s in getattr(cfg, f"{name}_selectors")]
+            for name in ("title", "company", "location", "posted", "url")
+        }
+        self.results = SimpleSelector(cfg.results_selector) if cfg.results_selector else None
+
+class NaukriFeedParser:
+    """Parses a results page incrementally, returning each job card as soon as it closes.
+    
+    Raw bytes go into an lxml ``HTMLPullParser``. Cards matching the first
+    card selector are returned from the ``feed`` call in which they end, then
+    cleared (with their parsed siblings) so the tree never holds more than
+    about one card. Cards matching later selectors are kept back and used,
+    as with ``parse_jobs``, only if the first selector matched nothing.
+    Once the ``results_selector`` element closes, ``done`` is set and the
+    rest of the page need not be read.
+    """
+    
+    def __init__(self, selectors: StreamSelectors, base_url: str = "", encoding: Optional[str] = None):
+        from lxml import etree
+        
+        self.base_url = base_url
+        self.done = False
+        self._cards = selectors.cards
+        self._fields = selectors.fields
+        self._results = selectors.results
+        self._parser = etree.HTMLPullParser(events=("end",), encoding=encoding)
+        self._found_first = False
+        self._fallback: List[List[JobPosting]] = [[] for _ in self._cards[1:]]
+    
+    def feed(self, data: bytes) -> List[JobPosting]:
+        """Parse the next chunk; returns jobs whose cards ended in it."""
+        if self.done:
+            return []
+        self._parser.feed(data)
+        return self._drain()
+    
+    def close(self) -> List[JobPosting]:
+        """End of page: returns remaining jobs, or the fallback selector's cards if the first matched none."""
+        jobs = []
+        if not self.done:
+            self._parser.close()
+            jobs = self._drain()
+        self.done = True
+        if not self._found_first:
+            jobs += next((cards for cards in self._fallback if cards), [])
+        return jobs
+    
+    def _drain(self) -> List[JobPosting]:
+        jobs = []
+        for _, el in self._parser.read_events():
+            if self.done:
+                break
+            if self._cards and self._cards[0].matches(el):
+                self._found_first = True
+                job = self._job(el)
+                if job:
+                    jobs.append(job)
+                el.clear(keep_tail=True)
+                parent = el.getparent()
+                while parent is not None and el.getprevious() is not None:
+                    del parent[0]
+            elif not self._found_first:
+                for selector, cards in zip(self._cards[1:], self._fallback):
+                    if selector.matches(el):
+                        job = self._job(el)
+                        if job:
+                            cards.append(job)
+            if self._results and self._results.matches(el):
+                self.done = True
+        return jobs
+    
+    def _text(self, card, name: str) -> str:
+        for selector in self._fields[name]:
+            found = selector.first(card)
+            if found is not None:
+                text = "".join(t.strip() for t in found.itertext())
+                if text:
+                    return text
+        return ""
+    
+    def _job(self, card) -> Optional[JobPosting]:
+        title = self._text(card, "title")
+        url = ""
+        for selector in self._fields["url"]:
+            found = selector.first(card)
+            if found is not None and found.get("href"):
+                url = _absolute(found.get("href"), self.base_url)
+                break
+        if not title or not url:
+            return None
+        return JobPosting(
+            source="naukri",
+            title=title,
+            company=self._text(card, "company") or "Unknown",
+            location=self._text(card, "location"),
+            url=url,
+            posted_text=self._text(card, "posted"),
+            description="",
+            search_url=self.base_url,
+        )
 
@@ -1,36 +1,186 @@
-from typing import List, Optional
+import contextvars
+import copy
+import hashlib
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
 from job_agent.models.job import JobPosting
 from job_agent.models.config import NaukriCfg
 from job_agent.adapters.naukri.http import NaukriHTTPClient
 from job_agent.adapters.naukri.parser import NaukriParser
+from job_agent.adapters.naukri.parse_pool import ParsePool
+from job_agent.adapters.rate_limiter import RateLimiter
+from job_agent.adapters.registry import SearchIncomplete
+from job_agent.core import deadline
+from job_agent.core.deadline import DeadlineExceeded
+from job_agent.core.logging import log_context
+from job_agent.core.profiling import NULL_PROFILER
+
+log = logging.getLogger("job_agent.naukri")
+
+# Bytes read from the socket per step of a streaming parse.
+STREAM_CHUNK_BYTES = 16 * 1024
+
+def _url_id(url: str) -> str:
+    """Short id of a search URL for log records."""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:8]
 
 class NaukriSource:
     """Job source for Naukri.com."""
     
-    def __init__(self, cfg: NaukriCfg):
+    def __init__(self, cfg: NaukriCfg, profiler=NULL_PROFILER):
         self.cfg = cfg
+        self.profiler = profiler
         if cfg.enabled:
-            self.http = NaukriHTTPClient(cfg.request)
+            self.http = self._http_client(cfg)
             self.parser = NaukriParser(cfg.parsing)
         else:
             self.http = None
             self.parser = None
+        self.parse_pool = self._parse_pool(cfg, self.parser)
+        # URLs left unfetched when the last search stopped early; they go first next time.
+        self._deferred: List[str] = []
     
-    def search(self) -> List[JobPosting]:
-        """Search for jobs across all configured URLs."""
+    @staticmethod
+    def _http_client(cfg: NaukriCfg) -> NaukriHTTPClient:
+        return NaukriHTTPClient(cfg.request, RateLimiter(cfg.min_interval_seconds))
+    
+    @staticmethod
+    def _parse_pool(cfg: NaukriCfg, parser: Optional[NaukriParser]) -> Optional[ParsePool]:
+        return ParsePool(cfg.parsing, parser) if cfg.enabled and cfg.parsing.processes else None
+    
+    def reconfigured(self, cfg: NaukriCfg) -> "NaukriSource":
+        """A source for a reloaded config, sharing the components whose settings did not change.
+        
+        This source is left untouched, so a reload that fails later keeps it
+        running as it was. A new parse pool starts no workers until used.
+        """
+        http, parser, parse_pool = self.http, self.parser, self.parse_pool
+        if cfg.enabled:
+            if (
+                http is None
+                or cfg.request != self.cfg.request
+                or cfg.min_interval_seconds != self.cfg.min_interval_seconds
+            ):
+                http = self._http_client(cfg)
+            if parser is None or cfg.parsing != self.cfg.parsing:
+                parser = NaukriParser(cfg.parsing)
+        if parser is not self.parser or not cfg.enabled:
+            parse_pool = self._parse_pool(cfg, parser)
+        source = copy.copy(self)
+        source.cfg, source.http, source.parser, source.parse_pool = cfg, http, parser, parse_pool
+        source._deferred = list(self._deferred)
+        return source
+    
+    def retire(self, successor: Optional["NaukriSource"]):
+        """Release what the source replacing this one (None if disabled) does not share."""
+        if self.parse_pool and (successor is None or successor.parse_pool is not self.parse_pool):
+            self.parse_pool.close()
+    
+    def search(self, urls: Optional[List[str]] = None) -> Iterator[JobPosting]:
+        """Lazily yield jobs page by page across the given URLs (default: all configured URLs).
+        
+        A URL is only requested once the consumer has taken every job from the
+        previous one, so a consumer that stops early saves the remaining
+        requests. Those URLs are searched first on the next call, which keeps
+        coverage fair across cycles. With ``concurrency`` above 1, up to that
+        many pages are fetched ahead in parallel, still yielded in order.
+        With ``parsing.streaming`` (and no fetch-ahead), jobs are yielded as
+        their cards arrive, and a page left partly read stays first in line.
+        A page that fails is logged and skipped; once the other URLs are done
+        the search raises ``SearchIncomplete``.
+        """
         if not self.cfg.enabled or not self.http or not self.parser:
-            return []
+            return
         
-        all_jobs = []
-        for url in self.cfg.search_urls:
-            try:
+        remaining = self._rotation_order(self.cfg.search_urls if urls is None else urls)
+        total = len(remaining)
+        failed: List[str] = []
+        try:
+            if self.cfg.concurrency > 1:
+                yield from self._search_ahead(remaining, failed)
+            while remaining:
+                if self.cfg.parsing.streaming:
+                    yield from self._stream(remaining[0], failed)
+                    remaining.pop(0)  # only once the page has been read
+                else:
+                    jobs = self._fetch(remaining[0], failed)
+                    remaining.pop(0)  # a fetch cut off by the deadline stays first in line
+                    yield from jobs
+        finally:
+            self._deferred = remaining
+        if failed:
+            raise SearchIncomplete(f"{len(failed)} of {total} search URLs failed")
+    
+    def _search_ahead(self, remaining: List[str], failed: List[str]) -> Iterator[JobPosting]:
+        """Fetch up to ``concurrency`` pages ahead of the consumer, yielding pages in order."""
+        pool = ThreadPoolExecutor(self.cfg.concurrency, thread_name_prefix="naukri-fetch")
+        inflight = deque()
+        try:
+            while remaining or inflight:
+                while remaining and len(inflight) < self.cfg.concurrency:
+                    url = remaining.pop(0)
+                    # Worker threads don't inherit context variables (deadline, log ids): pass a copy.
+                    inflight.append((url, pool.submit(contextvars.copy_context().run, self._fetch, url, failed)))
+                jobs = inflight[0][1].result()
+                inflight.popleft()
+                yield from jobs
+        finally:
+            # Pages fetched but never consumed go back to the front of the line.
+            remaining[:0] = [url for url, _ in inflight]
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _rotation_order(self, urls: List[str]) -> List[str]:
+        wanted = set(urls)
+        deferred = [u for u in self._deferred if u in wanted]
+        skipped = set(deferred)
+        return deferred + [u for u in urls if u not in skipped]
+    
+    def _fetch(self, url: str, failed: List[str]) -> List[JobPosting]:
+        """Jobs on one page; a page that fails is logged, added to ``failed`` and has none."""
+        if self.cfg.parsing.streaming:
+            return list(self._stream(url, failed))
+        with log_context(url=_url_id(url)):
+            return self._fetch_page(url, failed)
+    
+    def _fetch_page(self, url: str, failed: List[str]) -> List[JobPosting]:
+        try:
+            with self.profiler.stage("fetch"):
                 response = self.http.get(url)
-                jobs = self.parser.parse_jobs(response.text, url)
-                all_jobs.extend(jobs)
-            except Exception as e:
-                import logging
-                log = logging.getLogger("job_agent.naukri")
+            with self.profiler.stage("parse"):
+                if self.parse_pool:
+                    return self.parse_pool.parse(response.content, response.encoding, url)
+                return self.parser.parse_jobs(response.text, url)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            log.error(f"Error fetching jobs from {url}: {e}")
+            failed.append(url)
+            return []
+    
+    def _stream(self, url: str, failed: List[str]) -> Iterator[JobPosting]:
+        """Yield jobs from one page while it downloads, reading no further than the results list."""
+        try:
+            with self.profiler.stage("fetch"), log_context(url=_url_id(url)):
+                response = self.http.get(url, stream=True)
+            try:
+                chunks = response.iter_content(STREAM_CHUNK_BYTES)
+                feed = self.parser.feed_parser(url, response.encoding)
+                while not feed.done:
+                    # Stages and log contexts never span a yield: the consumer runs in between.
+                    with self.profiler.stage("fetch"):
+                        if deadline.current().expired:
+                            raise DeadlineExceeded(f"deadline reached while reading {url}")
+                        chunk = next(chunks, None)
+                    with self.profiler.stage("parse"):
+                        jobs = feed.close() if chunk is None else feed.feed(chunk)
+                    yield from jobs
+            finally:
+                response.close()
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            with log_context(url=_url_id(url)):
                 log.error(f"Error fetching jobs from {url}: {e}")
-        
-        return all_jobs
-
+            failed.append(url)
@@ -3,14 +3,15 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Optional
 from job_agent.models.config import GmailCfg
+from job_agent.core import deadline
 
 class GmailSMTPClient:
     """SMTP client for Gmail."""
     
     def __init__(self, cfg: GmailCfg):
         self.cfg = cfg
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
+        self.smtp_server = cfg.smtp_host
+        self.smtp_port = cfg.smtp_port
     
     def send_email(
         self,
@@ -33,8 +34,11 @@ class GmailSMTPClient:
             msg.attach(MIMEText(text_body, "plain"))
         msg.attach(MIMEText(html_body, "html"))
         
-        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-            server.starttls()
-            server.login(self.cfg.username, self.cfg.gmail_app_password)
+        timeout = deadline.current().timeout(self.cfg.timeout_seconds)
+        with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=timeout) as server:
+            if self.cfg.starttls:
+                server.starttls()
+            if self.cfg.gmail_app_password:  # relays without AUTH take no login
+                server.login(self.cfg.username, self.cfg.gmail_app_password)
             server.send_message(msg)
 
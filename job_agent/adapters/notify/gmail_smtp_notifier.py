@@ -3,6 +3,7 @@ from job_agent.models.job import ObservedJob
 from job_agent.models.score import ScoreResult
 from job_agent.models.config import EmailCfg
 from job_agent.store.models import JobRecord
+from job_agent.store.stats import DayStats
 from job_agent.adapters.notify.gmail_smtp import GmailSMTPClient
 from job_agent.adapters.notify.render import EmailRenderer
 
@@ -34,13 +35,13 @@ class GmailNotifier:
             html_body=html_body,
         )
     
-    def send_digest(self, jobs: List[JobRecord]):
-        """Send daily digest email."""
+    def send_digest(self, jobs: List[JobRecord], stats: Optional[DayStats] = None):
+        """Send daily digest email, headed by the day's aggregate counts if given."""
         if not self.enabled or not self.smtp or not self.renderer:
             return
         
         subject = f"{self.cfg.subject_prefix} Daily Digest - {len(jobs)} jobs"
-        html_body = self.renderer.render_digest(jobs)
+        html_body = self.renderer.render_digest(jobs, stats)
         
         self.smtp.send_email(
             from_email=self.cfg.from_email,
@@ -3,7 +3,8 @@ from jinja2 import Environment, FileSystemLoader
 from job_agent.models.job import ObservedJob
 from job_agent.models.score import ScoreResult
 from job_agent.store.models import JobRecord
-from typing import List
+from job_agent.store.stats import DayStats
+from typing import List, Optional
 
 class EmailRenderer:
     """Renders email templates using Jinja2."""
@@ -24,8 +25,8 @@ class EmailRenderer:
             job_url=job.job.url,
         )
     
-    def render_digest(self, jobs: List[JobRecord]) -> str:
+    def render_digest(self, jobs: List[JobRecord], stats: Optional[DayStats] = None) -> str:
         """Render HTML for a digest email."""
         template = self.env.get_template("digest_email.html.j2")
-        return template.render(jobs=jobs)
+        return template.render(jobs=jobs, stats=stats)
 
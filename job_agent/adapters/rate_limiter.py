@@ -1,3 +1,4 @@
+import threading
 import time
 from typing import Optional
 
@@ -7,12 +8,14 @@ class RateLimiter:
     def __init__(self, min_interval_seconds: float = 1.0):
         self.min_interval = min_interval_seconds
         self.last_request_time: Optional[float] = None
+        self._lock = threading.Lock()
     
     def wait_if_needed(self):
-        """Wait if necessary to respect rate limit."""
-        if self.last_request_time is not None:
-            elapsed = time.time() - self.last_request_time
-            if elapsed < self.min_interval:
-                time.sleep(self.min_interval - elapsed)
-        self.last_request_time = time.time()
+        """Wait if necessary to respect rate limit (safe to share between threads)."""
+        with self._lock:
+            if self.last_request_time is not None:
+                elapsed = time.time() - self.last_request_time
+                if elapsed < self.min_interval:
+                    time.sleep(self.min_interval - elapsed)
+            self.last_request_time = time.time()
 
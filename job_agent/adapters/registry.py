@@ -0,0 +1,83 @@
+"""Registry of job board adapters.
+
+A source is any class built as ``Source(cfg, profiler)`` whose
+``search(urls=None)`` lazily yields ``JobPosting``s for the given search
+URLs (all configured URLs when ``urls`` is None). For hot reload it may
+have a ``reconfigured(cfg)`` method returning a source for the new config
+(leaving itself untouched until the swap) and a ``retire(successor)``
+method called once it has been replaced. Its config model subclasses
+``SourceCfg`` and lives under ``sources.<name>`` in the config file.
+
+A search that could not cover every URL (a page failed to download or
+parse) raises ``SearchIncomplete`` once it has yielded what it could, so
+the polling service knows not to treat missing postings as closed.
+
+Built-in sources are referenced by import path so they are only imported
+when enabled. Third-party boards can call ``register_source`` or expose an
+entry point in the ``job_agent.sources`` group that returns
+``(source_class, cfg_model)``.
+"""
+import importlib
+import logging
+from importlib.metadata import entry_points
+from typing import Dict, Iterator, Optional, Protocol, Tuple, Type
+from job_agent.models.config import SourceCfg, SourcesCfg
+from job_agent.models.job import JobPosting
+
+log = logging.getLogger("job_agent.sources")
+
+ENTRY_POINT_GROUP = "job_agent.sources"
+
+class SearchIncomplete(Exception):
+    """A search skipped some of its URLs because fetching or parsing them failed."""
+
+class JobSource(Protocol):
+    def search(self, urls: Optional[list] = None) -> Iterator[JobPosting]: ...
+
+_BUILTIN: Dict[str, Tuple[str, str, str]] = {
+    # name -> (module, source class, config model in job_agent.models.config)
+    "naukri": ("job_agent.adapters.naukri.source", "NaukriSource", "NaukriCfg"),
+}
+
+_registered: Dict[str, Tuple[type, Type[SourceCfg]]] = {}
+
+def register_source(name: str, source_cls: type, cfg_model: Type[SourceCfg] = SourceCfg):
+    """Make a job board available as ``sources.<name>`` in the config."""
+    _registered[name] = (source_cls, cfg_model)
+
+def _resolve(name: str) -> Optional[Tuple[type, Type[SourceCfg]]]:
+    if name in _registered:
+        return _registered[name]
+    if name in _BUILTIN:
+        module, cls_name, cfg_name = _BUILTIN[name]
+        models = importlib.import_module("job_agent.models.config")
+        entry = (getattr(importlib.import_module(module), cls_name), getattr(models, cfg_name))
+    else:
+        found = [ep for ep in entry_points(group=ENTRY_POINT_GROUP) if ep.name == name]
+        if not found:
+            return None
+        entry = found[0].load()()
+    _registered[name] = entry
+    return entry
+
+def source_configs(sources_cfg: SourcesCfg) -> Dict[str, SourceCfg]:
+    """Validated config of every enabled source, in config-file order."""
+    configs = {}
+    for name, raw in sources_cfg:
+        if isinstance(raw, SourceCfg):
+            cfg = raw
+        else:
+            resolved = _resolve(name)
+            if resolved is None:
+                log.warning(f"Unknown job source '{name}' in config; ignoring it")
+                continue
+            cfg = resolved[1].model_validate(raw)
+        if cfg.enabled:
+            configs[name] = cfg
+    return configs
+
+def build_source(name: str, cfg: SourceCfg, profiler):
+    resolved = _resolve(name)
+    if resolved is None:
+        raise ValueError(f"Unknown job source: {name}")
+    return resolved[0](cfg, profiler)
@@ -1,49 +1,172 @@
 import random
 import logging
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional, TYPE_CHECKING
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
+from job_agent.core.deadline import Deadline
 from job_agent.core.services import PollingService, DigestService
 from job_agent.models.config import PollingCfg, DigestCfg
 
+if TYPE_CHECKING:
+    from job_agent.core.reload import ConfigReloader
+
 log = logging.getLogger("job_agent.scheduler")
 
+_EVENT_KINDS = {
+    EVENT_JOB_MISSED: "missed",  # fired too late (past misfire_grace_time) and dropped
+    EVENT_JOB_MAX_INSTANCES: "skipped",  # previous run still going
+    EVENT_JOB_ERROR: "error",
+}
+
+# How often the watchdog looks for runs that outlived their deadline.
+WATCHDOG_SECONDS = 30
+
 class Scheduler:
-    """Scheduler for polling and digest jobs."""
+    """Scheduler for polling and digest jobs.
+    
+    Polling and digest run on separate single-thread executors, so a slow
+    polling cycle cannot delay the digest or the other way round. Each run
+    gets a ``Deadline`` that caps its HTTP and SMTP timeouts. Missed,
+    skipped, failed and overrunning runs are logged and counted in
+    ``stats``; a watchdog job on its own executor reports runs still going
+    past their deadline.
+    """
     
     def __init__(self, polling_cfg: PollingCfg, digest_cfg: DigestCfg):
         self.polling_cfg = polling_cfg
         self.digest_cfg = digest_cfg
-        self.scheduler = BlockingScheduler()
+        self.stats: Counter = Counter()  # (job id, kind) -> count
+        self._running: Dict[str, float] = {}  # job id -> monotonic start of the current run
+        self._limits: Dict[str, float] = {}  # job id -> deadline of the current run, seconds
+        self._lock = threading.Lock()
+        self.scheduler = BlockingScheduler(
+            executors={
+                "polling": ThreadPoolExecutor(1),
+                "digest": ThreadPoolExecutor(1),
+                "watchdog": ThreadPoolExecutor(1),
+            },
+            job_defaults={"coalesce": True, "max_instances": 1},
+        )
+        self.scheduler.add_listener(self._on_event, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_ERROR)
+    
+    def polling_deadline(self) -> int:
+        """Configured budget, else 90% of the interval so a cycle ends before the next fire."""
+        return self.polling_cfg.deadline_seconds or max(1, int(self.polling_cfg.interval_seconds * 0.9))
+    
+    def _count(self, job_id: str, kind: str) -> int:
+        with self._lock:
+            self.stats[(job_id, kind)] += 1
+            return self.stats[(job_id, kind)]
+    
+    def _on_event(self, event):
+        kind = _EVENT_KINDS.get(event.code)
+        if kind:
+            total = self._count(event.job_id, kind)
+            log.warning(f"{event.job_id} run scheduled for {event.scheduled_run_time} {kind} ({total} so far)")
+    
+    def _guarded(self, job_id: str, seconds: Callable[[], float], fn: Callable[[], None]) -> Callable[[], None]:
+        """Wrap a job so it runs under a fresh deadline and reports overruns."""
+        def run():
+            limit = seconds()
+            start = time.monotonic()
+            with self._lock:
+                self._running[job_id], self._limits[job_id] = start, limit
+            try:
+                with Deadline(limit).active():
+                    fn()
+            finally:
+                elapsed = time.monotonic() - start
+                with self._lock:
+                    self._running.pop(job_id, None)
+                if elapsed > limit:
+                    total = self._count(job_id, "overrun")
+                    log.warning(f"{job_id} run took {elapsed:.0f}s, over its {limit:.0f}s deadline ({total} so far)")
+        return run
+    
+    def check_overruns(self):
+        """Log runs still going past their deadline (Python cannot cancel a running thread)."""
+        now = time.monotonic()
+        with self._lock:
+            running = [(job_id, now - start, self._limits[job_id]) for job_id, start in self._running.items()]
+        for job_id, elapsed, limit in running:
+            if elapsed > limit:
+                log.error(f"{job_id} run has been going for {elapsed:.0f}s, past its {limit:.0f}s deadline")
     
-    def run(self, polling_service: PollingService, digest_service: DigestService):
-        """Start the scheduler with polling and digest jobs."""
+    def polling_trigger(self, polling_cfg: PollingCfg) -> Optional[IntervalTrigger]:
+        """Trigger for a new polling interval, or None if the interval is unchanged."""
+        if polling_cfg.interval_seconds == self.polling_cfg.interval_seconds:
+            return None
+        return IntervalTrigger(seconds=polling_cfg.interval_seconds)
+    
+    def reschedule_polling(self, polling_cfg: PollingCfg, trigger: Optional[IntervalTrigger] = None):
+        """Apply a new polling interval to the running polling job (``trigger`` from ``polling_trigger``)."""
+        trigger = trigger or self.polling_trigger(polling_cfg)
+        if trigger is not None:
+            self.scheduler.reschedule_job("polling", trigger=trigger)
+            log.info(f"Rescheduled polling job (interval: {polling_cfg.interval_seconds}s)")
+        self.polling_cfg = polling_cfg
+    
+    def run(
+        self,
+        polling_service: PollingService,
+        digest_service: DigestService,
+        reloader: Optional["ConfigReloader"] = None,
+    ):
+        """Start the scheduler with polling and digest jobs.
+        
+        When a reloader is given, config and profile changes are applied at the
+        start of each polling cycle, so a cycle never sees a half-swapped state.
+        """
         # Schedule polling job with jitter
         interval_seconds = self.polling_cfg.interval_seconds
         jitter = random.randint(0, self.polling_cfg.jitter_seconds)
         first_run_delay = interval_seconds + jitter
         
+        def poll():
+            if reloader:
+                reloader.check()
+            polling_service.run_once()
+        
         self.scheduler.add_job(
-            polling_service.run_once,
+            self._guarded("polling", self.polling_deadline, poll),
             trigger=IntervalTrigger(seconds=interval_seconds),
             id="polling",
-            max_instances=1,
+            executor="polling",
+            misfire_grace_time=interval_seconds,
             replace_existing=True,
         )
         
-        log.info(f"Scheduled polling job (interval: {interval_seconds}s, jitter: {jitter}s)")
+        log.info(
+            f"Scheduled polling job (interval: {interval_seconds}s, jitter: {jitter}s, "
+            f"deadline: {self.polling_deadline()}s)"
+        )
         
         # Schedule digest job if enabled
         if self.digest_cfg.enabled:
             self.scheduler.add_job(
-                digest_service.run_daily,
+                self._guarded("digest", lambda: self.digest_cfg.deadline_seconds, digest_service.run_daily),
                 trigger=CronTrigger(hour=self.digest_cfg.hour, minute=self.digest_cfg.minute),
                 id="digest",
-                max_instances=1,
+                executor="digest",
+                misfire_grace_time=3600,
                 replace_existing=True,
             )
             log.info(f"Scheduled digest job (daily at {self.digest_cfg.hour:02d}:{self.digest_cfg.minute:02d})")
         
+        self.scheduler.add_job(
+            self.check_overruns,
+            trigger=IntervalTrigger(seconds=WATCHDOG_SECONDS),
+            id="watchdog",
+            executor="watchdog",
+            replace_existing=True,
+        )
+        
         try:
             log.info("Starting scheduler...")
             self.scheduler.start()
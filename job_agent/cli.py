@@ -1,9 +1,43 @@
 import argparse
+import os
+import sys
+from datetime import datetime, timezone
 from job_agent.core.app import AppContext
-from job_agent.core.services import PollingService, DigestService
 from job_agent.core.config import load_config, load_profile
 
-def main():
+def _date(value: str) -> datetime:
+    """Parse YYYY-MM-DD as midnight UTC."""
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+MARK_STATUSES = ["APPLIED", "SKIPPED", "MANUAL"]
+
+def read_marks(lines, default_status=None) -> dict:
+    """Parse ``job_key [STATUS]`` lines (blank lines and ``#`` comments skipped) into key -> status.
+
+    Keys and statuses may be separated by whitespace or a comma; a key
+    listed twice takes its last status.
+    """
+    marks = {}
+    for number, line in enumerate(lines, 1):
+        fields = line.split("#", 1)[0].replace(",", " ").split()
+        if not fields:
+            continue
+        if len(fields) > 2:
+            raise ValueError(f"line {number}: expected 'job_key [STATUS]', got {line.strip()!r}")
+        status = fields[1].upper() if len(fields) == 2 else default_status
+        if status is None:
+            raise ValueError(f"line {number}: no status for {fields[0]} (add one or pass --status)")
+        if status not in MARK_STATUSES:
+            raise ValueError(f"line {number}: unknown status {fields[1]!r} (choose from {', '.join(MARK_STATUSES)})")
+        marks[fields[0]] = status
+    return marks
+
+def _cursor(value: str) -> tuple:
+    """Parse a ``score,first_seen_at,job_key`` page cursor."""
+    score, seen, job_key = value.split(",", 2)
+    return int(score), datetime.fromisoformat(seen), job_key
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="naukri-agent")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
@@ -13,21 +47,239 @@ def main():
     p_once = sub.add_parser("poll-once", help="Run one polling cycle")
     p_once.add_argument("--config", required=True)
     p_once.add_argument("--no-email", action="store_true")
+    p_once.add_argument("--profile", metavar="OUT_DIR",
+                        help="Write cProfile, per-stage timings and top allocators for this cycle to OUT_DIR")
 
     p_mark = sub.add_parser("mark", help="Mark job status manually")
     p_mark.add_argument("--config", required=True)
-    p_mark.add_argument("--job-key", required=True)
-    p_mark.add_argument("--status", required=True, choices=["APPLIED", "SKIPPED", "MANUAL"])
+    keys = p_mark.add_mutually_exclusive_group(required=True)
+    keys.add_argument("--job-key")
+    keys.add_argument("--file", metavar="PATH",
+                      help="One job key per line, optionally followed by a status; '-' reads stdin")
+    p_mark.add_argument("--status", choices=MARK_STATUSES, help="Status for keys given without one")
+
+    p_search = sub.add_parser("search", help="Full-text search over stored jobs")
+    p_search.add_argument("query")
+    p_search.add_argument("--config", required=True)
+    p_search.add_argument("--limit", type=int, default=20)
+    p_search.add_argument("--status", choices=["NEW", "APPLIED", "SKIPPED", "MANUAL"])
+    p_search.add_argument("--min-score", type=int)
+    p_search.add_argument("--since", type=_date, help="First seen on or after YYYY-MM-DD")
+    p_search.add_argument("--until", type=_date, help="First seen before YYYY-MM-DD")
+    p_search.add_argument("--reindex", action="store_true", help="Rebuild the search index first")
+
+    p_top = sub.add_parser("top", help="Show the best unreviewed jobs from the backlog")
+    p_top.add_argument("--config", required=True)
+    p_top.add_argument("--limit", type=int, default=20)
+    p_top.add_argument("--after", type=_cursor, help="Cursor printed at the end of the previous page")
+    p_top.add_argument("--status", default="NEW", choices=["NEW", "APPLIED", "SKIPPED", "MANUAL"])
+    p_top.add_argument("--action", default="QUEUE", choices=["QUEUE", "EMAIL", "SKIP"])
+    p_top.add_argument("--location", help="Substring match, case-insensitive")
+    p_top.add_argument("--company", help="Substring match, case-insensitive")
+    p_top.add_argument("--include-closed", action="store_true", help="Also show postings no longer listed")
 
-    args = parser.parse_args()
+    p_stats = sub.add_parser("stats", help="Show daily job counts from the aggregate tables")
+    p_stats.add_argument("--config", required=True)
+    p_stats.add_argument("--by", default="all", choices=["all", "company", "location", "score_band", "search_url"],
+                         help="Group by this dimension (all: one line per day)")
+    p_stats.add_argument("--days", type=int, default=7, help="Days to cover, ending today")
+    p_stats.add_argument("--limit", type=int, default=20)
+    p_stats.add_argument("--rebuild", action="store_true", help="Recompute the aggregates from all stored jobs first")
+
+    p_export = sub.add_parser("export", help="Stream stored jobs to CSV, JSONL or Parquet")
+    p_export.add_argument("output", help="Output file; format and compression are inferred from e.g. .csv.gz")
+    p_export.add_argument("--config", required=True)
+    p_export.add_argument("--format", choices=["csv", "jsonl", "parquet"])
+    p_export.add_argument("--compression", choices=["none", "gzip", "zstd"])
+    p_export.add_argument("--columns", help="Comma-separated column names (default: all but description and timestamps)")
+    p_export.add_argument("--status", choices=["NEW", "APPLIED", "SKIPPED", "MANUAL"])
+    p_export.add_argument("--since", type=_date, help="First seen on or after YYYY-MM-DD")
+    p_export.add_argument("--until", type=_date, help="First seen before YYYY-MM-DD")
+    p_export.add_argument("--chunk-size", type=int, default=5000)
+
+    p_sim = sub.add_parser("simulate", help="Replay stored jobs under alternative scoring settings")
+    p_sim.add_argument("--config", required=True)
+    p_sim.add_argument("--vary", action="append", default=[], metavar="SETTING=V1,V2,...",
+                       help="e.g. min_score_to_email=70,75,80 or weights.skill_match=35,45; repeat to build a grid")
+    p_sim.add_argument("--since", type=_date, help="First seen on or after YYYY-MM-DD")
+    p_sim.add_argument("--until", type=_date, help="First seen before YYYY-MM-DD")
+    p_sim.add_argument("--chunk-size", type=int, default=5000)
+
+    p_rescore = sub.add_parser("rescore", help="Re-score stored jobs with the current profile and weights")
+    p_rescore.add_argument("--config", required=True)
+    p_rescore.add_argument("--dry-run", action="store_true", help="Report changes without writing them")
+    p_rescore.add_argument("--chunk-size", type=int, default=1000)
+    p_rescore.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                           help="Scoring processes (0 scores inline)")
+
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
 
     cfg = load_config(args.config)
-    profile = load_profile(cfg.profile_path).profile
     ctx = AppContext.from_config(cfg)
 
-    if args.cmd == "poll-once":
-        PollingService(ctx, profile).run_once(send_email=not args.no_email)
-    elif args.cmd == "mark":
-        ctx.job_repo().mark_status(args.job_key, args.status)
+    # mark, search, top, stats and export only touch the database: skip the profile and service imports.
+    if args.cmd == "mark":
+        _mark(ctx, args, parser)
+        return
+    if args.cmd == "search":
+        _search(ctx, args)
+        return
+    if args.cmd == "top":
+        _top(ctx, args)
+        return
+    if args.cmd == "stats":
+        _stats(ctx, args)
+        return
+    if args.cmd == "export":
+        _export(ctx, args, parser)
+        return
+
+    from job_agent.core.services import PollingService, DigestService, RescoreService
+    profile = load_profile(cfg.profile_path).profile
+
+    if args.cmd == "simulate":
+        _simulate(ctx, profile, args, parser)
+    elif args.cmd == "rescore":
+        report = RescoreService(ctx, profile).run(
+            chunk_size=args.chunk_size, workers=args.workers, dry_run=args.dry_run
+        )
+        print("\n".join(report.lines(args.dry_run)))
+    elif args.cmd == "poll-once":
+        if args.profile:
+            from job_agent.core.profiling import CycleProfiler
+            ctx.profiler = CycleProfiler(args.profile)
+        polling = PollingService(ctx, profile)
+        with ctx.profiler.cycle():
+            polling.run_once(send_email=not args.no_email)
+        if args.profile:
+            print(f"Profile written to {args.profile} (cycle.pstats, cycle.txt, stages.json)")
     elif args.cmd == "run":
-        ctx.scheduler().run(PollingService(ctx, profile), DigestService(ctx, profile))
+        from job_agent.core.reload import ConfigReloader
+        scheduler = ctx.scheduler()
+        polling = PollingService(ctx, profile)
+        reloader = ConfigReloader(ctx, polling, args.config, scheduler=scheduler)
+        if ctx.coordinator:
+            ctx.coordinator.register()
+        try:
+            scheduler.run(polling, DigestService(ctx, profile), reloader=reloader)
+        finally:
+            if ctx.coordinator:
+                ctx.coordinator.deregister()
+
+def _mark(ctx: AppContext, args, parser: argparse.ArgumentParser):
+    try:
+        if args.job_key:
+            if not args.status:
+                raise ValueError("--job-key needs --status")
+            marks = {args.job_key: args.status}
+        elif args.file == "-":
+            marks = read_marks(sys.stdin, args.status)
+        else:
+            with open(args.file, encoding="utf-8") as fh:
+                marks = read_marks(fh, args.status)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    with ctx.job_repo() as repo:
+        missing = repo.bulk_mark_status(marks)
+    print(f"Marked {len(marks) - len(missing)} jobs.")
+    if missing:
+        print(f"Not found ({len(missing)}): {', '.join(missing)}", file=sys.stderr)
+
+def _search(ctx: AppContext, args):
+    with ctx.job_repo() as repo:
+        if args.reindex:
+            repo.reindex_search()
+        rows = repo.search(
+            args.query,
+            limit=args.limit,
+            status=args.status,
+            min_score=args.min_score,
+            since=args.since,
+            until=args.until,
+        )
+    for row in rows:
+        seen = row.first_seen_at.strftime("%Y-%m-%d") if row.first_seen_at else "-"
+        print(f"{row.score:>3} {row.status:<8} {seen}  {row.title} — {row.company} ({row.location})  [{row.job_key}]")
+    if not rows:
+        print("No matching jobs.")
+
+def _top(ctx: AppContext, args):
+    with ctx.job_repo() as repo:
+        rows = repo.top_backlog(
+            limit=args.limit,
+            after=args.after,
+            status=args.status,
+            action=args.action,
+            location=args.location,
+            company=args.company,
+            include_closed=args.include_closed,
+        )
+    for row in rows:
+        print(f"{row.score:>3} {row.first_seen_at:%Y-%m-%d %H:%M}  {row.title} — {row.company} ({row.location})  [{row.job_key}]")
+    if len(rows) == args.limit:
+        last = rows[-1]
+        print(f"\nNext page: --after {last.score},{last.first_seen_at.isoformat()},{last.job_key}")
+    elif not rows:
+        print("No jobs in the backlog.")
+
+def _stats(ctx: AppContext, args):
+    from datetime import timedelta
+
+    until = ctx.clock.now_local().date()
+    since = until - timedelta(days=max(args.days, 1) - 1)
+    with ctx.job_repo() as repo:
+        if args.rebuild:
+            print(f"Rebuilt {repo.rebuild_stats()} aggregate rows.")
+        if args.by == "all":
+            rows = [(day.isoformat(), row) for day, row in repo.daily_stats(since, until)]
+        else:
+            rows = [(row.value or "-", row) for row in repo.stat_totals(args.by, since, until, args.limit)]
+    if not rows:
+        print(f"No jobs first seen since {since}.")
+        return
+    width = min(max(len(label) for label, _ in rows), 60)
+    print(f"{args.by:<{width}}  {'new':>5}  {'emailed':>7}  {'rate':>5}  {'applied':>7}  {'skipped':>7}")
+    for label, row in rows:
+        print(f"{label[:width]:<{width}}  {row.new_jobs:>5}  {row.emailed:>7}  {row.email_rate:>5.0%}  "
+              f"{row.applied:>7}  {row.skipped:>7}")
+
+def _export(ctx: AppContext, args, parser: argparse.ArgumentParser):
+    from job_agent.store import export
+
+    fmt, compression = export.infer_format(args.output)
+    fmt = args.format or fmt
+    compression = args.compression or compression
+    if fmt is None:
+        parser.error(f"cannot infer the export format from {args.output!r}; pass --format")
+    try:
+        columns = export.parse_columns(args.columns)
+        export.check_dependencies(fmt, compression)
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+    with ctx.job_repo() as repo:
+        chunks = repo.iter_export(
+            columns, status=args.status, since=args.since, until=args.until, chunk_size=args.chunk_size
+        )
+        count = export.write_export(chunks, args.output, fmt, columns, compression)
+    print(f"Exported {count} jobs to {args.output}")
+
+def _simulate(ctx: AppContext, profile, args, parser: argparse.ArgumentParser):
+    from job_agent.core import simulate
+
+    try:
+        axes = [simulate.parse_axis(v) for v in args.vary]
+    except ValueError as e:
+        parser.error(str(e))
+    with ctx.job_repo() as repo:
+        report = simulate.run(
+            repo, profile, ctx.cfg.scoring, axes, ctx.clock.tz,
+            since=args.since, until=args.until, chunk_size=args.chunk_size,
+        )
+    print("\n".join(report.lines()))
+
+if __name__ == "__main__":
+    main()
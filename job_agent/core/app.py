@@ -1,67 +1,175 @@
-from typing import Optional
-from job_agent.models.config import RootCfg
+from typing import Dict, Optional, TYPE_CHECKING
+from job_agent.models.config import RootCfg, SourceCfg, SourcesCfg
 from job_agent.adapters.clock import Clock
-from job_agent.adapters.scheduler import Scheduler
-from job_agent.adapters.naukri.source import NaukriSource
-from job_agent.adapters.notify.gmail_smtp_notifier import GmailNotifier
 from job_agent.store.db import create_engine_from_url, create_session_factory, init_db
 from job_agent.store.repo import JobRepository
+from job_agent.store.coordination import Coordinator, default_worker_id
 from job_agent.core.logging import setup_logging
+from job_agent.core.profiling import NULL_PROFILER
+
+if TYPE_CHECKING:
+    from job_agent.adapters.scheduler import Scheduler
+    from job_agent.adapters.naukri.source import NaukriSource
+    from job_agent.adapters.notify.gmail_smtp_notifier import GmailNotifier
+
+# Marks an adapter that has not been built yet (None means "disabled").
+_UNSET = object()
 
 class AppContext:
-    """Application context containing all services and adapters."""
-    
+    """Application context containing all services and adapters.
+
+    Adapters are built on first use so that commands which never touch the
+    network (e.g. ``mark``) don't import requests, BeautifulSoup, Jinja2 or
+    APScheduler.
+    """
+
     def __init__(
         self,
         cfg: RootCfg,
         clock: Clock,
-        naukri_source: Optional[NaukriSource],
-        notifier: Optional[GmailNotifier],
-        session_factory,
+        sources=_UNSET,
+        notifier=_UNSET,
+        session_factory=None,
     ):
         self.cfg = cfg
         self.clock = clock
-        self.naukri_source = naukri_source
-        self.notifier = notifier
+        self._sources = sources
+        self._notifier = notifier
         self._session_factory = session_factory
-    
+        self._coordinator = _UNSET
+        self._worker_id = None
+        # Set before the first cycle to profile it (see core/profiling.py).
+        self.profiler = NULL_PROFILER
+
     @classmethod
     def from_config(cls, cfg: RootCfg) -> "AppContext":
         """Create AppContext from configuration."""
         # Setup logging
-        setup_logging(cfg.app.log_level)
-        
+        setup_logging(cfg.app.log_level, cfg.app.log_format, cfg.app.log_sampling)
+
         # Initialize database
-        engine = create_engine_from_url(cfg.app.db_url)
-        init_db(engine)
-        session_factory = create_session_factory(engine)
-        
+        pool = cfg.app.db_pool
+        engine = create_engine_from_url(
+            cfg.app.db_url,
+            pool_size=pool.size,
+            max_overflow=pool.max_overflow,
+            pool_recycle=pool.recycle_seconds,
+            pool_timeout=pool.timeout_seconds,
+        )
         # Create clock
         clock = Clock(cfg.app.user_timezone)
-        
-        # Create job sources
-        naukri_source = None
-        if cfg.sources.naukri.enabled:
-            naukri_source = NaukriSource(cfg.sources.naukri)
-        
-        # Create notifier
-        notifier = None
-        if cfg.email.enabled:
-            notifier = GmailNotifier(cfg.email)
-        
+
+        init_db(engine, clock.tz)
+        session_factory = create_session_factory(engine)
+
         return cls(
             cfg=cfg,
             clock=clock,
-            naukri_source=naukri_source,
-            notifier=notifier,
             session_factory=session_factory,
         )
-    
+
+    def source_configs(self) -> Dict[str, SourceCfg]:
+        """Config of every enabled job source, by registered name."""
+        from job_agent.adapters.registry import source_configs
+        return source_configs(self.cfg.sources)
+
+    @property
+    def sources(self) -> dict:
+        """Enabled job sources by name, built from the registry on first use."""
+        if self._sources is _UNSET:
+            from job_agent.adapters.registry import build_source
+            self._sources = {
+                name: build_source(name, cfg, self.profiler) for name, cfg in self.source_configs().items()
+            }
+        return self._sources
+
+    def prepare_sources(self, sources_cfg: SourcesCfg) -> Optional[dict]:
+        """Sources for reloaded settings, built without touching the running ones.
+
+        Sources with ``reconfigured`` share their unchanged parts; newly
+        enabled ones are built. None if no source has been built yet.
+        """
+        if self._sources is _UNSET:
+            return None
+        from job_agent.adapters.registry import build_source, source_configs
+        configs = source_configs(sources_cfg)
+        sources = {}
+        for name, cfg in configs.items():
+            source = self._sources.get(name)
+            if source is None:
+                source = build_source(name, cfg, self.profiler)
+            elif hasattr(source, "reconfigured"):
+                source = source.reconfigured(cfg)
+            sources[name] = source
+        return sources
+
+    def install_sources(self, sources: Optional[dict]):
+        """Swap in sources from ``prepare_sources`` and retire the ones they replace."""
+        if sources is None:
+            return
+        previous, self._sources = self._sources, sources
+        for name, source in previous.items():
+            successor = sources.get(name)
+            if successor is not source and hasattr(source, "retire"):
+                source.retire(successor)
+
+    @property
+    def naukri_source(self) -> Optional["NaukriSource"]:
+        """Naukri job source, or None when disabled."""
+        return self.sources.get("naukri")
+
+    @naukri_source.setter
+    def naukri_source(self, source: Optional["NaukriSource"]):
+        sources = {} if self._sources is _UNSET else dict(self._sources)
+        sources.pop("naukri", None)
+        if source is not None:
+            sources = {"naukri": source, **sources}
+        self._sources = sources
+
+    @property
+    def notifier(self) -> Optional["GmailNotifier"]:
+        """Email notifier, or None when email is disabled."""
+        if self._notifier is _UNSET:
+            self._notifier = None
+            if self.cfg.email.enabled:
+                from job_agent.adapters.notify.gmail_smtp_notifier import GmailNotifier
+                self._notifier = GmailNotifier(self.cfg.email)
+        return self._notifier
+
+    @notifier.setter
+    def notifier(self, notifier: Optional["GmailNotifier"]):
+        self._notifier = notifier
+
+    @property
+    def coordinator(self) -> Optional[Coordinator]:
+        """Multi-worker coordinator, or None when this is the only agent process."""
+        if self._coordinator is _UNSET:
+            self._coordinator = None
+            if self.cfg.coordination.enabled:
+                self._coordinator = Coordinator(
+                    self._session_factory,
+                    self.clock,
+                    self.cfg.coordination.lease_seconds,
+                    self.cfg.coordination.worker_id,
+                )
+        return self._coordinator
+
+    @property
+    def worker_id(self) -> str:
+        """Identity used when claiming alerts, shared with the coordinator if there is one."""
+        if self._worker_id is None:
+            self._worker_id = self.coordinator.worker_id if self.coordinator else default_worker_id()
+        return self._worker_id
+
+    @property
+    def engine(self):
+        return self._session_factory.kw["bind"]
+
     def job_repo(self) -> JobRepository:
-        """Get a job repository instance."""
-        return JobRepository(self._session_factory())
-    
-    def scheduler(self) -> Scheduler:
+        """A repository over a new session; use ``with ctx.job_repo() as repo:`` so it is closed."""
+        return JobRepository(self._session_factory(), self.clock.tz)
+
+    def scheduler(self) -> "Scheduler":
         """Get a scheduler instance."""
+        from job_agent.adapters.scheduler import Scheduler
         return Scheduler(self.cfg.polling, self.cfg.email.digest)
-
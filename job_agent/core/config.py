@@ -10,3 +10,16 @@ def load_config(path: str) -> RootCfg:
 def load_profile(path: str) -> RootProfile:
     data = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
     return RootProfile(**data)
+
+def update_config(cfg: RootCfg, sections: dict) -> RootCfg:
+    """Return a copy of ``cfg`` with only the given top-level sections re-validated."""
+    validated = {}
+    for name, value in sections.items():
+        if name not in RootCfg.model_fields:
+            continue
+        field_type = RootCfg.model_fields[name].annotation
+        if isinstance(field_type, type) and hasattr(field_type, "model_validate"):
+            validated[name] = field_type.model_validate(value)
+        else:
+            validated[name] = value
+    return cfg.model_copy(update=validated)
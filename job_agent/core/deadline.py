@@ -0,0 +1,56 @@
+"""Per-cycle deadlines for network calls.
+
+A scheduled run activates a ``Deadline`` for its duration; the HTTP and
+SMTP clients read it via ``current()`` and cap every socket timeout at the
+time remaining, and refuse to start a call once it has passed. A hung read
+or login therefore ends when the cycle's budget does, instead of holding
+the job's executor until the OS gives up on the connection.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+class DeadlineExceeded(Exception):
+    """The current cycle ran out of time; outstanding work is abandoned."""
+
+class Deadline:
+    """A point in time by which a unit of work must finish (``None`` seconds: no limit)."""
+
+    def __init__(self, seconds: Optional[float], clock=time.monotonic):
+        self.seconds = seconds
+        self._clock = clock
+        self.expires_at = None if seconds is None else clock() + seconds
+
+    def remaining(self) -> Optional[float]:
+        return None if self.expires_at is None else self.expires_at - self._clock()
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def timeout(self, cap: float) -> float:
+        """Socket timeout for the next call: ``cap``, or less if the deadline is closer."""
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        if remaining <= 0:
+            raise DeadlineExceeded(f"deadline of {self.seconds}s reached")
+        return min(cap, remaining)
+
+    @contextmanager
+    def active(self):
+        """Make this the deadline seen by ``current()`` in this thread."""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+NO_DEADLINE = Deadline(None)
+
+_current: ContextVar[Deadline] = ContextVar("deadline", default=NO_DEADLINE)
+
+def current() -> Deadline:
+    return _current.get()
@@ -0,0 +1,93 @@
+"""Near-duplicate detection for reposted jobs.
+
+Each posting gets a 64-bit SimHash over its normalized title, company,
+location and description. Two postings whose signatures differ in at most
+``max_distance`` bits are treated as the same role. For lookup the signature
+is split into ``BANDS`` 16-bit bands stored as indexed columns: by the
+pigeonhole principle, any two signatures within ``BANDS - 1`` bits agree
+exactly on at least one band, so candidates come from four index probes
+instead of a table scan.
+"""
+import hashlib
+import re
+from typing import Iterable, Tuple
+from job_agent.models.job import JobPosting
+
+BITS = 64
+BANDS = 4
+BAND_BITS = BITS // BANDS
+_BAND_MASK = (1 << BAND_BITS) - 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_COMPANY_SUFFIXES = {"pvt", "private", "ltd", "limited", "llp", "inc", "corp", "corporation", "co", "llc", "technologies", "solutions"}
+
+_ALIASES = {"sr": "senior", "jr": "junior", "snr": "senior", "bengaluru": "bangalore", "gurugram": "gurgaon", "engg": "engineering"}
+
+# Title and location carry most of a posting's identity (the same title in
+# another city is another opening); company weighs little so consultancy
+# re-listings still land close; description shingles add detail when a
+# description was fetched.
+_TITLE_WEIGHT = 3
+_LOCATION_WEIGHT = 6
+
+# Candidates from the band index must also share most of their title words:
+# on short texts a few bits of SimHash distance can separate "Lead X" from "X".
+MIN_TITLE_JACCARD = 0.75
+
+def _tokens(text: str) -> list:
+    return [_ALIASES.get(t, t) for t in _TOKEN_RE.findall((text or "").lower())]
+
+def _features(job: JobPosting) -> Iterable[Tuple[str, int]]:
+    title = _tokens(job.title)
+    for tok in title:
+        yield "t:" + tok, _TITLE_WEIGHT
+    for a, b in zip(title, title[1:]):
+        yield f"t:{a} {b}", _TITLE_WEIGHT
+    for tok in _tokens(job.company):
+        if tok not in _COMPANY_SUFFIXES:
+            yield "c:" + tok, 1
+    for tok in _tokens(job.location):
+        yield "l:" + tok, _LOCATION_WEIGHT
+    desc = _tokens(job.description)
+    for i in range(len(desc) - 2):
+        yield "d:" + " ".join(desc[i:i + 3]), 1
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+def simhash(job: JobPosting) -> int:
+    """Unsigned 64-bit SimHash of a posting."""
+    acc = [0] * BITS
+    for feature, weight in _features(job):
+        h = _hash64(feature)
+        for bit in range(BITS):
+            acc[bit] += weight if (h >> bit) & 1 else -weight
+    value = 0
+    for bit in range(BITS):
+        if acc[bit] > 0:
+            value |= 1 << bit
+    return value
+
+def bands(signature: int) -> Tuple[int, ...]:
+    """Split an unsigned signature into ``BANDS`` LSH bucket ids."""
+    return tuple((signature >> (i * BAND_BITS)) & _BAND_MASK for i in range(BANDS))
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << BITS) - 1)).count("1")
+
+def title_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the normalized title word sets."""
+    ta, tb = set(_tokens(a)), set(_tokens(b))
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+def is_near_duplicate(sig_a: int, title_a: str, sig_b: int, title_b: str, max_distance: int) -> bool:
+    return hamming(sig_a, sig_b) <= max_distance and title_similarity(title_a, title_b) >= MIN_TITLE_JACCARD
+
+def to_signed(signature: int) -> int:
+    """Map an unsigned 64-bit value into SQL BIGINT range."""
+    return signature - (1 << BITS) if signature >= 1 << (BITS - 1) else signature
+
+def to_unsigned(value: int) -> int:
+    return value & ((1 << BITS) - 1)
@@ -0,0 +1,138 @@
+"""Concurrent polling of several job sources.
+
+Each source runs ``search`` in its own thread under its own deadline (the
+cycle deadline, tightened by the source's ``time_budget_seconds``) and
+puts jobs on one bounded queue. The polling service consumes the queue on
+its own thread, so dedup, scoring and the database session stay
+single-threaded. When the consumer stops early, producers are told to stop
+and their searches closed, which defers their unfetched URLs exactly as a
+single lazy search would; a producer may have fetched about a page beyond
+the stopping point. A source whose search failed or ran out of time is
+reported by ``SourcesFailed`` once the other sources have finished.
+"""
+import contextvars
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional
+from job_agent.core import deadline
+from job_agent.core.deadline import Deadline, DeadlineExceeded
+from job_agent.models.job import JobPosting
+
+log = logging.getLogger("job_agent.fanout")
+
+_DONE = object()
+
+# How long the consumer waits, in all, for producers to wind down once it stops.
+JOIN_TIMEOUT_SECONDS = 5.0
+
+class SourcesFailed(Exception):
+    """Some sources' searches did not run to the end; the jobs they yielded were delivered."""
+
+    def __init__(self, errors: Dict[str, Exception]):
+        self.errors = errors
+        super().__init__("; ".join(f"{name}: {e}" for name, e in errors.items()))
+
+    @property
+    def sources(self) -> List[str]:
+        return list(self.errors)
+
+class SourceRun(NamedTuple):
+    name: str
+    source: object
+    urls: Optional[List[str]]  # None: all of the source's configured URLs
+    time_budget: Optional[float]
+
+def source_deadline(cycle: Deadline, budget: Optional[float]) -> Deadline:
+    """The tighter of the cycle deadline and a source's own time budget."""
+    remaining = cycle.remaining()
+    if budget is None or (remaining is not None and remaining <= budget):
+        return cycle
+    return Deadline(budget)
+
+def _put(q: queue.Queue, stop: threading.Event, item) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def search(run: SourceRun) -> Iterator[JobPosting]:
+    """Yield one source's jobs on this thread, reporting a failed search like ``fan_out``.
+
+    The deadline is left to the caller: with a single source it bounds the whole cycle.
+    """
+    try:
+        yield from run.source.search(run.urls)
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        log.exception(f"Source {run.name} failed")
+        raise SourcesFailed({run.name: e}) from None
+
+def fan_out(runs: List[SourceRun], queue_size: int = 32) -> Iterator[JobPosting]:
+    """Yield jobs from all sources concurrently, in arrival order.
+
+    Raises ``SourcesFailed`` at the end if any source's search did not finish cleanly.
+    """
+    q: queue.Queue = queue.Queue(queue_size)
+    stop = threading.Event()
+    cycle = deadline.current()
+    errors: Dict[str, Exception] = {}
+
+    def produce(run: SourceRun):
+        found = 0
+        try:
+            with source_deadline(cycle, run.time_budget).active():
+                jobs = run.source.search(run.urls)
+                try:
+                    for job in jobs:
+                        if not _put(q, stop, job):
+                            break
+                        found += 1
+                finally:
+                    close = getattr(jobs, "close", None)
+                    if close:
+                        close()
+        except DeadlineExceeded as e:
+            log.warning(f"Source {run.name} stopped early: {e}")
+            errors[run.name] = e
+        except Exception as e:
+            log.exception(f"Source {run.name} failed")
+            errors[run.name] = e
+        finally:
+            log.debug(f"Source {run.name} yielded {found} jobs")
+            _put(q, stop, _DONE)
+
+    # Each thread runs in a copy of this context, so its records carry the cycle's log ids.
+    threads = [
+        threading.Thread(
+            target=contextvars.copy_context().run, args=(produce, run), name=f"source-{run.name}", daemon=True
+        )
+        for run in runs
+    ]
+    for t in threads:
+        t.start()
+    try:
+        pending = len(threads)
+        while pending:
+            item = q.get()
+            if item is _DONE:
+                pending -= 1
+            else:
+                yield item
+        if errors:
+            raise SourcesFailed(errors)
+    finally:
+        stop.set()
+        # Waiting lets producers close their searches and record deferred URLs; one stuck
+        # in a call is left behind (the threads are daemons) rather than holding the cycle.
+        until = time.monotonic() + JOIN_TIMEOUT_SECONDS
+        for t in threads:
+            t.join(max(until - time.monotonic(), 0))
+        stuck = [t.name for t in threads if t.is_alive()]
+        if stuck:
+            log.warning(f"Producers still running after {JOIN_TIMEOUT_SECONDS}s: {', '.join(stuck)}")
@@ -1,9 +1,192 @@
+"""Logging setup: records are queued by the calling thread and written by a background one.
+
+``setup_logging`` puts a ``QueueHandler`` on the root logger and a
+``QueueListener`` behind it, so formatting and stream I/O never run on the
+polling thread; a slow log driver then delays the listener, not the cycle.
+The queue is bounded: when it is full, records are dropped rather than
+blocking the caller, and the next record that fits is preceded by a
+warning with the count.
+
+Records are stamped, in the calling thread, with the ids set by
+``log_context`` (the polling cycle, the search URL being fetched). The
+``json`` format writes them as one compact JSON object per line. Per-logger
+sampling keeps a fixed fraction of a noisy logger's INFO and DEBUG records;
+warnings and errors are always kept.
+"""
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s :: %(message)s"
+
+_TRACEBACKS = logging.Formatter()
+
+_cycle_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("log_cycle_id", default=None)
+_url_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("log_url_id", default=None)
+
+def new_cycle_id() -> str:
+    return uuid.uuid4().hex[:8]
+
+@contextmanager
+def log_context(cycle: Optional[str] = None, url: Optional[str] = None):
+    """Tag records logged in this block (in this thread) with a cycle and/or URL id."""
+    tokens = []
+    if cycle is not None:
+        tokens.append((_cycle_id, _cycle_id.set(cycle)))
+    if url is not None:
+        tokens.append((_url_id, _url_id.set(url)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+class ContextFilter(logging.Filter):
+    """Copies the current cycle and URL ids onto each record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.cycle_id = _cycle_id.get()
+        record.url_id = _url_id.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keeps ``rate`` of the INFO-and-below records of each configured logger (and its children).
+
+    Sampling is by count rather than at random: the first record and then
+    every ``1 / rate``-th one are kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._seen: Counter = Counter()
+        # Filters run outside the handler lock, and several threads log at once.
+        self._lock = threading.Lock()
+
+    def _rate(self, name: str) -> Optional[float]:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self._rate(record.name)
+        if rate is None:
+            return True
+        if rate <= 0:
+            return False
+        with self._lock:
+            n = self._seen[record.name]
+            self._seen[record.name] = n + 1
+        return n % max(1, round(1 / rate)) == 0
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        cycle_id = getattr(record, "cycle_id", None)
+        url_id = getattr(record, "url_id", None)
+        if cycle_id:
+            entry["cycle"] = cycle_id
+        if url_id:
+            entry["url"] = url_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """A ``QueueHandler`` that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Like the base class, merge the args now (they may change later), but keep
+        # the traceback in exc_text so the writer's formatter can place it.
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _TRACEBACKS.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.dropped:
+                notice = logging.LogRecord(
+                    "job_agent.logging", logging.WARNING, __file__, 0,
+                    "Log queue was full; dropped %s records", (self.dropped,), None,
+                )
+                self.queue.put_nowait(self.prepare(notice))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[DroppingQueueHandler] = None
+
+def setup_logging(
+    level: str = "INFO",
+    fmt: str = "text",
+    sampling: Optional[Dict[str, float]] = None,
+    queue_size: int = 10000,
+    stream=None,
+):
+    """Route all logging through a bounded queue to a background writer.
+
+    Like ``basicConfig``, this does nothing if the root logger already has
+    handlers that it did not install (e.g. a test runner's); calling it
+    again replaces its own setup.
+    """
+    global _listener, _handler
+    root = logging.getLogger()
+    if any(h is not _handler for h in root.handlers):
+        return
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+    _handler = DroppingQueueHandler(queue.Queue(queue_size))
+    _handler.addFilter(ContextFilter())
+    if sampling:
+        _handler.addFilter(SamplingFilter(sampling))
+    _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(_handler)
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread (run at exit)."""
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
 
-def setup_logging(level: str = "INFO"):
-    logging.basicConfig(
-        level=getattr(logging, level.upper(), logging.INFO),
-        format="%(asctime)s %(levelname)s %(name)s :: %(message)s",
-        stream=sys.stdout,
-    )
+atexit.register(shutdown_logging)
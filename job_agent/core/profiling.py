@@ -0,0 +1,155 @@
+"""Opt-in profiling of a single polling cycle.
+
+Code on the polling path wraps its work in ``profiler.stage(name)``. The
+default ``NULL_PROFILER`` makes that a no-op; ``CycleProfiler`` records,
+for the whole cycle, a cProfile of every call and, per stage, call count,
+wall and CPU time, peak traced memory and the source lines that allocated
+the most memory still alive when the stage ended. Traces are cleared as a
+stage starts, so the snapshot at its end holds only that stage's
+allocations and costs time in proportion to them, not to the whole heap.
+The profiler's own bookkeeping runs with cProfile paused and outside the
+stage timers.
+
+Outputs in the chosen directory, named the same on every run so two runs
+can be diffed:
+
+* ``cycle.pstats``: cProfile data, for ``python -m pstats`` or snakeviz
+* ``cycle.txt``: the top functions by cumulative time
+* ``stages.json``: per-stage timings and top allocators
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+STAGES = ("fetch", "parse", "score", "store", "notify")
+
+class NullProfiler:
+    """Profiler that records nothing; the default everywhere."""
+
+    _noop = nullcontext()
+
+    def stage(self, name: str):
+        return self._noop
+
+    def cycle(self):
+        return self._noop
+
+NULL_PROFILER = NullProfiler()
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_bytes: int = 0
+    allocations: Counter = field(default_factory=Counter)  # "file:line" -> bytes still live at stage end
+    blocks: Counter = field(default_factory=Counter)  # "file:line" -> blocks still live at stage end
+
+class CycleProfiler(NullProfiler):
+    """Collects cProfile, per-stage times and tracemalloc allocators for one cycle."""
+
+    def __init__(self, out_dir: str, top: int = 15, frames: int = 1):
+        self.out_dir = out_dir
+        self.top = top
+        self.frames = frames
+        self.stats = {name: StageStats() for name in STAGES}
+        self.wall = self.cpu = 0.0
+        self._profile = None
+        self._filters = None
+        self._depth = 0
+        self._active = False
+        self._thread = None
+
+    @contextmanager
+    def cycle(self):
+        import cProfile
+        import tracemalloc
+
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        tracemalloc.start(self.frames)
+        self._profile = cProfile.Profile()
+        started = datetime.now(timezone.utc)
+        wall, cpu = time.perf_counter(), time.process_time()
+        self._active = True
+        self._thread = threading.get_ident()
+        self._profile.enable()
+        try:
+            yield self
+        finally:
+            self._profile.disable()
+            self._active = False
+            self.wall = time.perf_counter() - wall
+            self.cpu = time.process_time() - cpu
+            tracemalloc.stop()
+            self.write(started)
+
+    @contextmanager
+    def stage(self, name: str):
+        # Nested stages are timed by the outer one only; stages outside the cycle
+        # or on other threads (which cProfile does not see either) are skipped.
+        if not self._active or self._depth or threading.get_ident() != self._thread:
+            yield
+            return
+        import tracemalloc
+
+        self._profile.disable()
+        tracemalloc.clear_traces()
+        self._depth += 1
+        self._profile.enable()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self._profile.disable()
+            self._depth -= 1
+            stats = self.stats.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.wall += wall
+            stats.cpu += cpu
+            stats.peak_bytes = max(stats.peak_bytes, tracemalloc.get_traced_memory()[1])
+            snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+            for stat in snapshot.statistics("lineno"):
+                frame = stat.traceback[0]
+                where = f"{frame.filename}:{frame.lineno}"
+                stats.allocations[where] += stat.size
+                stats.blocks[where] += stat.count
+            self._profile.enable()
+
+    def report(self, started: datetime) -> dict:
+        stages = {}
+        for name, s in self.stats.items():
+            stages[name] = {
+                "calls": s.calls,
+                "wall_s": round(s.wall, 6),
+                "cpu_s": round(s.cpu, 6),
+                "peak_kb": round(s.peak_bytes / 1024, 1),
+                "top_allocations": [
+                    {"where": where, "kb": round(size / 1024, 1), "blocks": s.blocks[where]}
+                    for where, size in s.allocations.most_common(self.top)
+                ],
+            }
+        return {
+            "started_at": started.isoformat(),
+            "cycle": {"wall_s": round(self.wall, 6), "cpu_s": round(self.cpu, 6)},
+            "stages": stages,
+        }
+
+    def write(self, started: datetime):
+        import pstats
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        self._profile.dump_stats(os.path.join(self.out_dir, "cycle.pstats"))
+        with open(os.path.join(self.out_dir, "cycle.txt"), "w", encoding="utf-8") as fh:
+            pstats.Stats(self._profile, stream=fh).sort_stats("cumulative").print_stats(50)
+        with open(os.path.join(self.out_dir, "stages.json"), "w", encoding="utf-8") as fh:
+            json.dump(self.report(started), fh, indent=2)
+            fh.write("\n")
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+import yaml
+from job_agent.core.config import update_config
+from job_agent.core.scoring import ScoringMatcher
+from job_agent.models.profile import RootProfile
+
+log = logging.getLogger("job_agent.reload")
+
+# Sections that can be swapped into a running daemon. Anything else (db_url,
+# SMTP credentials, ...) is picked up on the next restart.
+RELOADABLE_SECTIONS = {"polling", "sources", "scoring", "profile_path"}
+
+class WatchedFile:
+    """A file whose content is re-read only when its stat changes, and reported only when its hash changes.
+
+    New content counts as loaded only once ``commit()`` is called, so content
+    that failed to apply is reported again by the next ``read_if_changed()``.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._stat = None
+        self._pending = None
+        self.digest: Optional[str] = None
+
+    def prime(self):
+        """Record the current content as already loaded."""
+        self.read_if_changed()
+        self.commit()
+
+    def read_if_changed(self) -> Optional[bytes]:
+        """Return the file content if it changed since the last commit, else None."""
+        try:
+            st = self.path.stat()
+        except OSError as e:
+            log.warning(f"Cannot stat {self.path}: {e}")
+            return None
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if stat_key == self._stat:
+            return None
+        data = self.path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if digest == self.digest:
+            self._stat = stat_key
+            return None
+        self._pending = (stat_key, digest)
+        return data
+
+    def commit(self):
+        """Record the content last returned by ``read_if_changed()`` as loaded."""
+        if self._pending is not None:
+            self._stat, self.digest = self._pending
+            self._pending = None
+
+def _section_digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class ConfigReloader:
+    """Watches the config and profile files and swaps changed parts into a running daemon.
+
+    ``check()`` is meant to be called between polling cycles. Only the
+    top-level config sections whose content changed are re-validated, and
+    only the components depending on them are rebuilt: the scoring matcher
+    (profile, ``scoring``), the job sources' parsers/HTTP clients (``sources``) and
+    the polling interval (``polling``). A file that fails to parse or validate
+    is logged and the previous config stays in effect; nothing from that check
+    counts as loaded, so the whole change is retried once the file is fixed.
+    """
+
+    def __init__(self, ctx, polling_service, config_path: str, scheduler=None):
+        self.ctx = ctx
+        self.polling_service = polling_service
+        self.scheduler = scheduler
+        self.config_file = WatchedFile(config_path)
+        self.profile_file = WatchedFile(ctx.cfg.profile_path)
+        self._sections: dict = {}
+
+        data = self.config_file.read_if_changed()
+        if data is not None:
+            self._sections = {k: _section_digest(v) for k, v in (yaml.safe_load(data) or {}).items()}
+        self.config_file.commit()
+        self.profile_file.prime()
+
+    def check(self):
+        """Reload whichever of the config and profile files changed."""
+        try:
+            self._check()
+        except Exception as e:
+            log.error(f"Config reload failed, keeping previous config: {e}")
+
+    def _check(self):
+        cfg = self.ctx.cfg
+        changed = set()
+        digests = None
+
+        data = self.config_file.read_if_changed()
+        if data is not None:
+            raw = yaml.safe_load(data) or {}
+            digests = {k: _section_digest(v) for k, v in raw.items()}
+            changed = {k for k, d in digests.items() if self._sections.get(k) != d}
+            ignored = changed - RELOADABLE_SECTIONS
+            if ignored:
+                log.warning(f"Config sections changed but need a restart: {sorted(ignored)}")
+            changed &= RELOADABLE_SECTIONS
+            if changed:
+                cfg = update_config(cfg, {k: raw[k] for k in changed})
+
+        profile = None
+        profile_file = self.profile_file
+        if "profile_path" in changed and cfg.profile_path != self.ctx.cfg.profile_path:
+            profile_file = WatchedFile(cfg.profile_path)
+        profile_data = profile_file.read_if_changed()
+        if profile_data is not None:
+            profile = RootProfile(**(yaml.safe_load(profile_data) or {})).profile
+
+        if changed or profile is not None:
+            self._apply(cfg, changed, profile)
+
+        # Only now is the new content in effect: an error above leaves it to be retried.
+        if digests is not None:
+            self._sections = digests
+        self.config_file.commit()
+        self.profile_file = profile_file
+        profile_file.commit()
+
+    def _apply(self, cfg, changed: set, profile):
+        """Swap the validated config into the running components, all or nothing.
+
+        The new matcher, sources and polling trigger are all built before any
+        running component is touched, then installed together with ``cfg``.
+        """
+        scoring = None
+        if profile is not None or "scoring" in changed:
+            scoring_profile = profile or self.polling_service.profile
+            scoring = (scoring_profile, ScoringMatcher(scoring_profile, cfg.scoring))
+        sources = self.ctx.prepare_sources(cfg.sources) if "sources" in changed else None
+        reschedule = "polling" in changed and self.scheduler is not None
+        trigger = self.scheduler.polling_trigger(cfg.polling) if reschedule else None
+
+        # Rescheduling is the only install step that can fail, so it goes first.
+        if reschedule:
+            self.scheduler.reschedule_polling(cfg.polling, trigger)
+        if scoring is not None:
+            self.polling_service.install_scoring(*scoring)
+        self.ctx.install_sources(sources)
+        self.ctx.cfg = cfg
+
+        parts = sorted(changed) + (["profile"] if profile is not None else [])
+        log.info(f"Reloaded configuration: {', '.join(parts)}")
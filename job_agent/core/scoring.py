@@ -1,5 +1,6 @@
 import re
-from job_agent.models.score import ScoreResult
+from typing import List, NamedTuple, Optional, Sequence
+from job_agent.models.score import Factor, ScoreResult
 from job_agent.models.job import JobPosting
 from job_agent.models.profile import Profile
 from job_agent.models.config import ScoringCfg
@@ -7,81 +8,171 @@ from job_agent.models.config import ScoringCfg
 def _norm(text: str) -> str:
     return re.sub(r"\s+", " ", (text or "").lower()).strip()
 
-def _contains(text: str, keywords: list[str]) -> bool:
-    t = _norm(text)
-    return any(_norm(k) in t for k in keywords if k)
+FRESHNESS_BUCKETS = ("just_now", "today", "last_3_days")
 
-def _count(text: str, keywords: list[str]) -> int:
-    t = _norm(text)
-    return sum(1 for k in keywords if k and _norm(k) in t)
-
-def _freshness_boost(posted_text: str, cfg: ScoringCfg) -> int:
+def _freshness_bucket(posted_text: str) -> str:
+    """The ``FreshnessBoostCfg`` field that applies to a posted date, or "" for none."""
     t = _norm(posted_text)
     if not t:
-        return 0
+        return ""
     if "just" in t or "minute" in t:
-        return cfg.freshness_boost.just_now
+        return "just_now"
     if "today" in t or "hour" in t:
-        return cfg.freshness_boost.today
+        return "today"
     if "day" in t:
         m = re.search(r"(\d+)", t)
         if m and int(m.group(1)) <= 3:
-            return cfg.freshness_boost.last_3_days
-    return 0
+            return "last_3_days"
+    return ""
+
+def _norm_all(keywords: list[str]) -> tuple[str, ...]:
+    return tuple(_norm(k) for k in keywords if k)
+
+def _any_in(text: str, keywords: tuple[str, ...]) -> bool:
+    return any(k in text for k in keywords)
+
+def _hits(text: str, keywords: tuple[str, ...]) -> int:
+    return sum(1 for k in keywords if k in text)
+
+class MatchFeatures(NamedTuple):
+    """What a job matched, before any weights are applied."""
+    reject: int  # Factor.REJECT_TITLE or REJECT_DESC; other fields unset
+    title_hits: int = 0
+    skill_hits: int = 0
+    seniority: bool = False
+    location: bool = False
+    company_pref: bool = False
+    company_avoid: bool = False
+    freshness: str = ""  # one of FRESHNESS_BUCKETS, or ""
+    similarity: Optional[float] = None
+
+_SENIORITY_RE = re.compile(r"\bsenior\b|\blead\b|\bprincipal\b|\bstaff\b")
+
+class ScoringMatcher:
+    """Scoring rules for one profile and scoring config.
+
+    Keyword lists are normalized once at construction, so a long-running
+    process only pays for it again when the profile or config is reloaded.
+    """
+
+    def __init__(self, profile: Profile, cfg: ScoringCfg):
+        self.profile = profile
+        self.cfg = cfg
+        self._reject_title = _norm_all(cfg.hard_filters.reject_title_keywords)
+        self._reject_desc = _norm_all(cfg.hard_filters.reject_desc_keywords)
+        self._titles = _norm_all(profile.target_titles)
+        self._skills = _norm_all(
+            profile.must_have_skills
+            + profile.nice_to_have_skills
+            + profile.domain_keywords
+        )
+        self._locations = _norm_all(profile.preferred_locations)
+        self._preferred = _norm_all(profile.company_preferences.preferred)
+        self._avoided = _norm_all(profile.company_preferences.avoided)
+        self._similarity = None
+        if cfg.weights.similarity:
+            # Imported here so NumPy is only loaded when the factor is enabled.
+            from job_agent.core.similarity import ProfileSimilarity
+            self._similarity = ProfileSimilarity(profile)
+
+    def score_many(self, jobs: Sequence[JobPosting]) -> List[ScoreResult]:
+        """Score a batch, computing profile similarity for all jobs at once."""
+        if self._similarity is None:
+            return [self.score(job) for job in jobs]
+        sims = self._similarity.similarities([f"{job.title}\n{job.description}" for job in jobs])
+        return [self.score(job, sim) for job, sim in zip(jobs, sims)]
+
+    def score(self, job: JobPosting, similarity: Optional[float] = None) -> ScoreResult:
+        """Score one job; ``similarity`` may be passed in when computed for a batch."""
+        return self.weigh(self.match(job, similarity))
+
+    def match(self, job: JobPosting, similarity: Optional[float] = None) -> MatchFeatures:
+        """What the job matched in the profile, independent of weights."""
+        title = _norm(job.title)
+        text = _norm(f"{job.title} {job.description}")
+        company = _norm(job.company)
+
+        # hard filters
+        if _any_in(title, self._reject_title):
+            return MatchFeatures(int(Factor.REJECT_TITLE))
+        if _any_in(text, self._reject_desc):
+            return MatchFeatures(int(Factor.REJECT_DESC))
+
+        if self._similarity is not None and similarity is None:
+            similarity = self._similarity.similarity(f"{job.title}\n{job.description}")
+
+        return MatchFeatures(
+            reject=0,
+            title_hits=_hits(title, self._titles),
+            skill_hits=_hits(text, self._skills),
+            seniority=bool(_SENIORITY_RE.search(title)),
+            location=_any_in(_norm(job.location), self._locations),
+            company_pref=_any_in(company, self._preferred),
+            company_avoid=_any_in(company, self._avoided),
+            freshness=_freshness_bucket(job.posted_text),
+            similarity=similarity,
+        )
+
+    def weigh(self, features: MatchFeatures, cfg: Optional[ScoringCfg] = None) -> ScoreResult:
+        """Apply the scoring config's weights (or ``cfg``'s) to matched features."""
+        cfg = cfg or self.cfg
+        if features.reject:
+            return ScoreResult(0, features.reject, (0,), "SKIP")
+
+        score_val = 0
+        factors = 0
+        points: list[int] = []
+
+        if features.title_hits:
+            inc = min(cfg.weights.title_match, 10 * features.title_hits + 10)
+            score_val += inc
+            factors |= Factor.TITLE
+            points.append(inc)
+
+        if features.skill_hits:
+            inc = min(cfg.weights.skill_match, 6 * features.skill_hits + 15)
+            score_val += inc
+            factors |= Factor.SKILL
+            points.append(inc)
+
+        if features.seniority:
+            score_val += cfg.weights.seniority_match
+            factors |= Factor.SENIORITY
+            points.append(cfg.weights.seniority_match)
+
+        if features.location:
+            score_val += cfg.weights.location_match
+            factors |= Factor.LOCATION
+            points.append(cfg.weights.location_match)
+
+        if features.company_pref:
+            score_val += cfg.weights.company_pref
+            factors |= Factor.COMPANY_PREF
+            points.append(cfg.weights.company_pref)
+
+        if features.company_avoid:
+            score_val = max(0, score_val - 20)
+            factors |= Factor.COMPANY_AVOID
+            points.append(20)
+
+        freshness = getattr(cfg.freshness_boost, features.freshness) if features.freshness else 0
+        if freshness:
+            score_val += freshness
+            factors |= Factor.FRESHNESS
+            points.append(freshness)
+
+        if features.similarity is not None and cfg.weights.similarity:
+            from job_agent.core.similarity import ProfileSimilarity
+            inc = ProfileSimilarity.points(features.similarity, cfg.weights.similarity)
+            if inc:
+                score_val += inc
+                factors |= Factor.SIMILARITY
+                points.append(inc)
+
+        score_val = min(100, max(0, score_val))
+        action = "EMAIL" if score_val >= cfg.min_score_to_email else "QUEUE"
+
+        return ScoreResult(score_val, int(factors), tuple(points), action)
 
 def score(job: JobPosting, profile: Profile, cfg: ScoringCfg) -> ScoreResult:
-    title = job.title or ""
-    text = f"{job.title} {job.description}"
-
-    # hard filters
-    if _contains(title, cfg.hard_filters.reject_title_keywords):
-        return ScoreResult(0, ["Rejected by title filter"], "SKIP")
-
-    if _contains(text, cfg.hard_filters.reject_desc_keywords):
-        return ScoreResult(0, ["Rejected by description filter"], "SKIP")
-
-    score_val = 0
-    reasons: list[str] = []
-
-    title_hits = _count(title, profile.target_titles)
-    if title_hits:
-        inc = min(cfg.weights.title_match, 10 * title_hits + 10)
-        score_val += inc
-        reasons.append(f"Title match (+{inc})")
-
-    skill_hits = _count(
-        text,
-        profile.must_have_skills
-        + profile.nice_to_have_skills
-        + profile.domain_keywords,
-    )
-    if skill_hits:
-        inc = min(cfg.weights.skill_match, 6 * skill_hits + 15)
-        score_val += inc
-        reasons.append(f"Skill/domain match (+{inc})")
-
-    if re.search(r"\bsenior\b|\blead\b|\bprincipal\b|\bstaff\b", _norm(title)):
-        score_val += cfg.weights.seniority_match
-        reasons.append(f"Seniority signal (+{cfg.weights.seniority_match})")
-
-    if profile.preferred_locations and _contains(job.location, profile.preferred_locations):
-        score_val += cfg.weights.location_match
-        reasons.append(f"Location match (+{cfg.weights.location_match})")
-
-    if profile.company_preferences.preferred and _contains(job.company, profile.company_preferences.preferred):
-        score_val += cfg.weights.company_pref
-        reasons.append(f"Preferred company (+{cfg.weights.company_pref})")
-
-    if profile.company_preferences.avoided and _contains(job.company, profile.company_preferences.avoided):
-        score_val = max(0, score_val - 20)
-        reasons.append("Avoided company (-20)")
-
-    freshness = _freshness_boost(job.posted_text, cfg)
-    if freshness:
-        score_val += freshness
-        reasons.append(f"Freshness (+{freshness})")
-
-    score_val = min(100, max(0, score_val))
-    action = "EMAIL" if score_val >= cfg.min_score_to_email else "QUEUE"
-
-    return ScoreResult(score_val, reasons, action)
+    return ScoringMatcher(profile, cfg).score(job)
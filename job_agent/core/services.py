@@ -1,8 +1,19 @@
 import logging
-from job_agent.core.utils import stable_job_key
-from job_agent.core.scoring import score
-from job_agent.models.job import ObservedJob
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from job_agent.core.utils import canonical_job_id, stable_job_key
+from job_agent.core.scoring import ScoringMatcher
+from job_agent.core.dedup import simhash
+from job_agent.core import deadline
+from job_agent.core.deadline import DeadlineExceeded
+from job_agent.core import fanout
+from job_agent.core.fanout import SourceRun, SourcesFailed, fan_out, source_deadline
+from job_agent.core.logging import log_context, new_cycle_id
+from job_agent.models.job import JobPosting, ObservedJob
 from job_agent.models.profile import Profile
+from job_agent.models.config import ScoringCfg
 
 log = logging.getLogger("job_agent.services")
 
@@ -10,36 +21,177 @@ class PollingService:
     def __init__(self, ctx, profile: Profile):
         self.ctx = ctx
         self.profile = profile
+        self.matcher = ScoringMatcher(profile, ctx.cfg.scoring)
+        # Start times of the most recent clean cycles of each source (and, when
+        # coordinating, of each leased search URL), for the closed-posting sweep.
+        self._clean_cycles = {}
+
+    def update_scoring(self, profile: Profile, scoring_cfg: ScoringCfg):
+        """Swap in a new profile and scoring config between cycles."""
+        self.install_scoring(profile, ScoringMatcher(profile, scoring_cfg))
+
+    def install_scoring(self, profile: Profile, matcher: ScoringMatcher):
+        """Swap in a profile and a matcher already built for it."""
+        self.profile, self.matcher = profile, matcher
 
     def run_once(self, send_email: bool = True):
-        source = self.ctx.naukri_source
-        repo = self.ctx.job_repo()
+        # One session per cycle, closed at its end, so nothing accumulates across cycles.
+        with log_context(cycle=new_cycle_id()), self.ctx.job_repo() as repo:
+            self._run_once(repo, send_email)
+
+    def _run_once(self, repo, send_email: bool):
         notifier = self.ctx.notifier if send_email else None
-        clock = self.ctx.clock
+        max_new = self.ctx.cfg.polling.max_jobs_per_run
 
-        if not source:
-            log.warning("No enabled job sources.")
+        runs = self._source_runs()
+        if not runs:
             return
 
-        jobs = source.search()[: self.ctx.cfg.polling.max_jobs_per_run]
+        # Sources are lazy: stopping here means no further pages are requested.
+        started = self.ctx.clock.now_utc()
         new_count = 0
+        seen = {}  # canonical id -> key of the job stored by an earlier cycle, or None if new
+        complete = True
+        failed = []
+        with ExitStack() as stack:
+            if len(runs) == 1:
+                # One source needs no threads; its time budget bounds the whole cycle.
+                stack.enter_context(source_deadline(deadline.current(), runs[0].time_budget).active())
+                jobs = fanout.search(runs[0])
+            else:
+                jobs = fan_out(runs)
+            try:
+                for job in jobs:
+                    if self._process(job, repo, notifier, seen):
+                        new_count += 1
+                        if new_count >= max_new:
+                            log.info("Reached max_jobs_per_run (%s); deferring remaining URLs", max_new)
+                            complete = False
+                            break
+            except DeadlineExceeded as e:
+                log.warning("Polling cycle stopped early: %s; deferring remaining URLs", e)
+                complete = False
+            except SourcesFailed as e:
+                failed = e.sources
+            finally:
+                close = getattr(jobs, "close", None)
+                if close:
+                    close()
 
-        for job in jobs:
-            key = stable_job_key(job.url)
-            if repo.exists(key):
-                continue
+        seen_again = [key for key in seen.values() if key]
+        with self.ctx.profiler.stage("store"):
+            if seen_again:
+                repo.mark_seen(seen_again, self.ctx.clock.now_utc())
+            if complete:
+                self._sweep(repo, [run for run in runs if run.name not in failed], started)
+        log.info("Polling completed. New jobs: %s, seen again: %s", new_count, len(seen_again))
 
-            observed = ObservedJob(job, key, clock.now_utc())
-            score_result = score(job, self.profile, self.ctx.cfg.scoring)
+    def _sweep(self, repo, runs: list, started):
+        """Close stored jobs that none of the last ``close_after_cycles`` clean searches saw.
+
+        Only cycles that ran every search to the end count, and for each
+        source only cycles in which its own search fetched and parsed every
+        URL, since a cut-short or failed search leaves postings unseen that
+        are still live. When coordinating, a worker searches only its leased
+        URLs, so history is kept per URL and only jobs found on URLs this
+        worker searched cleanly are closed. A closed job that shows up again
+        is reopened by ``mark_seen``.
+        """
+        n = self.ctx.cfg.polling.close_after_cycles
+        if not n:
+            return
+        due = defaultdict(list)  # (oldest clean cycle start, source) -> search URLs (None: all)
+        for run in runs:
+            for url in [None] if run.urls is None else run.urls:
+                cycles = self._clean_cycles.get((run.name, url))
+                if cycles is None or cycles.maxlen != n:
+                    cycles = self._clean_cycles[(run.name, url)] = deque(cycles or (), maxlen=n)
+                cycles.append(started)
+                if len(cycles) == n:
+                    due[(cycles[0], run.name)].append(url)
+        now = self.ctx.clock.now_utc()
+        closed = sum(
+            repo.close_unseen(before, [name], now, None if None in urls else urls)
+            for (before, name), urls in due.items()
+        )
+        if closed:
+            log.info("Marked %s jobs closed (not seen in the last %s cycles)", closed, n)
+
+    def _source_runs(self) -> list:
+        """What to search this cycle: every enabled source, limited to leased URLs when coordinating."""
+        sources = self.ctx.sources
+        if not sources:
+            log.warning("No enabled job sources.")
+            return []
+        configs = self.ctx.source_configs()
+        owned = None
+        coordinator = self.ctx.coordinator
+        if coordinator:
+            all_urls = [u for name in sources if name in configs for u in configs[name].search_urls]
+            owned = set(coordinator.acquire(all_urls))
+            if not owned:
+                log.info("No search URLs leased to this worker this cycle.")
+                return []
+        runs = []
+        for name, source in sources.items():
+            cfg = configs.get(name)
+            urls = None
+            if owned is not None:
+                urls = [u for u in (cfg.search_urls if cfg else []) if u in owned]
+                if not urls:
+                    continue
+            runs.append(SourceRun(name, source, urls, cfg.time_budget_seconds if cfg else None))
+        return runs
 
-            repo.insert(observed, score_result)
-            new_count += 1
+    def _process(self, job: JobPosting, repo, notifier, seen: dict) -> bool:
+        """Dedup, score, store and alert one job; True if it was new.
 
-            if notifier and score_result.action == "EMAIL":
-                notifier.send_job(observed, score_result, self._notes())
-                repo.mark_emailed(key)
+        Records the job in ``seen``; a posting listed again in the same cycle
+        (e.g. under other tracking parameters) is skipped.
+        """
+        profiler = self.ctx.profiler
+        canonical = canonical_job_id(job.source, job.url)
+        if canonical in seen:
+            return False
+        with profiler.stage("store"):
+            stored = seen[canonical] = repo.find_key(canonical)
+            if stored:
+                return False
+        key = stable_job_key(canonical)
 
-        log.info("Polling completed. New jobs: %s", new_count)
+        dedup_cfg = self.ctx.cfg.dedup
+        signature = duplicate_of = None
+        with profiler.stage("score"):
+            observed = ObservedJob(job, key, self.ctx.clock.now_utc(), canonical)
+            score_result = self.matcher.score(job)
+            if dedup_cfg.enabled:
+                signature = simhash(job)
+
+        with profiler.stage("store"):
+            if signature is not None:
+                duplicate_of = repo.find_near_duplicate(signature, job.title, dedup_cfg.max_distance)
+            if not repo.insert(observed, score_result, signature=signature, duplicate_of=duplicate_of):
+                seen[canonical] = repo.find_key(canonical)
+                return False  # another worker stored it first
+
+        if duplicate_of:
+            log.info("Job %s is a repost of %s; linked, not alerting", key, duplicate_of)
+        elif notifier and score_result.action == "EMAIL":
+            with profiler.stage("notify"):
+                self._send(repo, notifier, observed, score_result)
+        return True
+
+    def _send(self, repo, notifier, observed: ObservedJob, score_result):
+        """Send an alert only if this worker wins the claim, so each job is emailed once."""
+        worker_id = self.ctx.worker_id
+        if not repo.claim_email(observed.job_key, worker_id):
+            return
+        try:
+            notifier.send_job(observed, score_result, self._notes())
+        except Exception:
+            repo.release_email_claim(observed.job_key, worker_id)
+            raise
+        repo.mark_emailed(observed.job_key)
 
     def _notes(self) -> str:
         lines = []
@@ -57,8 +209,122 @@ class DigestService:
         self.profile = profile
 
     def run_daily(self):
+        """Send today's digest, unless another worker sharing the store already claimed it."""
         notifier = self.ctx.notifier
         if not notifier:
             return
-        rows = self.ctx.job_repo().list_digest()
-        notifier.send_digest(rows)
+        day = self.ctx.clock.now_local().date()
+        worker_id = self.ctx.worker_id
+        with self.ctx.job_repo() as repo:
+            if not repo.claim_digest(day, worker_id):
+                log.info("Digest for %s already claimed by another worker", day)
+                return
+            try:
+                notifier.send_digest(repo.list_digest(), repo.day_stats(day))
+            except Exception:
+                repo.release_digest_claim(day, worker_id)
+                raise
+
+# Per-process matcher for RescoreService workers, built once by the pool initializer.
+_worker_matcher = None
+
+def _init_rescore_worker(profile: Profile, scoring_cfg: ScoringCfg):
+    global _worker_matcher
+    _worker_matcher = ScoringMatcher(profile, scoring_cfg)
+
+def _rescore_rows(rows, matcher=None) -> list:
+    """Score (job_key, job fields..., old score, old action) tuples; return only the changed ones."""
+    matcher = matcher or _worker_matcher
+    jobs = [
+        JobPosting(source, title, company, location, url, posted_text or "", description or "")
+        for _, source, title, company, location, url, posted_text, description, _, _ in rows
+    ]
+    changes = []
+    for (job_key, *_, old_score, old_action), result in zip(rows, matcher.score_many(jobs)):
+        if result.score != old_score or result.action != old_action:
+            changes.append({
+                "job_key": job_key,
+                "score": result.score,
+                "factors": result.factors,
+                "points": result.points,
+                "action": result.action,
+                "old_action": old_action,
+            })
+    return changes
+
+@dataclass
+class RescoreReport:
+    scanned: int = 0
+    changed: int = 0
+    transitions: Counter = field(default_factory=Counter)  # (old_action, new_action) -> count
+
+    def lines(self, dry_run: bool) -> list:
+        verb = "would now be" if dry_run else "are now"
+        out = [f"Scanned {self.scanned} jobs, {self.changed} changed."]
+        for action in ("EMAIL", "QUEUE", "SKIP"):
+            sources = {old: n for (old, new), n in self.transitions.items() if new == action and old != action}
+            if sources:
+                detail = ", ".join(f"were {old}: {n}" for old, n in sorted(sources.items()))
+                out.append(f"{sum(sources.values())} jobs {verb} {action} ({detail})")
+        same = sum(n for (old, new), n in self.transitions.items() if old == new)
+        if same:
+            out.append(f"{same} jobs changed score but kept their action")
+        return out
+
+class RescoreService:
+    """Re-evaluates stored jobs against the current profile and scoring config.
+
+    Jobs are streamed from the store in keyset-paginated chunks and scored in
+    a process pool with a bounded number of chunks in flight, so memory stays
+    flat regardless of table size. Only rows whose score or action changed are
+    written back, one bulk UPDATE per chunk.
+    """
+
+    def __init__(self, ctx, profile: Profile):
+        self.ctx = ctx
+        self.profile = profile
+
+    def run(self, chunk_size: int = 1000, workers: int = 0, dry_run: bool = False) -> RescoreReport:
+        with self.ctx.job_repo() as repo:
+            return self._run(repo, chunk_size, workers, dry_run)
+
+    def _run(self, repo, chunk_size: int, workers: int, dry_run: bool) -> RescoreReport:
+        report = RescoreReport()
+        chunks = repo.iter_score_inputs(chunk_size)
+
+        def apply(rows_scanned: int, changes: list):
+            report.scanned += rows_scanned
+            report.changed += len(changes)
+            report.transitions.update((c["old_action"], c["action"]) for c in changes)
+            if not dry_run:
+                repo.bulk_update_scores(changes)
+
+        if workers <= 0:
+            matcher = ScoringMatcher(self.profile, self.ctx.cfg.scoring)
+            for rows in chunks:
+                apply(len(rows), _rescore_rows([tuple(r) for r in rows], matcher))
+        else:
+            self._run_pool(chunks, workers, apply)
+        if report.changed and not dry_run:
+            repo.rebuild_stats(["score_band"])  # changed scores may have moved jobs between bands
+
+        log.info("Rescore completed. Scanned: %s, changed: %s", report.scanned, report.changed)
+        return report
+
+    def _run_pool(self, chunks, workers: int, apply):
+        max_in_flight = workers * 2
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_rescore_worker,
+            initargs=(self.profile, self.ctx.cfg.scoring),
+        ) as pool:
+            pending = {}
+            for rows in chunks:
+                future = pool.submit(_rescore_rows, [tuple(r) for r in rows])
+                pending[future] = len(rows)
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for f in done:
+                        apply(pending.pop(f), f.result())
+            for f in list(pending):
+                apply(pending.pop(f), f.result())
@@ -0,0 +1,99 @@
+"""Text similarity between job postings and the profile résumé.
+
+Texts become hashed bag-of-words vectors: lowercase word unigrams and
+bigrams, stop words dropped, hashed with CRC32 into ``DIM`` buckets,
+weighted by sublinear term frequency ``1 + ln(tf)``. The profile vector
+(summary, achievements, titles, skills and domain keywords) is built and
+L2-normalized once; a job's similarity is the cosine between the two.
+
+Without a corpus there is no document frequency to learn, so common words
+are handled by the stop list and sublinear weighting rather than IDF.
+``similarities`` scores a batch at once: with NumPy installed the dot
+products and norms for the whole batch are segment sums over one flat
+array; without it the same numbers come from a per-job sparse dot.
+"""
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Sequence
+from job_agent.models.profile import Profile
+
+try:
+    import numpy as np
+except ImportError:  # optional; the pure-Python path gives the same results
+    np = None
+
+DIM = 1 << 18
+
+# A cosine at or above this earns the full similarity weight. Short job
+# texts rarely share more than this with a résumé, even for close matches.
+SATURATION = 0.4
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the to we will with you your "
+    "i me my this that these those was were been over into across using role team work experience "
+    "years year looking candidate job opportunity".split()
+)
+
+def _terms(text: str) -> List[str]:
+    words = [w.rstrip(".") for w in _WORD_RE.findall(text.lower())]
+    words = [w for w in words if w and w not in _STOP_WORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def hashed_vector(text: str) -> Dict[int, float]:
+    """Sparse hashed term vector (bucket -> weight), not normalized."""
+    counts = Counter(zlib.crc32(t.encode("utf-8")) % DIM for t in _terms(text))
+    return {i: 1.0 + math.log(n) for i, n in counts.items()}
+
+def profile_text(profile: Profile) -> str:
+    parts = [profile.resume_summary, *profile.achievements, *profile.target_titles]
+    parts += profile.must_have_skills + profile.nice_to_have_skills + profile.domain_keywords
+    return "\n".join(p for p in parts if p)
+
+class ProfileSimilarity:
+    """Cosine similarity of job texts to one profile, with the profile vector precomputed."""
+
+    def __init__(self, profile: Profile):
+        vec = hashed_vector(profile_text(profile))
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        self._profile = {i: v / norm for i, v in vec.items()}
+        self._dense = None
+        if np is not None:
+            self._dense = np.zeros(DIM, dtype=np.float64)
+            self._dense[list(self._profile)] = list(self._profile.values())
+
+    @staticmethod
+    def points(similarity: float, weight: int) -> int:
+        """Score contribution: linear in the cosine, full ``weight`` from ``SATURATION`` up."""
+        return round(weight * min(1.0, similarity / SATURATION))
+
+    def similarity(self, text: str) -> float:
+        vec = hashed_vector(text)
+        if not vec or not self._profile:
+            return 0.0
+        profile = self._profile
+        dot = sum(v * profile[i] for i, v in vec.items() if i in profile)
+        return dot / math.sqrt(sum(v * v for v in vec.values()))
+
+    def similarities(self, texts: Sequence[str]) -> List[float]:
+        """Similarity of each text, computed for the batch at once when NumPy is available."""
+        if self._dense is None:
+            return [self.similarity(t) for t in texts]
+        vecs = [hashed_vector(t) for t in texts]
+        lengths = np.fromiter((len(v) for v in vecs), dtype=np.int64, count=len(vecs))
+        total = int(lengths.sum())
+        if total == 0:
+            return [0.0] * len(vecs)
+        # One trailing zero entry gives every segment, even a trailing empty one,
+        # a valid start for reduceat; empty texts are zeroed below.
+        indices = np.zeros(total + 1, dtype=np.int64)
+        weights = np.zeros(total + 1, dtype=np.float64)
+        indices[:total] = np.fromiter((i for v in vecs for i in v), dtype=np.int64, count=total)
+        weights[:total] = np.fromiter((w for v in vecs for w in v.values()), dtype=np.float64, count=total)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        dots = np.add.reduceat(weights * self._dense[indices], starts)
+        norms = np.sqrt(np.add.reduceat(weights * weights, starts))
+        sims = np.where(lengths > 0, dots / np.where(norms > 0, norms, 1.0), 0.0)
+        return sims.tolist()
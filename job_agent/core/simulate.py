@@ -0,0 +1,233 @@
+"""What-if evaluation of scoring configs over stored jobs.
+
+Matching a job against the profile (keyword hits, filters, freshness,
+similarity) does not depend on the weights, so stored jobs are matched once
+and their ``MatchFeatures`` kept as NumPy columns. Every candidate
+``ScoringCfg`` is then a handful of weights and a threshold: scores for all
+variants come from one broadcast over a (variants x jobs) array, processed
+in blocks of variants to bound memory, and agree exactly with
+``ScoringMatcher.weigh``.
+
+Reposts (``duplicate_of``) and hard-filtered jobs are never emailed,
+whatever the weights. Emails per day are counted over the calendar days
+(in the user's time zone) between the first and last stored job.
+"""
+import itertools
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Sequence
+import pytz
+from job_agent.core.scoring import FRESHNESS_BUCKETS, ScoringMatcher
+from job_agent.models.config import ScoringCfg
+from job_agent.models.job import JobPosting
+from job_agent.models.profile import Profile
+
+try:
+    import numpy as np
+except ImportError:  # optional; only this command needs it
+    np = None
+
+HISTORY_COLUMNS = ["source", "title", "company", "location", "url", "posted_text", "description",
+                   "first_seen_at", "status", "duplicate_of"]
+
+# Cells per (variants x jobs) block; bounds the temporaries of one broadcast.
+BLOCK_CELLS = 1 << 22
+
+def check_dependencies():
+    if np is None:
+        raise RuntimeError("simulate requires the optional numpy package (pip install numpy)")
+
+def tunable_fields() -> List[str]:
+    """Integer ``ScoringCfg`` settings a simulation can vary, as dotted paths."""
+    fields = ["min_score_to_email"]
+    for section in ("weights", "freshness_boost"):
+        model = ScoringCfg.model_fields[section].annotation
+        fields += [f"{section}.{name}" for name in model.model_fields]
+    return fields
+
+def parse_axis(value: str):
+    """Parse ``weights.skill_match=35,45,55`` into ``(path, [35, 45, 55])``."""
+    path, _, values = value.partition("=")
+    path = path.strip()
+    if path not in tunable_fields():
+        raise ValueError(f"Unknown setting '{path}'. Tunable: {', '.join(tunable_fields())}")
+    try:
+        return path, [int(v) for v in values.split(",") if v.strip()]
+    except ValueError:
+        raise ValueError(f"Values for {path} must be integers: {values!r}") from None
+
+def _with(cfg: ScoringCfg, changes: Dict[str, int]) -> ScoringCfg:
+    data = cfg.model_dump()
+    for path, value in changes.items():
+        section, _, name = path.rpartition(".")
+        (data[section] if section else data)[name] = value
+    return ScoringCfg(**data)
+
+class Variant(NamedTuple):
+    label: str
+    cfg: ScoringCfg
+
+def grid(base: ScoringCfg, axes: Sequence[tuple]) -> List[Variant]:
+    """The current config followed by every combination of the axis values."""
+    variants = [Variant("current", base)]
+    paths = [path for path, _ in axes]
+    for values in itertools.product(*(vals for _, vals in axes)):
+        changes = dict(zip(paths, values))
+        label = " ".join(f"{path.rpartition('.')[2]}={v}" for path, v in changes.items())
+        variants.append(Variant(label, _with(base, changes)))
+    return variants
+
+@dataclass
+class History:
+    """Matched features of stored jobs, one NumPy column per field."""
+    title_hits: "np.ndarray"
+    skill_hits: "np.ndarray"
+    seniority: "np.ndarray"
+    location: "np.ndarray"
+    company_pref: "np.ndarray"
+    company_avoid: "np.ndarray"
+    freshness: "np.ndarray"  # 0 for none, else 1 + index into FRESHNESS_BUCKETS
+    similarity: "np.ndarray"
+    rejected: "np.ndarray"
+    emailable: "np.ndarray"  # not a repost
+    applied: "np.ndarray"
+    days: int
+
+    def __len__(self):
+        return len(self.title_hits)
+
+def load_history(repo, matcher: ScoringMatcher, tz, similarity=None, chunk_size: int = 5000,
+                 since=None, until=None) -> History:
+    """Match every stored job once.
+
+    ``tz`` is the user's time zone for counting days; ``similarity`` is a
+    ``ProfileSimilarity`` when any variant weighs it.
+    """
+    check_dependencies()
+    fresh_codes = {name: i + 1 for i, name in enumerate(FRESHNESS_BUCKETS)}
+    columns: Dict[str, list] = {name: [] for name in History.__dataclass_fields__ if name != "days"}
+    first_day = last_day = None
+    for rows in repo.iter_export(HISTORY_COLUMNS, since=since, until=until, chunk_size=chunk_size):
+        jobs = [JobPosting(*row[:5], row[5] or "", row[6] or "") for row in rows]
+        sims = similarity.similarities([f"{j.title}\n{j.description}" for j in jobs]) if similarity else [None] * len(jobs)
+        for job, sim, row in zip(jobs, sims, rows):
+            f = matcher.match(job, sim)
+            columns["title_hits"].append(f.title_hits)
+            columns["skill_hits"].append(f.skill_hits)
+            columns["seniority"].append(f.seniority)
+            columns["location"].append(f.location)
+            columns["company_pref"].append(f.company_pref)
+            columns["company_avoid"].append(f.company_avoid)
+            columns["freshness"].append(fresh_codes.get(f.freshness, 0))
+            columns["similarity"].append(f.similarity or 0.0)
+            columns["rejected"].append(bool(f.reject))
+            columns["emailable"].append(row[9] is None)
+            columns["applied"].append(row[8] == "APPLIED")
+            seen = row[7]
+            if seen is not None:
+                if seen.tzinfo is None:
+                    seen = seen.replace(tzinfo=pytz.UTC)
+                day = seen.astimezone(tz).date()
+                first_day = day if first_day is None or day < first_day else first_day
+                last_day = day if last_day is None or day > last_day else last_day
+    days = (last_day - first_day).days + 1 if first_day else 0
+    ints = ("title_hits", "skill_hits", "freshness")
+    return History(
+        **{
+            name: np.asarray(values, dtype=np.int32 if name in ints else np.float64 if name == "similarity" else bool)
+            for name, values in columns.items()
+        },
+        days=days,
+    )
+
+def _param(variants: Sequence[Variant], get) -> "np.ndarray":
+    return np.array([get(v.cfg) for v in variants], dtype=np.int32)[:, None]
+
+def scores(history: History, variants: Sequence[Variant]) -> "np.ndarray":
+    """Score of every job under every variant, shape (variants, jobs)."""
+    from job_agent.core.similarity import SATURATION
+
+    h = history
+    w = lambda name: _param(variants, lambda c: getattr(c.weights, name))
+    s = np.where(h.title_hits > 0, np.minimum(w("title_match"), 10 * h.title_hits + 10), 0)
+    s += np.where(h.skill_hits > 0, np.minimum(w("skill_match"), 6 * h.skill_hits + 15), 0)
+    s += w("seniority_match") * h.seniority
+    s += w("location_match") * h.location
+    s += w("company_pref") * h.company_pref
+    s = np.where(h.company_avoid, np.maximum(0, s - 20), s)
+    boosts = np.hstack([np.zeros((len(variants), 1), dtype=np.int32)] + [
+        _param(variants, lambda c, b=b: getattr(c.freshness_boost, b)) for b in FRESHNESS_BUCKETS
+    ])
+    s += boosts[:, h.freshness]
+    sim_weight = w("similarity")
+    if sim_weight.any():
+        # np.rint rounds half to even, like round() in ProfileSimilarity.points.
+        s += np.rint(sim_weight * np.minimum(1.0, h.similarity / SATURATION)).astype(np.int32)
+    s = np.clip(s, 0, 100)
+    return np.where(h.rejected, 0, s)
+
+@dataclass
+class VariantResult:
+    label: str
+    emails: int
+    per_day: float
+    applied_caught: int
+    p50: float
+    p90: float
+
+@dataclass
+class SimulationReport:
+    jobs: int
+    days: int
+    applied: int
+    results: List[VariantResult]
+
+    def lines(self) -> List[str]:
+        out = [f"{self.jobs} jobs over {self.days} days, {self.applied} marked APPLIED.", ""]
+        width = max([len(r.label) for r in self.results] + [7])
+        out.append(
+            f"{'variant':<{width}}  {'emails':>7}  {'per day':>7}  {'applied':>11}  {'hit rate':>8}  {'p50':>4}  {'p90':>4}"
+        )
+        for r in self.results:
+            caught = f"{r.applied_caught}/{self.applied}"
+            hit_rate = f"{100 * r.applied_caught / r.emails:.0f}%" if r.emails else "-"
+            out.append(
+                f"{r.label:<{width}}  {r.emails:>7}  {r.per_day:>7.1f}  {caught:>11}  {hit_rate:>8}  {r.p50:>4.0f}  {r.p90:>4.0f}"
+            )
+        out.append("")
+        out.append("applied: APPLIED jobs the variant would have emailed. hit rate: share of its emails you applied to.")
+        out.append("p50/p90: score percentiles of jobs that passed the hard filters.")
+        return out
+
+def simulate(history: History, variants: Sequence[Variant], block_cells: int = BLOCK_CELLS) -> SimulationReport:
+    h = history
+    passed = ~h.rejected
+    results = []
+    block = max(1, block_cells // max(1, len(h)))
+    for start in range(0, len(variants), block):
+        chunk = variants[start:start + block]
+        s = scores(h, chunk)
+        emailed = (s >= _param(chunk, lambda c: c.min_score_to_email)) & h.emailable & passed
+        counts = emailed.sum(axis=1)
+        caught = (emailed & h.applied).sum(axis=1)
+        if passed.any():
+            p50, p90 = np.percentile(s[:, passed], [50, 90], axis=1)
+        else:
+            p50 = p90 = np.zeros(len(chunk))
+        for i, v in enumerate(chunk):
+            results.append(VariantResult(
+                v.label, int(counts[i]), counts[i] / h.days if h.days else 0.0, int(caught[i]),
+                float(p50[i]), float(p90[i]),
+            ))
+    return SimulationReport(len(h), h.days, int(h.applied.sum()), results)
+
+def run(repo, profile: Profile, base: ScoringCfg, axes: Sequence[tuple], tz,
+        since=None, until=None, chunk_size: int = 5000) -> SimulationReport:
+    """Load stored jobs once and evaluate the current config plus every grid variant."""
+    check_dependencies()
+    variants = grid(base, axes)
+    similarity = None
+    if any(v.cfg.weights.similarity for v in variants):
+        from job_agent.core.similarity import ProfileSimilarity
+        similarity = ProfileSimilarity(profile)
+    history = load_history(repo, ScoringMatcher(profile, base), tz, similarity, chunk_size, since, until)
+    return simulate(history, variants)
@@ -1,15 +1,61 @@
 import hashlib
-from urllib.parse import urlparse, urlunparse
+import re
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
-def stable_job_key(url: str) -> str:
-    """
-    Generate a stable job key by normalizing the URL and hashing it.
-    This ensures idempotency across polling cycles.
-    """
+# Query parameters that only record how a job was reached (search page,
+# session, result position, campaign), not which job it is.
+TRACKING_PARAMS = frozenset({"src", "sid", "xp", "px", "ref", "refid", "trk", "nignbevent_src"})
+
+_NAUKRI_ID = re.compile(r"-(\d{6,})/?$")
+
+def naukri_job_id(url: str) -> Optional[str]:
+    """The numeric job id at the end of a Naukri job URL's path (``...-120624500123``)."""
+    u = urlparse(url)
+    match = _NAUKRI_ID.search(u.path)
+    if match:
+        return match.group(1)
+    for name, value in parse_qsl(u.query):
+        if name.lower() == "jobid" and value.isdigit():
+            return value
+    return None
+
+# Source name -> function returning the board's own job id for a URL, or None.
+_ID_EXTRACTORS: Dict[str, Callable[[str], Optional[str]]] = {
+    "naukri": naukri_job_id,
+}
+
+def register_id_extractor(source: str, extract: Callable[[str], Optional[str]]):
+    """Let a job board plugin identify its postings by the board's own job id."""
+    _ID_EXTRACTORS[source] = extract
+
+def canonical_url(url: str) -> str:
+    """The URL without fragment and tracking parameters, with the rest of the query sorted."""
     try:
         u = urlparse(url)
-        url = urlunparse((u.scheme, u.netloc, u.path, u.params, u.query, ""))
+        query = sorted(
+            (k, v) for k, v in parse_qsl(u.query, keep_blank_values=True)
+            if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+        )
+        return urlunparse((u.scheme.lower(), u.netloc.lower(), u.path, u.params, urlencode(query), ""))
     except Exception:
-        pass
+        return url
+
+def canonical_job_id(source: str, url: str) -> str:
+    """Identity of a posting within its source, the same however the URL was reached.
+
+    ``naukri:120624500123`` when the source's id extractor finds the
+    board's job id, otherwise the source and a hash of the canonical URL.
+    """
+    extract = _ID_EXTRACTORS.get(source)
+    native = extract(url) if extract else None
+    if native:
+        return f"{source}:{native}"
+    return f"{source}:{hashlib.sha256(canonical_url(url).encode('utf-8')).hexdigest()[:32]}"
 
-    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+def stable_job_key(canonical_id: str) -> str:
+    """
+    Generate a stable job key by hashing a posting's canonical id.
+    This ensures idempotency across polling cycles.
+    """
+    return hashlib.sha256(canonical_id.encode("utf-8")).hexdigest()[:32]
@@ -1,15 +1,31 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Literal, Optional
+
+class DbPoolCfg(BaseModel):
+    # Connections kept open, and extra ones allowed under load. Each polling or
+    # digest run holds one connection, so the defaults leave plenty of room.
+    size: int = Field(5, ge=1)
+    max_overflow: int = Field(5, ge=0)
+    recycle_seconds: int = 1800  # reopen connections older than this
+    timeout_seconds: int = 30  # wait for a free connection before failing
 
 class AppCfg(BaseModel):
     db_url: str
     user_timezone: str
     log_level: str
+    log_format: Literal["text", "json"] = "text"
+    # Logger name -> fraction of its INFO/DEBUG records to keep, e.g. {"job_agent.services": 0.1}
+    log_sampling: Dict[str, float] = Field(default_factory=dict)
+    db_pool: DbPoolCfg = DbPoolCfg()
 
 class PollingCfg(BaseModel):
     interval_seconds: int
     jitter_seconds: int
     max_jobs_per_run: int
+    # Budget for one scheduled cycle's network calls; defaults to 90% of the interval.
+    deadline_seconds: Optional[int] = None
+    # Mark a stored job closed once this many complete cycles in a row have not seen it (None: never).
+    close_after_cycles: Optional[int] = Field(6, ge=1)
 
 class RequestCfg(BaseModel):
     timeout_seconds: int
@@ -22,14 +38,37 @@ class ParsingCfg(BaseModel):
     location_selectors: List[str]
     posted_selectors: List[str]
     url_selectors: List[str]
+    # Parse pages in this many worker processes (0: in the fetching thread).
+    processes: int = Field(0, ge=0)
+    # Smaller pages are parsed inline; shipping them to a worker costs more than it saves.
+    process_min_bytes: int = 64 * 1024
+    # Parse pages as they download, yielding each card as it closes (ignores ``processes``).
+    streaming: bool = False
+    # With streaming, stop reading the page once this element (the results list) closes.
+    results_selector: Optional[str] = None
+
+class SourceCfg(BaseModel):
+    """Settings every job source accepts; plugins subclass it with their own."""
+    enabled: bool = True
+    search_urls: List[str] = Field(default_factory=list)
+    concurrency: int = Field(1, ge=1)  # pages fetched in parallel
+    min_interval_seconds: float = 1.0  # between requests to this board
+    time_budget_seconds: Optional[float] = None  # per cycle, on top of the cycle deadline
 
-class NaukriCfg(BaseModel):
+class NaukriCfg(SourceCfg):
     enabled: bool
     search_urls: List[str]
     request: RequestCfg
     parsing: ParsingCfg
 
 class SourcesCfg(BaseModel):
+    """Per-board settings keyed by registered source name (see adapters/registry.py).
+
+    Sections other than ``naukri`` are kept as raw dicts here and validated
+    by the plugin's own config model when the source is built.
+    """
+    model_config = ConfigDict(extra="allow")
+
     naukri: NaukriCfg
 
 class FreshnessBoostCfg(BaseModel):
@@ -43,6 +82,7 @@ class WeightsCfg(BaseModel):
     seniority_match: int
     location_match: int
     company_pref: int
+    similarity: int = 0  # résumé/description similarity; 0 disables it
 
 class HardFiltersCfg(BaseModel):
     reject_title_keywords: List[str]
@@ -58,11 +98,16 @@ class GmailCfg(BaseModel):
     enabled: bool
     username: str
     gmail_app_password: str
+    timeout_seconds: int = 30
+    smtp_host: str = "smtp.gmail.com"
+    smtp_port: int = 587
+    starttls: bool = True
 
 class DigestCfg(BaseModel):
     enabled: bool
     hour: int
     minute: int
+    deadline_seconds: int = 300
 
 class EmailCfg(BaseModel):
     enabled: bool
@@ -72,10 +117,25 @@ class EmailCfg(BaseModel):
     gmail_smtp: GmailCfg
     digest: DigestCfg
 
+class DedupCfg(BaseModel):
+    enabled: bool = True
+    # Max differing SimHash bits; must stay below the 4 LSH bands for lookups to be exact.
+    max_distance: int = Field(3, ge=0, le=3)
+
+class CoordinationCfg(BaseModel):
+    # Share search URLs across several agent processes on the same database.
+    enabled: bool = False
+    # Should comfortably exceed polling.interval_seconds: a worker that misses
+    # heartbeats for this long loses its search URLs to the others.
+    lease_seconds: int = 1200
+    worker_id: str = ""  # defaults to hostname:pid:random
+
 class RootCfg(BaseModel):
     app: AppCfg
     polling: PollingCfg
     sources: SourcesCfg
     scoring: ScoringCfg
     email: EmailCfg
+    dedup: DedupCfg = DedupCfg()
+    coordination: CoordinationCfg = CoordinationCfg()
     profile_path: str
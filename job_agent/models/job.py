@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class JobPosting:
     source: str
     title: str
@@ -10,9 +11,11 @@ class JobPosting:
     url: str
     posted_text: str = ""
     description: str = ""
+    search_url: str = ""  # results page the posting was found on
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ObservedJob:
     job: JobPosting
     job_key: str
     first_seen_at: datetime
+    canonical_id: Optional[str] = None  # derived from the source and URL when not given
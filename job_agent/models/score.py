@@ -1,8 +1,58 @@
+import struct
 from dataclasses import dataclass
-from typing import List
+from enum import IntFlag
+from typing import List, Tuple
 
-@dataclass(frozen=True)
+class Factor(IntFlag):
+    """Scoring factors, in the order they are evaluated."""
+    TITLE = 1
+    SKILL = 2
+    SENIORITY = 4
+    LOCATION = 8
+    COMPANY_PREF = 16
+    COMPANY_AVOID = 32
+    FRESHNESS = 64
+    REJECT_TITLE = 128
+    REJECT_DESC = 256
+    SIMILARITY = 512
+
+_REASON_TEMPLATES = {
+    Factor.TITLE: "Title match (+{})",
+    Factor.SKILL: "Skill/domain match (+{})",
+    Factor.SENIORITY: "Seniority signal (+{})",
+    Factor.LOCATION: "Location match (+{})",
+    Factor.COMPANY_PREF: "Preferred company (+{})",
+    Factor.COMPANY_AVOID: "Avoided company (-{})",
+    Factor.FRESHNESS: "Freshness (+{})",
+    Factor.REJECT_TITLE: "Rejected by title filter",
+    Factor.REJECT_DESC: "Rejected by description filter",
+    Factor.SIMILARITY: "Profile similarity (+{})",
+}
+
+def render_reasons(factors: int, points: Tuple[int, ...]) -> List[str]:
+    """Human-readable reasons for a factor bitmask and its per-factor points."""
+    reasons = []
+    i = 0
+    for factor in Factor:
+        if factors & factor:
+            reasons.append(_REASON_TEMPLATES[factor].format(points[i] if i < len(points) else 0))
+            i += 1
+    return reasons
+
+def pack_points(points: Tuple[int, ...]) -> bytes:
+    """Two bytes per factor; magnitudes only (the factor implies the sign)."""
+    return struct.pack(f"<{len(points)}H", *points)
+
+def unpack_points(data: bytes) -> Tuple[int, ...]:
+    return struct.unpack(f"<{len(data) // 2}H", data) if data else ()
+
+@dataclass(frozen=True, slots=True)
 class ScoreResult:
     score: int
-    reasons: List[str]
+    factors: int  # Factor bitmask
+    points: Tuple[int, ...]  # one entry per set factor, in Factor order
     action: str  # EMAIL / QUEUE / SKIP
+
+    @property
+    def reasons(self) -> List[str]:
+        return render_reasons(self.factors, self.points)
@@ -0,0 +1,154 @@
+"""Database-backed coordination between agent processes sharing one store.
+
+Workers register themselves and heartbeat on every cycle. Search URLs are
+split into partitions, each guarded by a time-limited lease row; a worker
+aims to hold ``ceil(partitions / live workers)`` of them, releasing extras
+when others join and taking over leases that expired when a worker died.
+Every ownership change is a conditional UPDATE whose row count tells the
+caller whether it won, so no two workers hold a lease at the same time.
+"""
+import hashlib
+import logging
+import math
+import os
+import socket
+import uuid
+from datetime import timedelta
+from typing import Dict, List
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from job_agent.store.models import LeaseRecord, WorkerRecord
+
+log = logging.getLogger("job_agent.coordination")
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+def partition_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+class Coordinator:
+    """Lease-based partitioning of search URLs across worker processes."""
+
+    def __init__(self, session_factory, clock, lease_seconds: int, worker_id: str = ""):
+        self._session_factory = session_factory
+        self.clock = clock
+        self.lease = timedelta(seconds=lease_seconds)
+        self.worker_id = worker_id or default_worker_id()
+
+    def register(self):
+        """Insert or refresh this worker's row."""
+        now = self.clock.now_utc()
+        with self._session_factory() as session:
+            record = session.get(WorkerRecord, self.worker_id)
+            if record is None:
+                session.add(self._record(now))
+            else:
+                record.heartbeat_at = now
+            session.commit()
+        log.info(f"Registered worker {self.worker_id}")
+
+    def _record(self, now) -> WorkerRecord:
+        return WorkerRecord(
+            worker_id=self.worker_id,
+            hostname=socket.gethostname(),
+            pid=os.getpid(),
+            started_at=now,
+            heartbeat_at=now,
+        )
+
+    def deregister(self):
+        """Release all leases and remove this worker so others rebalance immediately."""
+        with self._session_factory() as session:
+            session.execute(
+                update(LeaseRecord)
+                .where(LeaseRecord.worker_id == self.worker_id)
+                .values(worker_id=None, expires_at=None)
+            )
+            session.execute(delete(WorkerRecord).where(WorkerRecord.worker_id == self.worker_id))
+            session.commit()
+
+    def acquire(self, urls: List[str]) -> List[str]:
+        """Heartbeat, rebalance and return the search URLs this worker owns for the next cycle."""
+        by_partition: Dict[str, str] = {partition_key(u): u for u in urls}
+        now = self.clock.now_utc()
+        expires = now + self.lease
+
+        self._ensure_partitions(by_partition)
+
+        with self._session_factory() as session:
+            # A write first, so SQLite takes the write lock up front instead of
+            # failing a read-to-write upgrade under contention.
+            beat = session.execute(
+                update(WorkerRecord).where(WorkerRecord.worker_id == self.worker_id).values(heartbeat_at=now)
+            )
+            if beat.rowcount == 0:
+                session.add(self._record(now))
+                session.flush()
+            live = session.execute(
+                select(WorkerRecord.worker_id).where(WorkerRecord.heartbeat_at >= now - self.lease)
+            ).scalars().all()
+            target = math.ceil(len(by_partition) / max(1, len(live)))
+
+            # Renew what we hold.
+            session.execute(
+                update(LeaseRecord)
+                .where(LeaseRecord.worker_id == self.worker_id, LeaseRecord.partition.in_(by_partition))
+                .values(expires_at=expires)
+            )
+            owned = sorted(session.execute(
+                select(LeaseRecord.partition).where(
+                    LeaseRecord.worker_id == self.worker_id, LeaseRecord.partition.in_(by_partition)
+                )
+            ).scalars().all())
+
+            # Give back anything above our fair share so newcomers can pick it up.
+            if len(owned) > target:
+                extra = owned[target:]
+                owned = owned[:target]
+                session.execute(
+                    update(LeaseRecord)
+                    .where(LeaseRecord.partition.in_(extra), LeaseRecord.worker_id == self.worker_id)
+                    .values(worker_id=None, expires_at=None)
+                )
+
+            # Take free or expired partitions, one conditional UPDATE each.
+            if len(owned) < target:
+                free = session.execute(
+                    select(LeaseRecord.partition)
+                    .where(
+                        LeaseRecord.partition.in_(by_partition),
+                        or_(LeaseRecord.worker_id.is_(None), LeaseRecord.expires_at < now),
+                    )
+                    .order_by(LeaseRecord.partition)
+                ).scalars().all()
+                for partition in free:
+                    if len(owned) >= target:
+                        break
+                    result = session.execute(
+                        update(LeaseRecord)
+                        .where(
+                            LeaseRecord.partition == partition,
+                            or_(LeaseRecord.worker_id.is_(None), LeaseRecord.expires_at < now),
+                        )
+                        .values(worker_id=self.worker_id, expires_at=expires)
+                    )
+                    if result.rowcount == 1:
+                        owned.append(partition)
+            session.commit()
+
+        log.debug(f"Worker {self.worker_id} owns {len(owned)}/{len(by_partition)} partitions")
+        return [by_partition[p] for p in sorted(owned)]
+
+    def _ensure_partitions(self, by_partition: Dict[str, str]):
+        """Create lease rows for partitions seen for the first time."""
+        with self._session_factory() as session:
+            existing = set(session.execute(
+                select(LeaseRecord.partition).where(LeaseRecord.partition.in_(by_partition))
+            ).scalars())
+            for partition in by_partition.keys() - existing:
+                session.add(LeaseRecord(partition=partition))
+                try:
+                    session.commit()
+                except IntegrityError:
+                    session.rollback()  # another worker created it first
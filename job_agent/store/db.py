@@ -1,16 +1,212 @@
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, column, create_engine, delete, func, inspect, make_url, select, table, update
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.orm import sessionmaker, Session
-from job_agent.store.models import Base
+import pytz
+from job_agent.store.models import Base, SchemaMeta, JobRecord
+from job_agent.store.search import ensure_fts
 
-def create_engine_from_url(db_url: str):
-    """Create SQLAlchemy engine from database URL."""
-    return create_engine(db_url, echo=False)
+def add_missing_columns(table_name: str):
+    """Migration step that adds model columns and indexes missing from an existing table.
+    
+    New columns must be nullable or carry a ``server_default``: SQLite cannot
+    add a NOT NULL column without one.
+    """
+    def migrate(conn):
+        table = Base.metadata.tables[table_name]
+        existing = {c["name"] for c in inspect(conn).get_columns(table_name)}
+        for col in table.columns:
+            if col.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table_name} ADD COLUMN {col.name} {col.type.compile(dialect=conn.dialect)}"
+            if col.server_default is not None:
+                ddl += f" DEFAULT {col.server_default.arg.text}"
+            conn.exec_driver_sql(ddl)
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    return migrate
+
+def backfill_signatures(conn, chunk_size: int = 2000):
+    """Compute near-duplicate signatures for rows stored before they existed."""
+    from job_agent.core.dedup import simhash
+    from job_agent.store.repo import signature_columns
+    from job_agent.models.job import JobPosting
+
+    stmt = (
+        select(JobRecord.job_key, JobRecord.source, JobRecord.title, JobRecord.company,
+               JobRecord.location, JobRecord.url, JobRecord.description)
+        .where(JobRecord.simhash.is_(None))
+        .order_by(JobRecord.job_key)
+        .limit(chunk_size)
+    )
+    last_key = ""
+    while True:
+        rows = conn.execute(stmt.where(JobRecord.job_key > last_key)).all()
+        if not rows:
+            return
+        params = []
+        for row in rows:
+            sig = simhash(JobPosting(row.source, row.title, row.company, row.location, row.url, "", row.description or ""))
+            params.append({"k": row.job_key, **signature_columns(sig)})
+        conn.execute(
+            JobRecord.__table__.update()
+            .where(JobRecord.__table__.c.job_key == bindparam("k")),
+            params,
+        )
+        last_key = rows[-1].job_key
+
+def _migrate_v3(conn):
+    add_missing_columns("jobs")(conn)
+    backfill_signatures(conn)
+
+def _migrate_v7(conn):
+    # The backlog index gained closed_at in its prefix, so rebuild it.
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_jobs_backlog")
+    add_missing_columns("jobs")(conn)
+    conn.execute(
+        update(JobRecord)
+        .where(JobRecord.last_seen_at.is_(None))
+        .values(last_seen_at=JobRecord.first_seen_at)
+    )
+
+def merge_canonical_duplicates(conn, chunk_size: int = 2000):
+    """Give every row its canonical id, merging rows that turn out to be the same posting.
+    
+    Ids are computed in keyset chunks into a temporary table, so the
+    grouping runs in SQL. In each group the earliest row survives: it takes
+    the most recently reviewed status, the first email, the latest sighting
+    and the summed seen count, and reposts linked to a merged row are
+    relinked to it.
+    """
+    from job_agent.core.utils import canonical_job_id
+
+    conn.exec_driver_sql(
+        "CREATE TEMPORARY TABLE canonical_ids (job_key VARCHAR(32) PRIMARY KEY, canonical_id VARCHAR(100) NOT NULL)"
+    )
+    canon = table("canonical_ids", column("job_key"), column("canonical_id"))
+    stmt = (
+        select(JobRecord.job_key, JobRecord.source, JobRecord.url, JobRecord.canonical_id)
+        .order_by(JobRecord.job_key)
+        .limit(chunk_size)
+    )
+    last_key = ""
+    while True:
+        rows = conn.execute(stmt.where(JobRecord.job_key > last_key)).all()
+        if not rows:
+            break
+        conn.execute(canon.insert(), [
+            {"job_key": r.job_key, "canonical_id": r.canonical_id or canonical_job_id(r.source, r.url)} for r in rows
+        ])
+        last_key = rows[-1].job_key
+
+    groups = conn.execute(
+        select(canon.c.canonical_id).group_by(canon.c.canonical_id).having(func.count() > 1)
+    ).scalars().all()
+    for canonical_id in groups:
+        rows = conn.execute(
+            select(
+                JobRecord.job_key, JobRecord.first_seen_at, JobRecord.status, JobRecord.updated_at,
+                JobRecord.emailed_at, JobRecord.email_claimed_by, JobRecord.email_claimed_at,
+                JobRecord.last_seen_at, JobRecord.seen_count, JobRecord.closed_at, JobRecord.duplicate_of,
+            )
+            .where(JobRecord.job_key.in_(select(canon.c.job_key).where(canon.c.canonical_id == canonical_id)))
+            .order_by(JobRecord.first_seen_at, JobRecord.job_key)
+        ).all()
+        keep, gone = rows[0], [r.job_key for r in rows[1:]]
+        reviewed = [r for r in rows if r.status not in (None, "NEW")]
+        values = {
+            "status": max(reviewed, key=lambda r: r.updated_at).status if reviewed else keep.status,
+            "last_seen_at": max(r.last_seen_at or r.first_seen_at for r in rows),
+            "seen_count": sum(r.seen_count or 1 for r in rows),
+            "closed_at": None if any(r.closed_at is None for r in rows) else max(r.closed_at for r in rows),
+            "duplicate_of": None if keep.duplicate_of in gone else keep.duplicate_of,
+        }
+        emailed = [r for r in rows if r.emailed_at is not None]
+        if emailed:
+            first = min(emailed, key=lambda r: r.emailed_at)
+            values.update(emailed_at=first.emailed_at, email_claimed_by=first.email_claimed_by,
+                          email_claimed_at=first.email_claimed_at)
+        conn.execute(delete(JobRecord).where(JobRecord.job_key.in_(gone)))
+        conn.execute(update(JobRecord).where(JobRecord.job_key == keep.job_key).values(**values))
+        conn.execute(update(JobRecord).where(JobRecord.duplicate_of.in_(gone)).values(duplicate_of=keep.job_key))
+
+    conn.execute(
+        update(JobRecord)
+        .where(JobRecord.canonical_id.is_(None))
+        .values(canonical_id=select(canon.c.canonical_id).where(canon.c.job_key == JobRecord.job_key).scalar_subquery())
+    )
+    conn.exec_driver_sql("DROP TABLE canonical_ids")
+
+def _migrate_v8(conn):
+    add_missing_columns("jobs")(conn)
+    merge_canonical_duplicates(conn)
+
+def _migrate_v9(conn):
+    from job_agent.store import stats
+
+    add_missing_columns("jobs")(conn)
+    stats.rebuild(conn, conn.info.get("tz", pytz.UTC))
+
+# Bump together with an entry in MIGRATIONS whenever the schema changes.
+SCHEMA_VERSION = 10
+
+# (version, callable(connection)) pairs applied in order to databases older
+# than ``version``. ``create_all`` only creates missing tables, so anything that
+# alters an existing table belongs here.
+MIGRATIONS = [
+    (2, ensure_fts),
+    (3, _migrate_v3),
+    (4, add_missing_columns("jobs")),
+    (5, add_missing_columns("jobs")),
+    (6, add_missing_columns("jobs")),
+    (7, _migrate_v7),
+    (8, _migrate_v8),
+    (9, _migrate_v9),
+]
+
+def create_engine_from_url(db_url: str, **pool):
+    """Create SQLAlchemy engine from database URL.
+    
+    ``pool`` holds ``QueuePool`` sizing (``pool_size``, ``max_overflow``,
+    ``pool_recycle``, ``pool_timeout``); in-memory SQLite keeps its
+    per-thread pool and ignores it.
+    """
+    url = make_url(db_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        pool = {}
+    return create_engine(url, echo=False, **{k: v for k, v in pool.items() if v is not None})
 
 def create_session_factory(engine):
     """Create session factory from engine."""
     return sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
-def init_db(engine):
-    """Initialize database tables."""
-    Base.metadata.create_all(engine)
+def schema_version(engine) -> int:
+    """Return the stored schema version, or 0 for a fresh or pre-versioning database."""
+    try:
+        with engine.connect() as conn:
+            version = conn.execute(select(SchemaMeta.version)).scalar()
+    except (OperationalError, ProgrammingError):
+        return 0
+    return version or 0
+
+def init_db(engine, tz=None):
+    """Initialize database tables.
 
+    The DDL pass is skipped entirely when the stored schema version is
+    current, so short-lived commands only pay for a single ``SELECT``.
+    ``tz`` is the user's time zone, for migrations that compute daily
+    aggregates (UTC if not given).
+    """
+    current = schema_version(engine)
+    if current >= SCHEMA_VERSION:
+        return
+
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.info["tz"] = tz or pytz.UTC
+        for version, migrate in MIGRATIONS:
+            if version > current:
+                migrate(conn)
+        if conn.execute(select(SchemaMeta.version)).first() is None:
+            conn.execute(SchemaMeta.__table__.insert().values(version=SCHEMA_VERSION))
+        else:
+            conn.execute(update(SchemaMeta).values(version=SCHEMA_VERSION))
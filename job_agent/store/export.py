@@ -0,0 +1,165 @@
+"""Streaming export of stored jobs to CSV, JSON Lines or Parquet.
+
+Rows come from ``JobRepository.iter_export`` one chunk at a time and each
+chunk is written before the next one is fetched, so memory use does not
+grow with the size of the database. Parquet output needs the optional
+``pyarrow`` package (one row group per chunk); zstd compression of CSV and
+JSONL needs the optional ``zstandard`` package.
+"""
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+FORMATS = ("csv", "jsonl", "parquet")
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+# Column name -> Parquet type name. ``reasons`` is rendered from the score columns.
+EXPORT_COLUMNS = {
+    "job_key": "string",
+    "source": "string",
+    "title": "string",
+    "company": "string",
+    "location": "string",
+    "url": "string",
+    "posted_text": "string",
+    "description": "string",
+    "first_seen_at": "timestamp",
+    "score": "int",
+    "score_factors": "int",
+    "reasons": "list",
+    "action": "string",
+    "status": "string",
+    "emailed_at": "timestamp",
+    "duplicate_of": "string",
+    "last_seen_at": "timestamp",
+    "seen_count": "int",
+    "closed_at": "timestamp",
+    "created_at": "timestamp",
+    "updated_at": "timestamp",
+}
+
+DEFAULT_COLUMNS = [c for c in EXPORT_COLUMNS if c not in ("description", "score_factors", "created_at", "updated_at")]
+
+_SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+_COMPRESSED = {".gz": "gzip", ".zst": "zstd"}
+
+def infer_format(path: str):
+    """Guess ``(format, compression)`` from a file name such as ``jobs.jsonl.gz``."""
+    suffixes = Path(path).suffixes
+    compression = _COMPRESSED.get(suffixes[-1]) if suffixes else None
+    if compression:
+        suffixes = suffixes[:-1]
+    fmt = _SUFFIXES.get(suffixes[-1]) if suffixes else None
+    return fmt, compression or "none"
+
+def parse_columns(value: Optional[str]) -> List[str]:
+    if not value:
+        return list(DEFAULT_COLUMNS)
+    columns = [c.strip() for c in value.split(",") if c.strip()]
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(unknown)}. Available: {', '.join(EXPORT_COLUMNS)}")
+    return columns
+
+def _open_text(path: str, compression: str):
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if compression == "zstd":
+        import zstandard
+        raw = open(path, "wb")
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw), encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+class CsvWriter:
+    def __init__(self, path: str, columns: Sequence[str], compression: str):
+        self._fh = _open_text(path, compression)
+        self._csv = csv.writer(self._fh)
+        self._csv.writerow(columns)
+        self._reasons = columns.index("reasons") if "reasons" in columns else None
+
+    def write(self, rows: List[tuple]):
+        for row in rows:
+            row = [_iso(v) for v in row]
+            if self._reasons is not None:
+                row[self._reasons] = "; ".join(row[self._reasons])
+            self._csv.writerow(row)
+
+    def close(self):
+        self._fh.close()
+
+class JsonlWriter:
+    def __init__(self, path: str, columns: Sequence[str], compression: str):
+        self._fh = _open_text(path, compression)
+        self._columns = columns
+
+    def write(self, rows: List[tuple]):
+        self._fh.writelines(
+            json.dumps(dict(zip(self._columns, map(_iso, row))), ensure_ascii=False) + "\n" for row in rows
+        )
+
+    def close(self):
+        self._fh.close()
+
+class ParquetWriter:
+    def __init__(self, path: str, columns: Sequence[str], compression: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {
+            "string": pa.string(),
+            "int": pa.int64(),
+            "timestamp": pa.timestamp("us", tz="UTC"),
+            "list": pa.list_(pa.string()),
+        }
+        self._pa = pa
+        self._schema = pa.schema([(c, types[EXPORT_COLUMNS[c]]) for c in columns])
+        self._writer = pq.ParquetWriter(path, self._schema, compression=compression)
+
+    def write(self, rows: List[tuple]):
+        arrays = [
+            self._pa.array([row[i] for row in rows], type=field.type)
+            for i, field in enumerate(self._schema)
+        ]
+        self._writer.write_batch(self._pa.record_batch(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+_WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+def check_dependencies(fmt: str, compression: str):
+    """Fail before touching the output file if an optional package is missing."""
+    if fmt == "parquet":
+        module, feature = "pyarrow", "Parquet export"
+    elif compression == "zstd":
+        module, feature = "zstandard", "zstd compression"
+    else:
+        return
+    try:
+        __import__(module)
+    except ImportError:
+        raise RuntimeError(f"{feature} requires the optional {module} package (pip install {module})") from None
+
+def write_export(chunks: Iterable[List[tuple]], path: str, fmt: str, columns: Sequence[str], compression: str = "none") -> int:
+    """Write row chunks to ``path``; returns the number of rows written."""
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    check_dependencies(fmt, compression)
+    writer = _WRITERS[fmt](path, list(columns), compression)
+    count = 0
+    try:
+        for rows in chunks:
+            writer.write(rows)
+            count += len(rows)
+    finally:
+        writer.close()
+    return count
@@ -1,24 +1,37 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, func
+from sqlalchemy import Column, String, Integer, BigInteger, Date, DateTime, Text, LargeBinary, Index, func, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from job_agent.models.score import render_reasons, unpack_points
+import json
 
 Base = declarative_base()
 
+def stored_reasons(factors, points, legacy) -> list:
+    """Render score reasons from the compact columns, falling back to the legacy JSON list."""
+    if factors is not None:
+        return render_reasons(factors, unpack_points(points))
+    return json.loads(legacy) if legacy else []
+
 class JobRecord(Base):
     __tablename__ = "jobs"
     
     job_key = Column(String(32), primary_key=True)
+    # Per-source identity (e.g. "naukri:120624500123"); URLs that differ only in tracking parameters share it
+    canonical_id = Column(String(100), nullable=True, unique=True, index=True)
     source = Column(String(50), nullable=False)
     title = Column(String(500), nullable=False)
     company = Column(String(200), nullable=False)
     location = Column(String(200), nullable=False)
     url = Column(Text, nullable=False)
+    search_url = Column(Text, nullable=True)  # results page the job was found on
     posted_text = Column(String(100), default="")
     description = Column(Text, default="")
     
     first_seen_at = Column(DateTime(timezone=True), nullable=False)
     score = Column(Integer, nullable=False)
-    score_reasons = Column(Text, default="")
+    score_reasons = Column(Text, nullable=True)  # legacy JSON list; rows since v4 use the two columns below
+    score_factors = Column(Integer, nullable=True)  # Factor bitmask
+    score_points = Column(LargeBinary, nullable=True)  # packed per-factor points
     action = Column(String(20), nullable=False)  # EMAIL, QUEUE, SKIP
     
     emailed_at = Column(DateTime(timezone=True), nullable=True)
@@ -26,4 +39,93 @@ class JobRecord(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Near-duplicate detection: 64-bit SimHash (signed) and its 16-bit LSH bands
+    simhash = Column(BigInteger, nullable=True)
+    simhash_b0 = Column(Integer, nullable=True, index=True)
+    simhash_b1 = Column(Integer, nullable=True, index=True)
+    simhash_b2 = Column(Integer, nullable=True, index=True)
+    simhash_b3 = Column(Integer, nullable=True, index=True)
+    duplicate_of = Column(String(32), nullable=True)  # job_key of the original posting
+    
+    # Set atomically by the worker that sends the alert (exactly-once email)
+    email_claimed_by = Column(String(100), nullable=True)
+    email_claimed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Lifecycle: refreshed in bulk whenever a polling cycle sees the posting again;
+    # closed_at is set once it has gone unseen for several cycles.
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
+    seen_count = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    closed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        # Backlog view: equality on action/status/open, ordered by score then
+        # freshness, with the keyset and filter columns carried along so the
+        # scan never has to visit the table for rows it skips.
+        Index(
+            "ix_jobs_backlog",
+            "action", "status", "closed_at", "score", "first_seen_at", "job_key",
+            "company", "location", "duplicate_of",
+        ),
+        # Digest: open jobs emailed since a cutoff, newest first.
+        Index("ix_jobs_digest", "closed_at", "emailed_at"),
+        # Closed-posting sweep: open jobs last seen before a cutoff.
+        Index("ix_jobs_last_seen", "closed_at", "last_seen_at"),
+    )
+    
+    @property
+    def reasons(self) -> list:
+        """Human-readable score reasons, rendered on access."""
+        return stored_reasons(self.score_factors, self.score_points, self.score_reasons)
+
+
+class JobStatRecord(Base):
+    """Daily counts of stored jobs per dimension value (see store/stats.py)."""
+    __tablename__ = "job_stats"
+    
+    day = Column(Date, primary_key=True)  # first seen, in the user's time zone
+    dimension = Column(String(20), primary_key=True)  # all, company, location, score_band, search_url
+    value = Column(String(500), primary_key=True)
+    new_jobs = Column(Integer, nullable=False, default=0)
+    emailed = Column(Integer, nullable=False, default=0)
+    applied = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        # Reports read one dimension over a range of days.
+        Index("ix_job_stats_dimension_day", "dimension", "day"),
+    )
+
 
+class WorkerRecord(Base):
+    __tablename__ = "workers"
+    
+    worker_id = Column(String(100), primary_key=True)
+    hostname = Column(String(200), nullable=False)
+    pid = Column(Integer, nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class LeaseRecord(Base):
+    __tablename__ = "leases"
+    
+    partition = Column(String(64), primary_key=True)  # hash of a search URL
+    worker_id = Column(String(100), nullable=True, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class DigestClaimRecord(Base):
+    """The worker that sent (or is sending) a day's digest; one row per day."""
+    __tablename__ = "digest_claims"
+    
+    day = Column(Date, primary_key=True)  # in the user's time zone
+    worker_id = Column(String(100), nullable=False)
+    claimed_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class SchemaMeta(Base):
+    __tablename__ = "schema_meta"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
@@ -1,47 +1,231 @@
-from typing import Optional, List
+from collections import Counter, defaultdict
+from typing import Dict, Optional, List, Iterator, Sequence
+from sqlalchemy import delete, literal, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from job_agent.store.models import JobRecord
+from job_agent.store.models import DigestClaimRecord, JobRecord, stored_reasons
+from job_agent.store import search as fts
+from job_agent.store import stats
+from job_agent.core import dedup
+from job_agent.core.utils import canonical_job_id
 from job_agent.models.job import ObservedJob
-from job_agent.models.score import ScoreResult
-from datetime import datetime, timedelta
+from job_agent.models.score import ScoreResult, pack_points
+from datetime import date, datetime, timedelta
 import pytz
-import json
+
+def signature_columns(signature: int) -> dict:
+    """Column values for an unsigned SimHash signature and its LSH bands."""
+    b0, b1, b2, b3 = dedup.bands(signature)
+    return {
+        "simhash": dedup.to_signed(signature),
+        "simhash_b0": b0,
+        "simhash_b1": b1,
+        "simhash_b2": b2,
+        "simhash_b3": b3,
+    }
 
 class JobRepository:
-    """Repository for job records."""
+    """Repository for job records.
+    
+    Owns one session: use it as a context manager around a unit of work (a
+    polling cycle, a command) so the session and its connection are released
+    when the work ends, and uncommitted changes are rolled back on error.
     
-    def __init__(self, session: Session):
+    Writes that change what a job counts towards also update its daily
+    aggregates (store/stats.py) in the same transaction; ``tz`` is the
+    user's time zone, which decides a job's day.
+    """
+    
+    def __init__(self, session: Session, tz=pytz.UTC):
         self.session = session
+        self.tz = tz
+    
+    def __enter__(self) -> "JobRepository":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.session.rollback()
+        self.close()
+    
+    def close(self):
+        self.session.close()
     
     def exists(self, job_key: str) -> bool:
         """Check if a job with the given key exists."""
         return self.session.query(JobRecord).filter_by(job_key=job_key).first() is not None
     
-    def insert(self, observed: ObservedJob, score_result: ScoreResult):
-        """Insert a new job record."""
-        now = datetime.now(pytz.UTC)
+    def find_key(self, canonical_id: str) -> Optional[str]:
+        """Key of the stored job with this canonical id, if any."""
+        return self.session.execute(
+            select(JobRecord.job_key).where(JobRecord.canonical_id == canonical_id)
+        ).scalar()
+    
+    def insert(
+        self,
+        observed: ObservedJob,
+        score_result: ScoreResult,
+        signature: Optional[int] = None,
+        duplicate_of: Optional[str] = None,
+    ) -> bool:
+        """Insert a new job record, optionally with its SimHash and the original it reposts.
+        
+        Returns False if another process inserted the same job first.
+        """
+        job = observed.job
         record = JobRecord(
             job_key=observed.job_key,
+            canonical_id=observed.canonical_id or canonical_job_id(job.source, job.url),
             source=observed.job.source,
             title=observed.job.title,
             company=observed.job.company,
             location=observed.job.location,
             url=observed.job.url,
+            search_url=observed.job.search_url or None,
             posted_text=observed.job.posted_text,
             description=observed.job.description,
             first_seen_at=observed.first_seen_at,
+            last_seen_at=observed.first_seen_at,
+            seen_count=1,
             score=score_result.score,
-            score_reasons=json.dumps(score_result.reasons),
+            score_factors=score_result.factors,
+            score_points=pack_points(score_result.points),
             action=score_result.action,
             status="NEW",
+            duplicate_of=duplicate_of,
+            **(signature_columns(signature) if signature is not None else {}),
         )
         self.session.add(record)
+        try:
+            self.session.flush()
+        except IntegrityError:
+            self.session.rollback()
+            return False
+        if duplicate_of is None:
+            stats.bump(self.session, self._stat_keys(record), new_jobs=1)
+        self.session.commit()
+        return True
+    
+    def _stat_keys(self, record: JobRecord) -> list:
+        return stats.stat_keys(
+            stats.local_day(record.first_seen_at, self.tz),
+            record.company, record.location, record.score, record.search_url,
+        )
+    
+    def claim_email(self, job_key: str, worker_id: str) -> bool:
+        """Atomically claim the right to send a job's alert; True for exactly one caller."""
+        result = self.session.execute(
+            update(JobRecord)
+            .where(JobRecord.job_key == job_key, JobRecord.email_claimed_by.is_(None))
+            .values(email_claimed_by=worker_id, email_claimed_at=datetime.now(pytz.UTC))
+        )
+        self.session.commit()
+        return result.rowcount == 1
+    
+    def release_email_claim(self, job_key: str, worker_id: str):
+        """Give back a claim after a failed send so the alert can be retried."""
+        self.session.execute(
+            update(JobRecord)
+            .where(JobRecord.job_key == job_key, JobRecord.email_claimed_by == worker_id)
+            .values(email_claimed_by=None, email_claimed_at=None)
+        )
+        self.session.commit()
+    
+    def claim_digest(self, day: date, worker_id: str) -> bool:
+        """Atomically claim the right to send ``day``'s digest; True for exactly one caller."""
+        self.session.add(DigestClaimRecord(day=day, worker_id=worker_id, claimed_at=datetime.now(pytz.UTC)))
+        try:
+            self.session.commit()
+        except IntegrityError:
+            self.session.rollback()  # another worker claimed the day first
+            return False
+        return True
+    
+    def release_digest_claim(self, day: date, worker_id: str):
+        """Give back a digest claim after a failed send so it can be retried."""
+        self.session.execute(
+            delete(DigestClaimRecord)
+            .where(DigestClaimRecord.day == day, DigestClaimRecord.worker_id == worker_id)
+        )
+        self.session.commit()
+    
+    def mark_seen(self, job_keys: Sequence[str], seen_at: datetime, chunk_size: int = 500) -> int:
+        """Record that stored jobs were observed again, reopening any that were closed.
+        
+        One UPDATE per ``chunk_size`` keys (a polling cycle's worth is
+        usually a single statement) instead of one per row.
+        """
+        updated = 0
+        keys = list(job_keys)
+        for start in range(0, len(keys), chunk_size):
+            result = self.session.execute(
+                update(JobRecord)
+                .where(JobRecord.job_key.in_(keys[start:start + chunk_size]))
+                .values(last_seen_at=seen_at, seen_count=JobRecord.seen_count + 1, closed_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
+        self.session.commit()
+        return updated
+    
+    def close_unseen(
+        self,
+        before: datetime,
+        sources: Sequence[str],
+        closed_at: datetime,
+        search_urls: Optional[Sequence[str]] = None,
+    ) -> int:
+        """Mark open jobs from ``sources`` that were last seen before ``before`` as closed.
+        
+        With ``search_urls``, only jobs found on those results pages are closed.
+        """
+        stmt = (
+            update(JobRecord)
+            .where(
+                JobRecord.closed_at.is_(None),
+                JobRecord.last_seen_at < before,
+                JobRecord.source.in_(list(sources)),
+            )
+            .values(closed_at=closed_at)
+            .execution_options(synchronize_session=False)
+        )
+        if search_urls is not None:
+            stmt = stmt.where(JobRecord.search_url.in_(list(search_urls)))
+        result = self.session.execute(stmt)
         self.session.commit()
+        return result.rowcount
+    
+    def find_near_duplicate(self, signature: int, title: str, max_distance: int) -> Optional[str]:
+        """Return the key of the earliest stored original this posting nearly duplicates.
+        
+        Candidates come from the four LSH band indexes (rows sharing at least
+        one 16-bit band), so the lookup never scans the table.
+        """
+        b0, b1, b2, b3 = dedup.bands(signature)
+        candidates = self.session.execute(
+            select(JobRecord.job_key, JobRecord.simhash, JobRecord.title)
+            .where(
+                or_(
+                    JobRecord.simhash_b0 == b0,
+                    JobRecord.simhash_b1 == b1,
+                    JobRecord.simhash_b2 == b2,
+                    JobRecord.simhash_b3 == b3,
+                ),
+                JobRecord.duplicate_of.is_(None),
+            )
+            .order_by(JobRecord.first_seen_at)
+        ).all()
+        for job_key, stored, stored_title in candidates:
+            if dedup.is_near_duplicate(signature, title, dedup.to_unsigned(stored), stored_title, max_distance):
+                return job_key
+        return None
     
     def mark_emailed(self, job_key: str):
         """Mark a job as emailed."""
         record = self.session.query(JobRecord).filter_by(job_key=job_key).first()
         if record:
+            if record.emailed_at is None and record.duplicate_of is None:
+                stats.bump(self.session, self._stat_keys(record), emailed=1)
             record.emailed_at = datetime.now(pytz.UTC)
             self.session.commit()
     
@@ -49,15 +233,225 @@ class JobRepository:
         """Mark a job with a status (APPLIED, SKIPPED, MANUAL)."""
         record = self.session.query(JobRecord).filter_by(job_key=job_key).first()
         if record:
+            if record.duplicate_of is None:
+                stats.bump(self.session, self._stat_keys(record), **stats.status_deltas(record.status, status))
             record.status = status
             self.session.commit()
     
+    def bulk_mark_status(self, statuses: Dict[str, str], chunk_size: int = 500) -> List[str]:
+        """Set the status of many jobs (job_key -> status) in one transaction.
+        
+        Jobs are read in chunks of ``chunk_size`` keys, written back with a
+        single executemany UPDATE, and their aggregates adjusted in the same
+        commit. Returns the keys that are not stored, in input order.
+        """
+        keys = list(statuses)
+        found = {}
+        for start in range(0, len(keys), chunk_size):
+            rows = self.session.execute(
+                select(
+                    JobRecord.job_key, JobRecord.status, JobRecord.duplicate_of, JobRecord.first_seen_at,
+                    JobRecord.company, JobRecord.location, JobRecord.score, JobRecord.search_url,
+                ).where(JobRecord.job_key.in_(keys[start:start + chunk_size]))
+            ).all()
+            found.update((row.job_key, row) for row in rows)
+        
+        changes = [key for key, row in found.items() if row.status != statuses[key]]
+        deltas: Dict[tuple, Counter] = defaultdict(Counter)
+        for key in changes:
+            row = found[key]
+            if row.duplicate_of is not None:
+                continue
+            for stat_key in stats.stat_keys(stats.local_day(row.first_seen_at, self.tz),
+                                            row.company, row.location, row.score, row.search_url):
+                deltas[stat_key].update(stats.status_deltas(row.status, statuses[key]))
+        if changes:
+            self.session.execute(update(JobRecord), [{"job_key": key, "status": statuses[key]} for key in changes])
+            stats.bump_many(self.session, deltas)
+            self.session.commit()
+        return [key for key in keys if key not in found]
+    
+    def iter_score_inputs(self, chunk_size: int = 1000) -> Iterator[Sequence]:
+        """Yield stored jobs in primary-key order as chunks of rows.
+        
+        Uses keyset pagination so each chunk is a cheap index range scan and
+        only one chunk is held in memory at a time.
+        """
+        stmt = select(
+            JobRecord.job_key,
+            JobRecord.source,
+            JobRecord.title,
+            JobRecord.company,
+            JobRecord.location,
+            JobRecord.url,
+            JobRecord.posted_text,
+            JobRecord.description,
+            JobRecord.score,
+            JobRecord.action,
+        ).order_by(JobRecord.job_key).limit(chunk_size)
+        last_key = None
+        while True:
+            page = stmt if last_key is None else stmt.where(JobRecord.job_key > last_key)
+            rows = self.session.execute(page).all()
+            if not rows:
+                return
+            yield rows
+            last_key = rows[-1].job_key
+    
+    def bulk_update_scores(self, changes: List[dict]):
+        """Write back score, factors and action for many jobs in one executemany UPDATE.
+        
+        Each dict needs ``job_key``, ``score``, ``factors``, ``points`` and ``action``.
+        """
+        if not changes:
+            return
+        self.session.execute(
+            update(JobRecord),
+            [
+                {
+                    "job_key": c["job_key"],
+                    "score": c["score"],
+                    "score_reasons": None,
+                    "score_factors": c["factors"],
+                    "score_points": pack_points(c["points"]),
+                    "action": c["action"],
+                }
+                for c in changes
+            ],
+        )
+        self.session.commit()
+    
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        status: Optional[str] = None,
+        min_score: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List:
+        """Full-text search over title, company, location and description, best match first."""
+        if not fts.is_supported(self.session.get_bind()):
+            raise RuntimeError("Full-text search requires an SQLite database with FTS5")
+        fts.backfill_fts(self.session)
+        return fts.search_jobs(self.session, query, limit, status, min_score, since, until)
+    
+    def reindex_search(self):
+        """Rebuild the full-text index from scratch (e.g. after a VACUUM renumbered rowids)."""
+        fts.reset_fts(self.session)
+        fts.backfill_fts(self.session)
+    
+    def top_backlog(
+        self,
+        limit: int = 20,
+        after: Optional[tuple] = None,
+        status: str = "NEW",
+        action: str = "QUEUE",
+        location: Optional[str] = None,
+        company: Optional[str] = None,
+        include_closed: bool = False,
+    ) -> List:
+        """Best unreviewed jobs by score, then freshness, one keyset page at a time.
+        
+        ``after`` is the ``(score, first_seen_at, job_key)`` of the last row of
+        the previous page; the next page starts strictly below it, so deep
+        pages cost the same as the first one (no OFFSET scan). Closed postings
+        are left out unless ``include_closed``.
+        """
+        order = (JobRecord.score, JobRecord.first_seen_at, JobRecord.job_key)
+        stmt = (
+            select(
+                JobRecord.job_key,
+                JobRecord.title,
+                JobRecord.company,
+                JobRecord.location,
+                JobRecord.score,
+                JobRecord.first_seen_at,
+                JobRecord.url,
+            )
+            .where(
+                JobRecord.action == action,
+                JobRecord.status == status,
+                JobRecord.duplicate_of.is_(None),
+            )
+            .order_by(*(c.desc() for c in order))
+            .limit(limit)
+        )
+        if not include_closed:
+            stmt = stmt.where(JobRecord.closed_at.is_(None))
+        if after is not None:
+            stmt = stmt.where(tuple_(*order) < tuple_(*(literal(v, c.type) for v, c in zip(after, order))))
+        if location:
+            stmt = stmt.where(JobRecord.location.ilike(f"%{location}%"))
+        if company:
+            stmt = stmt.where(JobRecord.company.ilike(f"%{company}%"))
+        return self.session.execute(stmt).all()
+    
+    def iter_export(
+        self,
+        columns: Sequence[str],
+        status: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        """Yield stored jobs as chunks of value tuples, in ``columns`` order.
+        
+        Rows are streamed from a single cursor (``yield_per``) rather than
+        loaded as ORM objects, so only one chunk is in memory at a time.
+        ``reasons`` is rendered from the score columns.
+        """
+        fields = []
+        for name in columns:
+            fields.extend(("score_factors", "score_points", "score_reasons") if name == "reasons" else (name,))
+        fields = list(dict.fromkeys(fields))
+        stmt = select(*(getattr(JobRecord, f) for f in fields))
+        if status:
+            stmt = stmt.where(JobRecord.status == status)
+        if since:
+            stmt = stmt.where(JobRecord.first_seen_at >= since)
+        if until:
+            stmt = stmt.where(JobRecord.first_seen_at < until)
+        
+        def values(row):
+            m = row._mapping
+            return tuple(
+                stored_reasons(m["score_factors"], m["score_points"], m["score_reasons"]) if name == "reasons" else m[name]
+                for name in columns
+            )
+        
+        result = self.session.execute(stmt, execution_options={"yield_per": chunk_size})
+        try:
+            for partition in result.partitions():
+                yield [values(row) for row in partition]
+        finally:
+            result.close()
+    
+    def stat_totals(self, dimension: str, since: date, until: date, limit: Optional[int] = None) -> List[stats.StatRow]:
+        """Aggregated counts per company, location, score band or search URL over a range of days."""
+        return stats.totals(self.session, dimension, since, until, limit)
+    
+    def daily_stats(self, since: date, until: date) -> list:
+        """``(day, StatRow)`` for each day with jobs from ``since`` to ``until``."""
+        return stats.per_day(self.session, since, until)
+    
+    def day_stats(self, day: date) -> stats.DayStats:
+        """One day's counts and its busiest companies, for the digest header."""
+        return stats.day_stats(self.session, day)
+    
+    def rebuild_stats(self, dimensions=stats.DIMENSIONS) -> int:
+        """Recompute the aggregates from scratch; returns the number of rows written."""
+        rows = stats.rebuild(self.session, self.tz, dimensions)
+        self.session.commit()
+        return rows
+    
     def list_digest(self) -> List[JobRecord]:
-        """List jobs for digest email (recent jobs that were emailed)."""
+        """List jobs for digest email (recent jobs that were emailed and are still open)."""
         # Return jobs that were emailed in the last 24 hours
         cutoff = datetime.now(pytz.UTC) - timedelta(days=1)
         
         return self.session.query(JobRecord).filter(
+            JobRecord.closed_at.is_(None),
             JobRecord.emailed_at.isnot(None),
             JobRecord.emailed_at >= cutoff
         ).order_by(JobRecord.emailed_at.desc()).all()
@@ -0,0 +1,161 @@
+"""SQLite FTS5 index over stored jobs.
+
+``jobs_fts`` holds title, company, location and description keyed by the
+``jobs`` rowid, with ``job_key`` carried as an unindexed column for joins.
+Triggers keep it in sync with inserts, updates and deletes. Rows that
+existed before the index was created are indexed in batches by
+``backfill_fts``; ``jobs_fts_state`` records how far that has got, and
+the triggers only touch rows the index already covers.
+"""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import column, literal_column, select, table, text
+from sqlalchemy.orm import Session
+from job_agent.store.models import JobRecord
+
+FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        job_key UNINDEXED, title, company, location, description,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS jobs_fts_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        last_rowid INTEGER NOT NULL,
+        upto_rowid INTEGER NOT NULL
+    )
+    """,
+    """
+    INSERT OR IGNORE INTO jobs_fts_state (id, last_rowid, upto_rowid)
+    SELECT 1, 0, COALESCE(MAX(rowid), 0) FROM jobs
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts (rowid, job_key, title, company, location, description)
+        VALUES (new.rowid, new.job_key, new.title, new.company, new.location, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs
+    WHEN old.rowid <= (SELECT last_rowid FROM jobs_fts_state)
+      OR old.rowid > (SELECT upto_rowid FROM jobs_fts_state)
+    BEGIN
+        DELETE FROM jobs_fts WHERE rowid = old.rowid;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, company, location, description ON jobs
+    WHEN old.rowid <= (SELECT last_rowid FROM jobs_fts_state)
+      OR old.rowid > (SELECT upto_rowid FROM jobs_fts_state)
+    BEGIN
+        DELETE FROM jobs_fts WHERE rowid = old.rowid;
+        INSERT INTO jobs_fts (rowid, job_key, title, company, location, description)
+        VALUES (new.rowid, new.job_key, new.title, new.company, new.location, new.description);
+    END
+    """,
+]
+
+_fts = table("jobs_fts", column("job_key"))
+
+def is_supported(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+def ensure_fts(conn):
+    """Create the FTS table, its bookkeeping row and sync triggers (SQLite only)."""
+    if not is_supported(conn):
+        return
+    for ddl in FTS_DDL:
+        conn.exec_driver_sql(ddl)
+
+def reset_fts(session: Session):
+    """Empty the index and schedule every existing row for backfill."""
+    session.execute(text("DELETE FROM jobs_fts"))
+    session.execute(text(
+        "UPDATE jobs_fts_state SET last_rowid = 0, upto_rowid = (SELECT COALESCE(MAX(rowid), 0) FROM jobs)"
+    ))
+    session.commit()
+
+def backfill_fts(session: Session, batch_size: int = 5000, max_batches: Optional[int] = None) -> int:
+    """Index pre-existing rows in rowid batches, committing after each; returns rows indexed."""
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        last, upto = session.execute(text("SELECT last_rowid, upto_rowid FROM jobs_fts_state")).one()
+        if last >= upto:
+            break
+        new_last = session.execute(
+            text(
+                "SELECT MAX(rowid) FROM (SELECT rowid FROM jobs WHERE rowid > :last AND rowid <= :upto "
+                "ORDER BY rowid LIMIT :n)"
+            ),
+            {"last": last, "upto": upto, "n": batch_size},
+        ).scalar()
+        if new_last is None:
+            new_last = upto
+        result = session.execute(
+            text(
+                "INSERT INTO jobs_fts (rowid, job_key, title, company, location, description) "
+                "SELECT rowid, job_key, title, company, location, description FROM jobs "
+                "WHERE rowid > :last AND rowid <= :new_last"
+            ),
+            {"last": last, "new_last": new_last},
+        )
+        session.execute(text("UPDATE jobs_fts_state SET last_rowid = :v"), {"v": new_last})
+        session.commit()
+        total += result.rowcount or 0
+        batches += 1
+    return total
+
+def match_expression(query: str) -> str:
+    """Turn free text into an FTS5 query: every term required, ``term*`` kept as a prefix search."""
+    terms = []
+    for token in query.split():
+        prefix = token.endswith("*")
+        token = token.rstrip("*").replace('"', '""')
+        if token:
+            terms.append(f'"{token}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+def search_jobs(
+    session: Session,
+    query: str,
+    limit: int = 20,
+    status: Optional[str] = None,
+    min_score: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> List:
+    """BM25-ranked matches (best first); title hits weigh more than company/location/description."""
+    expr = match_expression(query)
+    if not expr:
+        return []
+    rank = literal_column("bm25(jobs_fts, 0.0, 4.0, 2.0, 1.0, 1.0)")
+    stmt = (
+        select(
+            JobRecord.job_key,
+            JobRecord.title,
+            JobRecord.company,
+            JobRecord.location,
+            JobRecord.score,
+            JobRecord.action,
+            JobRecord.status,
+            JobRecord.first_seen_at,
+            JobRecord.url,
+            rank.label("rank"),
+        )
+        .select_from(_fts.join(JobRecord, JobRecord.job_key == _fts.c.job_key))
+        .where(text("jobs_fts MATCH :expr").bindparams(expr=expr))
+        .order_by(rank)
+        .limit(limit)
+    )
+    if status:
+        stmt = stmt.where(JobRecord.status == status)
+    if min_score is not None:
+        stmt = stmt.where(JobRecord.score >= min_score)
+    if since:
+        stmt = stmt.where(JobRecord.first_seen_at >= since)
+    if until:
+        stmt = stmt.where(JobRecord.first_seen_at < until)
+    return session.execute(stmt).all()
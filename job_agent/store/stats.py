@@ -0,0 +1,183 @@
+"""Daily aggregates of stored jobs, maintained as jobs are written.
+
+``job_stats`` has one row per (day, dimension, value). The day is the
+day a job was first seen, in the user's time zone. The dimension is one of
+``DIMENSIONS``: the whole day (``all``, with value ``""``), company,
+location, score band or the search URL the job was found on. Each row
+counts new jobs and how many of them were emailed, applied to and skipped.
+
+``JobRepository`` bumps a job's rows in the same transaction as the write
+that changes them, so reports read a handful of rows per day instead of
+grouping the ``jobs`` table. Reposts are not counted. ``rebuild``
+recomputes the table from ``jobs``, e.g. after a rescore moved jobs
+between score bands.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import pytz
+from sqlalchemy import delete, desc, func, select, update
+from job_agent.store.models import JobRecord, JobStatRecord
+
+DIMENSIONS = ("all", "company", "location", "score_band", "search_url")
+COUNTS = ("new_jobs", "emailed", "applied", "skipped")
+
+# Review statuses with their own count.
+STATUS_COUNTS = {"APPLIED": "applied", "SKIPPED": "skipped"}
+
+_stats = JobStatRecord.__table__
+
+def score_band(score: int) -> str:
+    low = min(max(int(score), 0) // 20, 4) * 20
+    return f"{low}-{100 if low == 80 else low + 19}"
+
+def local_day(ts: datetime, tz) -> date:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=pytz.UTC)
+    return ts.astimezone(tz).date()
+
+def stat_keys(day: date, company, location, score, search_url,
+              dimensions: Sequence[str] = DIMENSIONS) -> List[Tuple[date, str, str]]:
+    """The (day, dimension, value) rows a job counts towards."""
+    values = {
+        "all": "",
+        "company": company or "",
+        "location": location or "",
+        "score_band": score_band(score),
+        "search_url": search_url or "",
+    }
+    return [(day, dim, values[dim]) for dim in dimensions]
+
+def status_deltas(old: Optional[str], new: Optional[str]) -> Dict[str, int]:
+    deltas: Dict[str, int] = defaultdict(int)
+    if old in STATUS_COUNTS:
+        deltas[STATUS_COUNTS[old]] -= 1
+    if new in STATUS_COUNTS:
+        deltas[STATUS_COUNTS[new]] += 1
+    return {k: v for k, v in deltas.items() if v}
+
+def _upsert(bind):
+    """Dialect ``insert`` with ON CONFLICT support, or None."""
+    if bind.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert
+
+def bump(conn, keys: Iterable[Tuple[date, str, str]], **deltas: int):
+    """Add ``deltas`` (e.g. ``new_jobs=1``) to the given rows, creating missing ones.
+
+    ``conn`` is a Session or Connection; the caller commits.
+    """
+    if any(deltas.values()):
+        bump_many(conn, {key: deltas for key in keys})
+
+def bump_many(conn, deltas_by_key: Dict[Tuple[date, str, str], Dict[str, int]]):
+    """Like ``bump``, with each row's own deltas, in one executemany statement."""
+    params = [
+        {"day": day, "dimension": dim, "value": value, **{c: deltas.get(c, 0) for c in COUNTS}}
+        for (day, dim, value), deltas in deltas_by_key.items()
+        if any(deltas.values())
+    ]
+    if not params:
+        return
+    insert = _upsert(conn.get_bind() if hasattr(conn, "get_bind") else conn)
+    if insert is not None:
+        stmt = insert(_stats)
+        conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["day", "dimension", "value"],
+                set_={c: _stats.c[c] + stmt.excluded[c] for c in COUNTS},
+            ),
+            params,
+        )
+        return
+    for p in params:  # no upsert: update, then insert what was missing
+        where = (_stats.c.day == p["day"], _stats.c.dimension == p["dimension"], _stats.c.value == p["value"])
+        result = conn.execute(update(_stats).where(*where).values({c: _stats.c[c] + p[c] for c in COUNTS}))
+        if result.rowcount == 0:
+            conn.execute(_stats.insert(), [p])
+
+def rebuild(conn, tz, dimensions: Sequence[str] = DIMENSIONS, chunk_size: int = 5000) -> int:
+    """Recompute the given dimensions from ``jobs``; returns the number of rows written.
+
+    Jobs are streamed once and counted in memory per aggregate row, so
+    memory grows with the number of distinct companies, locations and URLs,
+    not with the number of jobs. The caller commits.
+    """
+    totals: Dict[Tuple[date, str, str], List[int]] = defaultdict(lambda: [0] * len(COUNTS))
+    stmt = (
+        select(JobRecord.first_seen_at, JobRecord.company, JobRecord.location, JobRecord.score,
+               JobRecord.search_url, JobRecord.emailed_at, JobRecord.status)
+        .where(JobRecord.duplicate_of.is_(None))
+        .execution_options(yield_per=chunk_size)
+    )
+    applied, skipped = COUNTS.index("applied"), COUNTS.index("skipped")
+    for seen, company, location, score, search_url, emailed_at, status in conn.execute(stmt):
+        for key in stat_keys(local_day(seen, tz), company, location, score, search_url, dimensions):
+            row = totals[key]
+            row[0] += 1
+            row[1] += emailed_at is not None
+            row[applied] += status == "APPLIED"
+            row[skipped] += status == "SKIPPED"
+    conn.execute(delete(_stats).where(_stats.c.dimension.in_(list(dimensions))))
+    rows = [
+        {"day": day, "dimension": dim, "value": value, **dict(zip(COUNTS, counts))}
+        for (day, dim, value), counts in totals.items()
+    ]
+    for start in range(0, len(rows), chunk_size):
+        conn.execute(_stats.insert(), rows[start:start + chunk_size])
+    return len(rows)
+
+@dataclass
+class StatRow:
+    value: str
+    new_jobs: int
+    emailed: int
+    applied: int
+    skipped: int
+
+    @property
+    def email_rate(self) -> float:
+        return self.emailed / self.new_jobs if self.new_jobs else 0.0
+
+def totals(conn, dimension: str, since: date, until: date, limit: Optional[int] = None) -> List[StatRow]:
+    """Counts per value of ``dimension`` over days ``since`` to ``until`` (inclusive), most new jobs first."""
+    sums = [func.sum(_stats.c[c]).label(c) for c in COUNTS]
+    stmt = (
+        select(_stats.c.value, *sums)
+        .where(_stats.c.dimension == dimension, _stats.c.day >= since, _stats.c.day <= until)
+        .group_by(_stats.c.value)
+        .order_by(desc("new_jobs"), _stats.c.value)
+        .limit(limit)
+    )
+    return [StatRow(r.value, *(int(r._mapping[c] or 0) for c in COUNTS)) for r in conn.execute(stmt)]
+
+def per_day(conn, since: date, until: date) -> List[Tuple[date, StatRow]]:
+    """The ``all`` row of each day from ``since`` to ``until``, oldest first."""
+    stmt = (
+        select(_stats)
+        .where(_stats.c.dimension == "all", _stats.c.day >= since, _stats.c.day <= until)
+        .order_by(_stats.c.day)
+    )
+    return [(r.day, StatRow("", *(r._mapping[c] for c in COUNTS))) for r in conn.execute(stmt)]
+
+@dataclass
+class DayStats:
+    """Digest header: one day's counts and its busiest companies."""
+    day: date
+    new_jobs: int = 0
+    emailed: int = 0
+    applied: int = 0
+    skipped: int = 0
+    top_companies: List[StatRow] = field(default_factory=list)
+
+def day_stats(conn, day: date, top: int = 3) -> DayStats:
+    days = per_day(conn, day, day)
+    if not days:
+        return DayStats(day)
+    row = days[0][1]
+    return DayStats(day, row.new_jobs, row.emailed, row.applied, row.skipped, totals(conn, "company", day, day, top))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark for logging overhead on the polling thread.
+
+Emulates one polling cycle that logs a few records per job (as the polling
+path does for URLs, reposts and alerts) into a sink that takes --write-us
+microseconds per write, like a congested container log driver. Reports the
+time the cycle's own thread spends in logging calls for the old synchronous
+basicConfig-style handler and for the queue-backed setup (text and JSON,
+with and without sampling), plus how long the writer takes to drain.
+
+Usage:
+    python scripts/bench_logging.py [--jobs 2000] [--per-job 3] [--write-us 200]
+"""
+
+import argparse
+import io
+import logging
+import sys
+import time
+
+from job_agent.core.logging import TEXT_FORMAT, log_context, setup_logging, shutdown_logging
+
+class SlowSink(io.TextIOBase):
+    def __init__(self, write_us: float):
+        self.delay = write_us / 1e6
+
+    def write(self, s):
+        time.sleep(self.delay)  # blocked on I/O, so the GIL is released meanwhile
+        return len(s)
+
+def cycle(jobs: int, per_job: int) -> float:
+    log = logging.getLogger("job_agent.services")
+    start = time.perf_counter()
+    with log_context(cycle="bench"):
+        for i in range(jobs):
+            with log_context(url=f"u{i % 40}"):
+                for k in range(per_job):
+                    log.info("Job %s step %s: %s", i, k, "Senior Platform Engineer @ Acme")
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--per-job", type=int, default=3)
+    parser.add_argument("--write-us", type=float, default=200.0)
+    args = parser.parse_args()
+    records = args.jobs * args.per_job
+    root = logging.getLogger()
+    root.handlers[:] = []
+
+    def report(name, spent, drained=None):
+        line = f"{name:<28} {spent * 1000:8.1f} ms on the cycle thread ({spent / records * 1e6:6.1f} us/record)"
+        if drained is not None:
+            line += f", writer drained in {drained * 1000:.0f} ms"
+        print(line)
+
+    sync = logging.StreamHandler(SlowSink(args.write_us))
+    sync.setFormatter(logging.Formatter(TEXT_FORMAT))
+    root.addHandler(sync)
+    root.setLevel(logging.INFO)
+    report("synchronous (basicConfig)", cycle(args.jobs, args.per_job))
+    root.removeHandler(sync)
+
+    for name, kwargs in (
+        ("queue, text", {}),
+        ("queue, json", {"fmt": "json"}),
+        ("queue, json, 10% sampled", {"fmt": "json", "sampling": {"job_agent.services": 0.1}}),
+    ):
+        setup_logging("INFO", queue_size=records + 1, stream=SlowSink(args.write_us), **kwargs)
+        spent = cycle(args.jobs, args.per_job)
+        start = time.perf_counter()
+        shutdown_logging()
+        report(name, spent, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for in-memory jobs and stored score reasons.
+
+Builds N scored jobs twice: once with the previous representation (plain
+frozen dataclasses, reasons as a list of formatted strings) and once with
+the current one (slotted dataclasses, reasons as a factor bitmask plus
+per-factor points). Reports tracemalloc bytes per job for the objects kept
+in memory, and bytes per row for the reasons columns.
+
+Usage:
+    python scripts/bench_memory.py [--jobs 100000]
+"""
+
+import argparse
+import json
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List
+
+from job_agent.core.scoring import ScoringMatcher
+from job_agent.core.config import load_config, load_profile
+from job_agent.models.job import JobPosting, ObservedJob
+from job_agent.models.score import pack_points
+
+# The representation before slots and factor bitmasks, kept here for comparison.
+@dataclass(frozen=True)
+class LegacyJobPosting:
+    source: str
+    title: str
+    company: str
+    location: str
+    url: str
+    posted_text: str = ""
+    description: str = ""
+
+@dataclass(frozen=True)
+class LegacyObservedJob:
+    job: LegacyJobPosting
+    job_key: str
+    first_seen_at: datetime
+
+@dataclass(frozen=True)
+class LegacyScoreResult:
+    score: int
+    reasons: List[str]
+    action: str
+
+TITLES = ["Senior Backend Engineer", "Platform Engineer - AWS", "Lead Node.js Developer", "Sales Intern"]
+
+def fields(i: int) -> tuple:
+    # Fresh strings per job, as they would come out of the parser.
+    return (
+        "naukri",
+        f"{TITLES[i % len(TITLES)]} {i}",
+        f"Company {i % 500}",
+        ["Bangalore", "Remote", "Chennai"][i % 3],
+        f"https://www.naukri.com/job-listings-{i}",
+        ["Just now", "Today", "2 days ago"][i % 3],
+    )
+
+def measure(build, n: int):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [build(i) for i in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return kept, size / n
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--config", default="config/config.example.yaml")
+    parser.add_argument("--profile", default="config/profile.example.yaml")
+    args = parser.parse_args()
+
+    cfg = load_config(args.config)
+    matcher = ScoringMatcher(load_profile(args.profile).profile, cfg.scoring)
+    now = datetime.now(timezone.utc)
+    # Score once up front so both builds measure storage, not scoring garbage.
+    results = [matcher.score(JobPosting(*fields(i))) for i in range(len(TITLES) * 3)]
+
+    def legacy(i):
+        job = LegacyJobPosting(*fields(i))
+        r = results[i % len(results)]
+        return LegacyObservedJob(job, f"{i:032x}", now), LegacyScoreResult(r.score, list(r.reasons), r.action)
+
+    def compact(i):
+        job = JobPosting(*fields(i))
+        r = results[i % len(results)]
+        return ObservedJob(job, f"{i:032x}", now), type(r)(r.score, r.factors, tuple(r.points), r.action)
+
+    _, legacy_bytes = measure(legacy, args.jobs)
+    _, compact_bytes = measure(compact, args.jobs)
+
+    legacy_col = sum(len(json.dumps(r.reasons).encode("utf-8")) for r in results) / len(results)
+    compact_col = sum(8 + len(pack_points(r.points)) for r in results) / len(results)
+
+    print(f"jobs: {args.jobs}")
+    print(f"{'':<28} {'before':>10} {'after':>10}")
+    print(f"{'in-memory bytes/job':<28} {legacy_bytes:>10.0f} {compact_bytes:>10.0f}")
+    print(f"{'reasons column bytes/row':<28} {legacy_col:>10.1f} {compact_col:>10.1f}")
+
+if __name__ == "__main__":
+    main()
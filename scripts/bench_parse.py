@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the process-pool parse stage.
+
+Parses synthetic Naukri result pages of several sizes, first inline and then
+through a ParsePool fed by as many threads as there are workers (as with
+concurrent fetching), and reports pages per second for each. The smallest
+size at which the pool wins is a good value for parsing.process_min_bytes.
+It then compares the buffered parse with the streaming one (16 KiB chunks)
+on the largest page: time to the first job, total time and peak memory.
+
+Usage:
+    python scripts/bench_parse.py [--pages 40] [--processes 4] [--cards 5 20 80]
+"""
+
+import argparse
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+from job_agent.adapters.naukri.parse_pool import ParsePool
+from job_agent.adapters.naukri.source import STREAM_CHUNK_BYTES
+from job_agent.models.config import ParsingCfg
+
+def page(cards: int) -> bytes:
+    body = "".join(
+        f'<div class="cust-job-tuple"><a class="title" href="/job-{i}">Senior Platform Engineer {i}</a>'
+        f'<span class="comp-name">Acme Technologies</span><span class="locWdth">Bengaluru, Chennai</span>'
+        f'<span class="job-post-day">Just now</span><ul class="tags">{"<li>kubernetes</li>" * 12}</ul>'
+        f'<div class="job-desc">{"Build scalable backend services and search infrastructure. " * 8}</div></div>'
+        for i in range(cards)
+    )
+    return f"<html><head><title>Jobs</title></head><body>{body}</body></html>".encode("utf-8")
+
+def rate(parse, pages, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(parse, pages))
+    return len(pages) / (time.perf_counter() - start)
+
+def streaming_vs_buffered(parsing: dict, body: bytes):
+    from job_agent.adapters.naukri.parser import NaukriParser
+
+    url = "https://www.naukri.com/"
+    parser = NaukriParser(ParsingCfg(**dict(parsing, streaming=True)))
+
+    def buffered():
+        jobs = parser.parse_jobs(body.decode("utf-8"), url)
+        return jobs[0]
+
+    def streamed():
+        feed = parser.feed_parser(url, "utf-8")
+        for i in range(0, len(body), STREAM_CHUNK_BYTES):
+            jobs = feed.feed(body[i:i + STREAM_CHUNK_BYTES])
+            if jobs:
+                return jobs[0]
+
+    def drain_streamed():
+        feed = parser.feed_parser(url, "utf-8")
+        for i in range(0, len(body), STREAM_CHUNK_BYTES):
+            feed.feed(body[i:i + STREAM_CHUNK_BYTES])
+        feed.close()
+
+    for name, first, whole in (("buffered", buffered, buffered), ("streaming", streamed, drain_streamed)):
+        start = time.perf_counter()
+        first()
+        to_first = time.perf_counter() - start
+        tracemalloc.start()
+        start = time.perf_counter()
+        whole()
+        total = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:>9}: first job after {to_first * 1000:6.1f} ms, whole page {total * 1000:6.1f} ms "
+              f"(traced), peak {peak / 1024:7.0f} KiB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--cards", type=int, nargs="+", default=[5, 20, 80])
+    parser.add_argument("--config", default="config/config.example.yaml")
+    args = parser.parse_args()
+
+    with open(args.config, encoding="utf-8") as f:
+        parsing = yaml.safe_load(f)["sources"]["naukri"]["parsing"]
+    cfg = ParsingCfg(**dict(parsing, processes=args.processes, process_min_bytes=0))
+    pool = ParsePool(cfg)
+    try:
+        pool.parse(page(1), "utf-8", "https://www.naukri.com/")  # start the workers outside the timing
+        for cards in args.cards:
+            pages = [page(cards)] * args.pages
+            inline = rate(lambda p: pool.parser.parse_jobs(p, "https://www.naukri.com/", "utf-8"), pages, 1)
+            pooled = rate(lambda p: pool.parse(p, "utf-8", "https://www.naukri.com/"), pages, args.processes)
+            print(f"{len(pages[0]) // 1024:>5} KiB/page: inline {inline:7.1f} pages/s, "
+                  f"{args.processes} processes {pooled:7.1f} pages/s")
+    finally:
+        pool.close()
+    streaming_vs_buffered(parsing, page(max(args.cards)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the profile similarity factor.
+
+Scores N synthetic job texts against the example profile, once through the
+batch path (NumPy segment sums when NumPy is installed) and once job by
+job, and reports microseconds per job for each.
+
+Usage:
+    python scripts/bench_similarity.py [--jobs 5000] [--batch 1000]
+"""
+
+import argparse
+import time
+
+from job_agent.core import similarity
+from job_agent.core.config import load_profile
+
+WORDS = (
+    "backend platform engineer scalable search postgresql aws marketplace redis kubernetes docker "
+    "api services payments latency ownership design reliability golang java python kafka teams"
+).split()
+
+def text(i: int) -> str:
+    words = [WORDS[(i * 7 + k * 3) % len(WORDS)] for k in range(40)]
+    return f"Senior Engineer {i}\n" + " ".join(words)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--profile", default="config/profile.example.yaml")
+    args = parser.parse_args()
+
+    sim = similarity.ProfileSimilarity(load_profile(args.profile).profile)
+    texts = [text(i) for i in range(args.jobs)]
+
+    start = time.perf_counter()
+    for i in range(0, len(texts), args.batch):
+        sim.similarities(texts[i:i + args.batch])
+    batch_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+    start = time.perf_counter()
+    for t in texts:
+        sim.similarity(t)
+    single_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+    print(f"jobs: {args.jobs}  batch size: {args.batch}  numpy: {'yes' if similarity.np is not None else 'no'}")
+    print(f"{'batch':<10} {batch_us:>8.1f} us/job")
+    print(f"{'per job':<10} {single_us:>8.1f} us/job")
+
+if __name__ == "__main__":
+    main()
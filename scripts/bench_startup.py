@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the naukri-agent subcommands.
+
+Each subcommand is run in a fresh interpreter against a throwaway SQLite
+database (email disabled, no search URLs, so nothing touches the network).
+Reports the median wall time from interpreter start to command exit and
+which heavy third-party modules the command ended up importing.
+
+Usage:
+    python scripts/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["apscheduler", "bs4", "lxml", "jinja2", "requests", "sqlalchemy.orm"]
+
+# Runs one command in-process and prints timing + imported heavy modules.
+# ``run`` would block forever, so its Scheduler.run is replaced by a no-op
+# after the scheduler module (which the command needs anyway) is imported.
+DRIVER = """
+import json, sys, time
+t0 = time.perf_counter()
+argv = json.loads(sys.argv[1])
+from job_agent import cli
+if argv[0] == "run":
+    from job_agent.adapters.scheduler import Scheduler
+    Scheduler.run = lambda self, *a, **kw: None
+cli.main(argv)
+elapsed = time.perf_counter() - t0
+heavy = [m for m in json.loads(sys.argv[2]) if m in sys.modules]
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+"""
+
+def write_config(tmp: Path) -> Path:
+    """Write a network-free config pointing at a temp database."""
+    data = yaml.safe_load((ROOT / "config" / "config.example.yaml").read_text(encoding="utf-8"))
+    data["app"]["db_url"] = f"sqlite:///{tmp / 'bench.db'}"
+    data["app"]["log_level"] = "WARNING"
+    data["sources"]["naukri"]["search_urls"] = []
+    data["email"]["enabled"] = False
+    data["profile_path"] = str(ROOT / "config" / "profile.example.yaml")
+    path = tmp / "config.yaml"
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    return path
+
+def commands(config: Path) -> dict:
+    cfg = str(config)
+    return {
+        "mark": ["mark", "--config", cfg, "--job-key", "bench", "--status", "MANUAL"],
+        "poll-once": ["poll-once", "--config", cfg, "--no-email"],
+        "run": ["run", "--config", cfg],
+    }
+
+def run_once(argv) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", DRIVER, json.dumps(argv), json.dumps(HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def interpreter_baseline(runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", "import time; t=time.perf_counter(); print(time.perf_counter()-t)"],
+            capture_output=True, text=True, check=True,
+        )
+        samples.append(float(out.stdout))
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = write_config(Path(tmp))
+        cmds = commands(config)
+        # Warm-up: creates the schema so every measured run sees a current version.
+        run_once(cmds["mark"])
+
+        print(f"{'command':<12} {'median ms':>10}  heavy imports")
+        print("-" * 60)
+        for name, argv in cmds.items():
+            results = [run_once(argv) for _ in range(args.runs)]
+            median_ms = statistics.median(r["elapsed"] for r in results) * 1000
+            heavy = ", ".join(results[-1]["heavy"]) or "-"
+            print(f"{name:<12} {median_ms:>10.1f}  {heavy}")
+
+if __name__ == "__main__":
+    main()
@@ -141,7 +141,7 @@ def test_repository():
             url="https://test.com",
         )
         observed = ObservedJob(job, "test_key", datetime.now(pytz.UTC))
-        score_result = ScoreResult(score=80, reasons=["Test"], action="EMAIL")
+        score_result = ScoreResult(score=80, factors=0, points=(), action="EMAIL")
         repo.insert(observed, score_result)
         
         # Test exists
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Soak test for the long-running agent.
+
+Runs thousands of back-to-back polling cycles (and a digest every
+--digest-every cycles) against a local stand-in job board served over HTTP
+and a local SMTP sink, using a throwaway SQLite database. Every page has a
+few jobs not seen before, so each cycle stores, scores and emails like a
+real one. After --warmup cycles the process's RSS, open file descriptors,
+pooled DB connections and live ORM sessions are recorded, and at the end
+they are compared against that baseline; the run fails (exit status 1) if
+any of them grew beyond the allowed slack.
+
+Usage:
+    python scripts/soak.py [--cycles 2000] [--warmup 200] [--max-rss-growth-mb 16]
+"""
+
+import argparse
+import gc
+import itertools
+import logging
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import yaml
+
+from job_agent.core.app import AppContext
+from job_agent.core.config import load_profile
+from job_agent.core.services import DigestService, PollingService
+from job_agent.models.config import RootCfg
+
+ROOT = Path(__file__).resolve().parent.parent
+
+TITLES = ["Senior Backend Engineer", "Platform Engineer", "Senior Full Stack Engineer", "Data Analyst"]
+
+class Board(BaseHTTPRequestHandler):
+    """Serves Naukri-like result pages; each request shows ``new`` jobs never served before."""
+
+    counter = itertools.count()
+    cards = 20
+    new = 3
+
+    def do_GET(self):
+        fresh = [next(self.counter) for _ in range(self.new)]
+        ids = fresh + [i % 50 for i in range(self.cards - self.new)]  # the rest repeat
+        body = "".join(
+            f'<div class="cust-job-tuple"><a class="title" href="/job/{i}">{TITLES[i % len(TITLES)]} {i}</a>'
+            f'<span class="comp-name">Acme {i % 7}</span><span class="locWdth">Remote</span>'
+            f'<span class="job-post-day">Just now</span></div>'
+            for i in ids
+        )
+        page = f"<html><body><div class='results'>{body}</div></body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, *args):
+        pass
+
+class SmtpSink(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages (no TLS, no AUTH)."""
+
+    received = 0
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 soak ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.decode(errors="replace").strip().upper()
+            if verb.startswith("EHLO"):
+                self.reply("250-soak")
+                self.reply("250 8BITMIME")
+            elif verb.startswith("DATA"):
+                self.reply("354 end with .")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                type(self).received += 1
+                self.reply("250 queued")
+            elif verb.startswith("QUIT"):
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+class ThreadingSMTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # peak, in KiB on Linux
+
+def open_fds() -> int:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(path):
+            return len(os.listdir(path))
+    return -1
+
+def live_sessions() -> int:
+    from sqlalchemy.orm import Session
+    return sum(1 for o in gc.get_objects() if isinstance(o, Session))
+
+def sample(ctx) -> dict:
+    gc.collect()
+    pool = ctx.engine.pool
+    return {
+        "rss_kb": rss_kb(),
+        "fds": open_fds(),
+        "db_open": pool.checkedin() + pool.checkedout(),
+        "db_checked_out": pool.checkedout(),
+        "sessions": live_sessions(),
+    }
+
+def build_ctx(tmp: str, board_port: int, smtp_port: int) -> AppContext:
+    data = yaml.safe_load((ROOT / "config" / "config.example.yaml").read_text(encoding="utf-8"))
+    data["app"].update(db_url=f"sqlite:///{tmp}/soak.db", log_level="WARNING")
+    data["polling"]["max_jobs_per_run"] = 1000
+    naukri = data["sources"]["naukri"]
+    naukri.update(min_interval_seconds=0, search_urls=[f"http://127.0.0.1:{board_port}/search-{i}" for i in range(3)])
+    data["scoring"]["min_score_to_email"] = 60
+    data["email"].update(enabled=True, to_emails=["soak@example.invalid"])
+    data["email"]["gmail_smtp"].update(
+        enabled=True, smtp_host="127.0.0.1", smtp_port=smtp_port, starttls=False, gmail_app_password=""
+    )
+    data["profile_path"] = str(ROOT / "config" / "profile.example.yaml")
+    return AppContext.from_config(RootCfg(**data))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--digest-every", type=int, default=250)
+    parser.add_argument("--report-every", type=int, default=250)
+    parser.add_argument("--max-rss-growth-mb", type=float, default=16.0)
+    parser.add_argument("--max-fd-growth", type=int, default=2)
+    args = parser.parse_args()
+
+    board = serve(ThreadingHTTPServer(("127.0.0.1", 0), Board))
+    smtp = serve(ThreadingSMTPServer(("127.0.0.1", 0), SmtpSink))
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = build_ctx(tmp, board.server_address[1], smtp.server_address[1])
+        logging.getLogger().setLevel(logging.WARNING)
+        profile = load_profile(ctx.cfg.profile_path).profile
+        polling, digest = PollingService(ctx, profile), DigestService(ctx, profile)
+
+        baseline = None
+        start = time.perf_counter()
+        for cycle in range(1, args.cycles + 1):
+            polling.run_once()
+            if cycle % args.digest_every == 0:
+                digest.run_daily()
+            if cycle == args.warmup:
+                baseline = sample(ctx)
+            if cycle % args.report_every == 0 or cycle == args.cycles:
+                s = sample(ctx)
+                print(f"cycle {cycle:>6}  rss {s['rss_kb'] / 1024:7.1f} MiB  fds {s['fds']:>4}  "
+                      f"db conns {s['db_open']} ({s['db_checked_out']} in use)  sessions {s['sessions']}  "
+                      f"emails {SmtpSink.received}  {(time.perf_counter() - start) / cycle * 1000:6.1f} ms/cycle")
+        final = sample(ctx)
+    board.shutdown()
+    smtp.shutdown()
+
+    baseline = baseline or final
+    pool = ctx.cfg.app.db_pool
+    failures = []
+    if final["rss_kb"] - baseline["rss_kb"] > args.max_rss_growth_mb * 1024:
+        failures.append(f"RSS grew {(final['rss_kb'] - baseline['rss_kb']) / 1024:.1f} MiB after warm-up")
+    if final["fds"] - baseline["fds"] > args.max_fd_growth:
+        failures.append(f"open file descriptors grew from {baseline['fds']} to {final['fds']}")
+    if final["db_checked_out"] or final["db_open"] > pool.size + pool.max_overflow:
+        failures.append(f"{final['db_checked_out']} DB connections still checked out, {final['db_open']} open")
+    if final["db_open"] > baseline["db_open"]:
+        failures.append(f"pooled DB connections grew from {baseline['db_open']} to {final['db_open']}")
+    if final["sessions"]:
+        failures.append(f"{final['sessions']} ORM sessions still alive between cycles")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print(f"OK: {args.cycles} cycles, no growth in RSS, file descriptors or DB connections after warm-up")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -90,7 +90,7 @@ job = JobPosting(
     url='https://test.com/job1',
 )
 observed = ObservedJob(job, 'test_key_123', datetime.now(pytz.UTC))
-score_result = ScoreResult(score=85, reasons=['Test'], action='EMAIL')
+score_result = ScoreResult(score=85, factors=0, points=(), action='EMAIL')
 
 repo.insert(observed, score_result)
 assert repo.exists('test_key_123')
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+import yaml
+from sqlalchemy import event
+
+from job_agent.core.app import AppContext
+from job_agent.core.config import load_profile
+from job_agent.models.config import RootCfg
+
+ROOT = Path(__file__).resolve().parent.parent
+
+@pytest.fixture
+def cfg_data(tmp_path):
+    """Example config as a dict, pointed at a temp database with email off."""
+    data = yaml.safe_load((ROOT / "config" / "config.example.yaml").read_text(encoding="utf-8"))
+    data["app"]["db_url"] = f"sqlite:///{tmp_path / 'agent.db'}"
+    data["email"]["enabled"] = False
+    data["profile_path"] = str(ROOT / "config" / "profile.example.yaml")
+    return data
+
+@pytest.fixture
+def profile():
+    return load_profile(str(ROOT / "config" / "profile.example.yaml")).profile
+
+@pytest.fixture
+def ctx(cfg_data):
+    return AppContext.from_config(RootCfg(**cfg_data))
+
+@pytest.fixture
+def query_plan():
+    """``query_plan(engine, prefix, call)``: SQLite's plan for the last statement starting
+    with ``prefix`` (e.g. ``"SELECT"``) that ``call()`` sent, with the parameters it used."""
+    def plan(engine, prefix, call):
+        sent = []
+        def capture(conn, cursor, statement, params, context, executemany):
+            if statement.lstrip().upper().startswith(prefix):
+                sent.append((statement, params))
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            call()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        assert sent, f"no {prefix} statement was sent"
+        statement, params = sent[-1]
+        with engine.connect() as conn:
+            return " ".join(str(r) for r in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params))
+    return plan
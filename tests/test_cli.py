@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def _write_config(tmp_path: Path) -> Path:
+    data = yaml.safe_load((ROOT / "config" / "config.example.yaml").read_text(encoding="utf-8"))
+    data["app"]["db_url"] = f"sqlite:///{tmp_path / 'agent.db'}"
+    data["sources"]["naukri"]["search_urls"] = []
+    data["email"]["enabled"] = False
+    data["profile_path"] = str(ROOT / "config" / "profile.example.yaml")
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    return path
+
+def test_mark_does_not_import_network_stack(tmp_path):
+    config = _write_config(tmp_path)
+    script = (
+        "import json, sys\n"
+        "from job_agent import cli\n"
+        f"cli.main(['mark', '--config', {str(config)!r}, '--job-key', 'k', '--status', 'MANUAL'])\n"
+        "print(json.dumps([m for m in ('apscheduler', 'bs4', 'jinja2', 'requests') if m in sys.modules]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
+
+def test_init_db_skips_ddl_when_schema_current(tmp_path, monkeypatch):
+    from job_agent.store.db import create_engine_from_url, init_db, schema_version, SCHEMA_VERSION
+    from job_agent.store.models import Base
+
+    engine = create_engine_from_url(f"sqlite:///{tmp_path / 'agent.db'}")
+    assert schema_version(engine) == 0
+    init_db(engine)
+    assert schema_version(engine) == SCHEMA_VERSION
+
+    calls = []
+    monkeypatch.setattr(Base.metadata, "create_all", lambda *a, **kw: calls.append(a))
+    init_db(engine)
+    assert calls == []
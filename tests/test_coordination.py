@@ -0,0 +1,93 @@
+import multiprocessing
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytz
+
+from job_agent.adapters.clock import Clock
+from job_agent.core.services import DigestService
+from job_agent.models.job import JobPosting, ObservedJob
+from job_agent.models.score import ScoreResult
+from job_agent.store.coordination import Coordinator
+from job_agent.store.db import create_engine_from_url, create_session_factory, init_db
+from job_agent.store.repo import JobRepository
+
+URLS = [f"https://www.naukri.com/search-{i}" for i in range(6)]
+KEYS = [f"job{i}" for i in range(60)]
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2024, 1, 1, tzinfo=pytz.UTC)
+
+    def now_utc(self):
+        return self.now
+
+def _session_factory(path):
+    engine = create_engine_from_url(f"sqlite:///{path}")
+    init_db(engine)
+    return create_session_factory(engine)
+
+def test_leases_rebalance_on_join_and_death(tmp_path):
+    factory = _session_factory(tmp_path / "agent.db")
+    clock = FakeClock()
+    a = Coordinator(factory, clock, lease_seconds=60, worker_id="a")
+    b = Coordinator(factory, clock, lease_seconds=60, worker_id="b")
+
+    a.register()
+    assert len(a.acquire(URLS)) == 6
+
+    b.register()
+    assert b.acquire(URLS) == []  # a still holds everything
+    owned_a = a.acquire(URLS)  # a sees two workers and gives half back
+    owned_b = b.acquire(URLS)
+    assert len(owned_a) == len(owned_b) == 3
+    assert set(owned_a).isdisjoint(owned_b)
+
+    clock.now += timedelta(seconds=61)  # a stops heartbeating
+    assert sorted(b.acquire(URLS)) == sorted(URLS)
+
+def _worker(db_path, barrier, results):
+    factory = _session_factory(db_path)
+    coordinator = Coordinator(factory, Clock(), lease_seconds=300)
+    coordinator.register()
+    barrier.wait()
+    for _ in range(3):
+        owned = coordinator.acquire(URLS)
+        barrier.wait()
+    repo = JobRepository(factory())
+    claimed = [k for k in KEYS if repo.claim_email(k, coordinator.worker_id)]
+
+    digests = []
+    notifier = SimpleNamespace(send_digest=lambda jobs, stats: digests.append(stats.day))
+    ctx = SimpleNamespace(notifier=notifier, clock=Clock(), worker_id=coordinator.worker_id,
+                          job_repo=lambda: JobRepository(factory()))
+    barrier.wait()
+    DigestService(ctx, None).run_daily()
+    results.put((owned, claimed, digests))
+
+def test_processes_split_urls_and_claim_each_email_and_digest_once(tmp_path):
+    db_path = tmp_path / "agent.db"
+    repo = JobRepository(_session_factory(db_path)())
+    for key in KEYS:
+        job = JobPosting("naukri", "Engineer", "Acme", "Remote", f"https://example.com/{key}")
+        repo.insert(ObservedJob(job, key, datetime.now(pytz.UTC)), ScoreResult(90, 0, (), "EMAIL"))
+    repo.session.close()
+
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(3)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(db_path, barrier, results)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    outcomes = [results.get(timeout=60) for _ in procs]
+    for p in procs:
+        p.join(timeout=10)
+
+    owned = [set(o) for o, _, _ in outcomes]
+    assert sum(len(o) for o in owned) == len(URLS)
+    assert set().union(*owned) == set(URLS)
+
+    claimed = [k for _, c, _ in outcomes for k in c]
+    assert sorted(claimed) == sorted(KEYS)
+
+    assert sum(len(sent) for _, _, sent in outcomes) == 1  # one worker sent the day's digest
@@ -0,0 +1,71 @@
+from job_agent.core import dedup
+from job_agent.core.services import PollingService
+from job_agent.models.job import JobPosting
+from job_agent.store.db import create_engine_from_url, create_session_factory, init_db
+from job_agent.store.models import JobRecord
+from job_agent.store.repo import JobRepository
+
+TITLE = "Senior Backend Engineer - Node.js AWS PostgreSQL"
+
+class FakeSource:
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def search(self, urls=None):
+        yield from self.jobs
+
+class FakeNotifier:
+    def __init__(self):
+        self.sent = []
+
+    def send_job(self, observed, score_result, notes=""):
+        self.sent.append(observed.job_key)
+
+def test_signature_tolerates_reposts_but_not_other_roles():
+    original = JobPosting("naukri", "Senior Backend Engineer", "Acme Pvt Ltd", "Bangalore", "u1")
+    consultancy = JobPosting("naukri", "Sr. Backend Engineer", "Talent Hunt Consultants", "Bengaluru", "u2")
+    other_city = JobPosting("naukri", "Senior Backend Engineer", "Acme", "Pune", "u3")
+    other_role = JobPosting("naukri", "Lead Frontend Engineer", "Acme", "Bangalore", "u4")
+
+    sig = dedup.simhash(original)
+    assert dedup.is_near_duplicate(sig, original.title, dedup.simhash(consultancy), consultancy.title, 3)
+    assert not dedup.is_near_duplicate(sig, original.title, dedup.simhash(other_city), other_city.title, 3)
+    assert not dedup.is_near_duplicate(sig, original.title, dedup.simhash(other_role), other_role.title, 3)
+
+def test_repost_is_linked_and_not_emailed(ctx, profile):
+    notifier = FakeNotifier()
+    ctx.notifier = notifier
+    ctx.naukri_source = FakeSource([
+        JobPosting("naukri", TITLE, "Acme", "Remote", "https://example.com/1", "Just now"),
+        JobPosting("naukri", TITLE, "Acme Technologies", "Remote", "https://example.com/2?src=x", "Just now"),
+    ])
+
+    PollingService(ctx, profile).run_once()
+
+    rows = {r.url: r for r in ctx.job_repo().session.query(JobRecord)}
+    original, repost = rows["https://example.com/1"], rows["https://example.com/2?src=x"]
+    assert original.duplicate_of is None
+    assert repost.duplicate_of == original.job_key
+    assert notifier.sent == [original.job_key]
+
+def test_migration_backfills_signatures(tmp_path):
+    engine = create_engine_from_url(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        # jobs table as created before signatures existed
+        conn.exec_driver_sql(
+            "CREATE TABLE jobs (job_key VARCHAR(32) PRIMARY KEY, source VARCHAR(50) NOT NULL, "
+            "title VARCHAR(500) NOT NULL, company VARCHAR(200) NOT NULL, location VARCHAR(200) NOT NULL, "
+            "url TEXT NOT NULL, posted_text VARCHAR(100), description TEXT, first_seen_at DATETIME NOT NULL, "
+            "score INTEGER NOT NULL, score_reasons TEXT, action VARCHAR(20) NOT NULL, emailed_at DATETIME, "
+            "status VARCHAR(20), created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO jobs (job_key, source, title, company, location, url, first_seen_at, score, action, created_at, updated_at) "
+            "VALUES ('k', 'naukri', 'Data Engineer', 'Acme', 'Pune', 'u', '2024-01-01', 10, 'QUEUE', '2024-01-01', '2024-01-01')"
+        )
+
+    init_db(engine)
+
+    repo = JobRepository(create_session_factory(engine)())
+    sig = dedup.simhash(JobPosting("naukri", "Data Engineer", "Acme", "Pune", "u"))
+    assert repo.find_near_duplicate(sig, "Data Engineer", 3) == "k"
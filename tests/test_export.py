@@ -0,0 +1,123 @@
+import csv
+import gzip
+import json
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from sqlalchemy import insert
+
+from job_agent import cli
+from job_agent.models.job import JobPosting, ObservedJob
+from job_agent.models.score import Factor, ScoreResult
+from job_agent.store import export
+from job_agent.store.models import JobRecord
+
+BASE = datetime(2024, 3, 1, tzinfo=pytz.UTC)
+
+def _insert(repo, i, status="NEW"):
+    job = JobPosting("naukri", f"Engineer {i}", "Acme", "Remote", f"https://example.com/{i}", "", "x" * 200)
+    result = ScoreResult(60, Factor.TITLE | Factor.LOCATION, (40, 20), "QUEUE")
+    repo.insert(ObservedJob(job, f"k{i:05d}", BASE + timedelta(days=i % 10)), result)
+    if status != "NEW":
+        repo.mark_status(f"k{i:05d}", status)
+
+def _bulk(repo, start, stop):
+    rows = [
+        dict(job_key=f"k{i:05d}", source="naukri", title=f"Engineer {i}", company="Acme", location="Remote",
+             url=f"https://example.com/{i}", description="x" * 200, first_seen_at=BASE, score=60,
+             score_factors=int(Factor.TITLE), score_points=b"\x28\x00", action="QUEUE", status="NEW")
+        for i in range(start, stop)
+    ]
+    repo.session.execute(insert(JobRecord), rows)
+    repo.session.commit()
+
+def test_infer_format():
+    assert export.infer_format("jobs.csv") == ("csv", "none")
+    assert export.infer_format("out/jobs.jsonl.gz") == ("jsonl", "gzip")
+    assert export.infer_format("jobs.parquet") == ("parquet", "none")
+    assert export.infer_format("jobs.txt") == (None, "none")
+
+def test_export_filters_columns_and_rows(ctx, tmp_path):
+    repo = ctx.job_repo()
+    for i in range(30):
+        _insert(repo, i, status="APPLIED" if i % 3 == 0 else "NEW")
+
+    columns = ["job_key", "first_seen_at", "reasons"]
+    chunks = list(repo.iter_export(columns, status="NEW", since=BASE + timedelta(days=5), chunk_size=4))
+    assert all(len(c) <= 4 for c in chunks)
+    rows = [r for c in chunks for r in c]
+    assert len(rows) == 10
+    assert rows[0][2] == ["Title match (+40)", "Location match (+20)"]
+
+    out = tmp_path / "jobs.csv.gz"
+    assert export.write_export(iter(chunks), str(out), "csv", columns, "gzip") == 10
+    with gzip.open(out, "rt", newline="") as fh:
+        lines = list(csv.reader(fh))
+    assert lines[0] == columns
+    assert lines[1][2] == "Title match (+40); Location match (+20)"
+
+def test_cli_export_jsonl(ctx, cfg_data, tmp_path, capsys):
+    import yaml
+
+    repo = ctx.job_repo()
+    for i in range(5):
+        _insert(repo, i)
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump(cfg_data), encoding="utf-8")
+    out = tmp_path / "jobs.jsonl"
+
+    cli.main(["export", str(out), "--config", str(config), "--columns", "job_key,score,first_seen_at"])
+
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["job_key"] for r in records] == [f"k{i:05d}" for i in range(5)]
+    assert set(records[0]) == {"job_key", "score", "first_seen_at"}
+    assert "Exported 5 jobs" in capsys.readouterr().out
+
+def test_cli_export_missing_dependency_is_a_usage_error(cfg_data, tmp_path, monkeypatch, capsys):
+    import yaml
+
+    monkeypatch.setitem(sys.modules, "pyarrow", None)  # import fails as if not installed
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump(cfg_data), encoding="utf-8")
+    out = tmp_path / "jobs.parquet"
+
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["export", str(out), "--config", str(config)])
+
+    assert exc.value.code == 2
+    assert "pip install pyarrow" in capsys.readouterr().err
+    assert not out.exists()
+
+def test_export_memory_does_not_grow_with_rows(ctx, tmp_path):
+    repo = ctx.job_repo()
+    columns = export.DEFAULT_COLUMNS
+
+    def peak(n):
+        tracemalloc.start()
+        export.write_export(repo.iter_export(columns, chunk_size=100), str(tmp_path / f"{n}.jsonl"), "jsonl", columns)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak_bytes
+
+    _bulk(repo, 0, 1000)
+    small = peak(1000)
+    _bulk(repo, 1000, 8000)
+    large = peak(8000)
+    assert large < small * 1.5
+
+def test_parquet_export(ctx, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    repo = ctx.job_repo()
+    for i in range(10):
+        _insert(repo, i)
+    columns = ["job_key", "score", "first_seen_at", "reasons"]
+    out = tmp_path / "jobs.parquet"
+    export.write_export(repo.iter_export(columns, chunk_size=4), str(out), "parquet", columns, "zstd")
+
+    table = pq.read_table(out)
+    assert table.num_rows == 10
+    assert pq.ParquetFile(out).num_row_groups == 3
+    assert table.column("reasons")[0].as_py() == ["Title match (+40)", "Location match (+20)"]
@@ -0,0 +1,126 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from job_agent.adapters import registry
+from job_agent.adapters.naukri.source import NaukriSource
+from job_agent.core import deadline
+from job_agent.core import fanout
+from job_agent.core.app import AppContext
+from job_agent.core.services import PollingService
+from job_agent.models.config import NaukriCfg, RootCfg, SourceCfg
+from job_agent.models.job import JobPosting
+
+class BoardSource:
+    """Minimal plugin: one page per URL, each fetch waiting on a shared barrier first."""
+
+    barrier = None
+    page_seconds = 0.0
+
+    def __init__(self, cfg, profiler=None):
+        self.cfg = cfg
+        self.fetched = []
+
+    def search(self, urls=None):
+        for url in self.cfg.search_urls if urls is None else urls:
+            if self.barrier:
+                self.barrier.wait()
+            deadline.current().timeout(10)
+            time.sleep(self.page_seconds)
+            self.fetched.append(url)
+            yield JobPosting("board", f"Platform Engineer {url[-1]}", "Acme", "Remote", f"{url}/job")
+
+@pytest.fixture
+def board(monkeypatch):
+    monkeypatch.setitem(registry._registered, "board", (BoardSource, SourceCfg))
+    monkeypatch.setitem(registry._registered, "board2", (BoardSource, SourceCfg))
+    monkeypatch.setattr(BoardSource, "barrier", None)
+    monkeypatch.setattr(BoardSource, "page_seconds", 0.0)
+    return BoardSource
+
+def _ctx(cfg_data, **sources):
+    cfg_data["sources"]["naukri"]["enabled"] = False
+    cfg_data["sources"].update(sources)
+    return AppContext.from_config(RootCfg(**cfg_data))
+
+def _stored_urls(ctx):
+    return sorted(ctx.job_repo().session.execute(text("SELECT url FROM jobs")).scalars())
+
+def test_registered_sources_are_polled_concurrently(board, cfg_data, profile):
+    board.barrier = threading.Barrier(2, timeout=5)  # only passes if both sources fetch at once
+    ctx = _ctx(cfg_data, board={"search_urls": ["https://a.example/1", "https://a.example/2"]},
+               board2={"search_urls": ["https://b.example/1", "https://b.example/2"]})
+    assert list(ctx.sources) == ["board", "board2"]
+
+    PollingService(ctx, profile).run_once(send_email=False)
+
+    assert _stored_urls(ctx) == [
+        f"{u}/job" for u in ["https://a.example/1", "https://a.example/2", "https://b.example/1", "https://b.example/2"]
+    ]
+
+def test_time_budget_stops_one_source_only(board, cfg_data, profile):
+    board.page_seconds = 0.2
+    ctx = _ctx(
+        cfg_data,
+        board={"search_urls": [f"https://a.example/{i}" for i in range(5)], "time_budget_seconds": 0.3},
+    )
+    fast = SimpleNamespace(search=lambda urls=None: iter(
+        [JobPosting("other", f"Engineer {i}", "Acme", "Remote", f"https://b.example/{i}") for i in range(3)]
+    ))
+    ctx.sources["fast"] = fast
+
+    PollingService(ctx, profile).run_once(send_email=False)
+
+    assert len(ctx.sources["board"].fetched) == 2
+    assert len(_stored_urls(ctx)) == 5
+
+def test_stuck_producer_does_not_hold_the_consumer(monkeypatch, caplog):
+    monkeypatch.setattr(fanout, "JOIN_TIMEOUT_SECONDS", 0.2)
+    release = threading.Event()
+
+    def hang(urls=None):
+        release.wait(5)  # a call that ignores the stop signal
+        return iter([])
+
+    fast = SimpleNamespace(search=lambda urls=None: iter(
+        [JobPosting("other", "Engineer", "Acme", "Remote", "https://b.example/1")]
+    ))
+    jobs = fanout.fan_out([fanout.SourceRun("stuck", SimpleNamespace(search=hang), None, None),
+                           fanout.SourceRun("fast", fast, None, None)])
+    started = time.monotonic()
+    assert next(jobs).url == "https://b.example/1"
+    jobs.close()
+    release.set()
+
+    assert time.monotonic() - started < 2
+    assert "Producers still running after 0.2s: source-stuck" in caplog.text
+
+class CountingHTTP:
+    def __init__(self):
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def get(self, url):
+        with self.lock:
+            self.requested.append(url)
+        return SimpleNamespace(text=url)
+
+class TwoJobParser:
+    def parse_jobs(self, html, base_url=""):
+        return [JobPosting("naukri", f"Engineer {i}", "Acme", "Remote", f"{base_url}/job-{i}") for i in range(2)]
+
+def test_naukri_fetches_ahead_and_defers_unconsumed_pages(cfg_data):
+    urls = [f"https://www.naukri.com/search-{i}" for i in range(5)]
+    source = NaukriSource(NaukriCfg(**dict(cfg_data["sources"]["naukri"], search_urls=urls, concurrency=2)))
+    source.http, source.parser = CountingHTTP(), TwoJobParser()
+
+    jobs = source.search()
+    first = [next(jobs).url for _ in range(3)]
+    jobs.close()
+
+    assert first == [f"{urls[0]}/job-0", f"{urls[0]}/job-1", f"{urls[1]}/job-0"]
+    # search-2 was fetched ahead but never consumed, so it goes first next time.
+    assert source._rotation_order(urls) == urls[2:] + urls[:2]
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytz
+from sqlalchemy import select, text
+
+from job_agent.core.app import AppContext
+from job_agent.core.services import PollingService
+from job_agent.core.utils import canonical_job_id
+from job_agent.models.config import RootCfg
+from job_agent.models.job import JobPosting, ObservedJob
+from job_agent.models.score import ScoreResult
+from job_agent.store.db import init_db
+from job_agent.store.models import JobRecord
+
+LISTING = "https://www.naukri.com/job-listings-senior-backend-engineer-acme-bangalore-5-to-8-years-120624500123"
+
+def test_canonical_ids():
+    assert canonical_job_id("naukri", f"{LISTING}?src=jobsearchDesk&sid=1718&xp=1&px=1") == "naukri:120624500123"
+    assert canonical_job_id("naukri", f"{LISTING}?src=drecomm_apply&sid=99") == "naukri:120624500123"
+    assert canonical_job_id("naukri", "https://www.naukri.com/job-listings?jobId=777888999") == "naukri:777888999"
+    # No board id: tracking parameters and fragments are dropped, the rest of the query kept.
+    other = canonical_job_id("board", "https://jobs.example/view?id=7&b=2")
+    assert canonical_job_id("board", "HTTPS://Jobs.Example/view?b=2&utm_source=mail&id=7#apply") == other
+    assert canonical_job_id("board", "https://jobs.example/view?id=8&b=2") != other
+
+def test_tracking_variants_are_stored_once(cfg_data, profile):
+    cfg_data["sources"]["naukri"]["enabled"] = False
+    ctx = AppContext.from_config(RootCfg(**cfg_data))
+    ctx.sources["fake"] = type("Fake", (), {"search": lambda self, urls=None: iter([
+        JobPosting("naukri", "Senior Backend Engineer", "Acme", "Bangalore", f"{LISTING}?src=jobsearchDesk&sid={sid}")
+        for sid in (1, 2, 3)
+    ])})()
+
+    service = PollingService(ctx, profile)
+    service.run_once(send_email=False)
+    service.run_once(send_email=False)
+
+    with ctx.job_repo() as repo:
+        assert repo.session.execute(select(JobRecord.canonical_id, JobRecord.seen_count)).all() == [
+            ("naukri:120624500123", 2)  # one row, counted once per cycle that listed it
+        ]
+
+def test_migration_merges_duplicates(ctx):
+    base = datetime(2024, 5, 1, tzinfo=pytz.UTC)
+    with ctx.job_repo() as repo:
+        for i, sid in enumerate(("a", "b", "c")):
+            job = JobPosting("naukri", "Senior Backend Engineer", "Acme", "Bangalore", f"{LISTING}?sid={sid}")
+            repo.insert(ObservedJob(job, f"k{i}", base + timedelta(days=i), f"legacy-{i}"), ScoreResult(70, 0, (), "QUEUE"))
+        repost = JobPosting("naukri", "Backend Engineer", "Acme", "Pune", "https://www.naukri.com/job-listings-x-555555555")
+        repo.insert(ObservedJob(repost, "r", base), ScoreResult(50, 0, (), "QUEUE"), duplicate_of="k2")
+        repo.mark_status("k1", "APPLIED")
+        repo.session.execute(text("UPDATE jobs SET emailed_at = :t WHERE job_key = 'k2'"), {"t": base})
+        # As a v7 database: no canonical ids yet.
+        repo.session.execute(text("UPDATE jobs SET canonical_id = NULL"))
+        repo.session.execute(text("UPDATE schema_meta SET version = 7"))
+        repo.session.commit()
+
+    init_db(ctx.engine)
+
+    with ctx.job_repo() as repo:
+        rows = {r.job_key: r for r in repo.session.execute(select(JobRecord)).scalars()}
+        assert sorted(rows) == ["k0", "r"]
+        kept = rows["k0"]
+        assert (kept.canonical_id, kept.status, kept.seen_count) == ("naukri:120624500123", "APPLIED", 3)
+        assert kept.emailed_at is not None
+        assert rows["r"].duplicate_of == "k0"
+        assert rows["r"].canonical_id == "naukri:555555555"
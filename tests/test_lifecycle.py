@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import pytz
+from sqlalchemy import event, select, text
+
+from job_agent.adapters.naukri.source import NaukriSource
+from job_agent.core.app import AppContext
+from job_agent.core.services import PollingService
+from job_agent.core.utils import canonical_job_id
+from job_agent.models.config import NaukriCfg, RootCfg
+from job_agent.models.job import JobPosting
+from job_agent.store.models import JobRecord
+
+class ListedSource:
+    """Lists whatever jobs the test puts in ``listed``."""
+
+    def __init__(self):
+        self.listed = []
+
+    def search(self, urls=None):
+        return iter([JobPosting("fake", f"Platform Engineer {n}", "Acme", "Remote", f"https://a.example/{n}")
+                     for n in self.listed])
+
+def _ctx(cfg_data, close_after_cycles):
+    cfg_data["sources"]["naukri"]["enabled"] = False
+    cfg_data["polling"]["close_after_cycles"] = close_after_cycles
+    ctx = AppContext.from_config(RootCfg(**cfg_data))
+    ctx.sources["fake"] = source = ListedSource()
+    return ctx, source
+
+def _lifecycle(ctx, n):
+    with ctx.job_repo() as repo:
+        return repo.session.execute(
+            select(JobRecord.seen_count, JobRecord.closed_at)
+            .where(JobRecord.canonical_id == canonical_job_id("fake", f"https://a.example/{n}"))
+        ).one()
+
+def test_reobserved_jobs_are_updated_in_one_statement(cfg_data, profile):
+    ctx, source = _ctx(cfg_data, close_after_cycles=None)
+    service = PollingService(ctx, profile)
+    source.listed = list(range(20))
+    service.run_once(send_email=False)
+
+    updates = []
+    def count(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE JOBS"):
+            updates.append(statement)
+    event.listen(ctx.engine, "before_cursor_execute", count)
+    service.run_once(send_email=False)
+    event.remove(ctx.engine, "before_cursor_execute", count)
+
+    assert len(updates) == 1
+    assert {_lifecycle(ctx, n).seen_count for n in range(20)} == {2}
+
+def test_unseen_jobs_close_and_reopen(cfg_data, profile):
+    ctx, source = _ctx(cfg_data, close_after_cycles=2)
+    service = PollingService(ctx, profile)
+    source.listed = [1, 2]
+    service.run_once(send_email=False)
+    with ctx.job_repo() as repo:
+        repo.session.execute(text("UPDATE jobs SET emailed_at = :now"), {"now": datetime.now(pytz.UTC)})
+        repo.session.commit()
+
+    source.listed = [1]
+    service.run_once(send_email=False)
+    assert _lifecycle(ctx, 2).closed_at is None  # one miss is not enough
+    service.run_once(send_email=False)
+    assert _lifecycle(ctx, 2).closed_at is not None
+    assert _lifecycle(ctx, 1).closed_at is None
+
+    with ctx.job_repo() as repo:
+        assert [r.title for r in repo.list_digest()] == ["Platform Engineer 1"]
+        action = repo.session.execute(select(JobRecord.action)).scalar()
+        assert [r.title for r in repo.top_backlog(action=action)] == ["Platform Engineer 1"]
+        assert len(repo.top_backlog(action=action, include_closed=True)) == 2
+
+    source.listed = [1, 2]
+    service.run_once(send_email=False)
+    assert _lifecycle(ctx, 2) == (2, None)
+
+class FlakyHTTP:
+    def __init__(self):
+        self.down = False
+        self.failing = set()
+
+    def get(self, url):
+        if self.down or url in self.failing:
+            raise ConnectionError("connection reset")
+        return SimpleNamespace(text=url)
+
+class PageParser:
+    """Five jobs per results page, or ``listed[url]``."""
+
+    def __init__(self):
+        self.listed = {}
+
+    def parse_jobs(self, html, base_url=""):
+        return [JobPosting("naukri", f"Engineer {i}", "Acme", "Remote", f"{base_url}/job-{i}", search_url=base_url)
+                for i in range(self.listed.get(base_url, 5))]
+
+@pytest.mark.parametrize("with_other_source", [False, True])
+def test_failed_fetches_do_not_close_jobs(cfg_data, profile, with_other_source):
+    ctx, other = _ctx(cfg_data, close_after_cycles=3)
+    if not with_other_source:
+        del ctx.sources["fake"]
+    naukri = NaukriSource(NaukriCfg(**dict(cfg_data["sources"]["naukri"], enabled=True,
+                                           search_urls=["https://www.naukri.com/search"])))
+    naukri.http, naukri.parser = FlakyHTTP(), PageParser()
+    ctx.sources["naukri"] = naukri
+    service = PollingService(ctx, profile)
+    other.listed = [1]
+    service.run_once(send_email=False)
+
+    naukri.http.down = True
+    other.listed = []
+    for _ in range(3):
+        service.run_once(send_email=False)
+
+    with ctx.job_repo() as repo:
+        rows = repo.session.execute(select(JobRecord.source, JobRecord.closed_at)).all()
+    # None of the 5 jobs closes, since their source never searched cleanly...
+    assert [closed for source, closed in rows if source == "naukri"] == [None] * 5
+    if with_other_source:
+        # ...while the healthy source is still swept.
+        assert [closed is not None for source, closed in rows if source == "fake"] == [True]
+
+def test_worker_sweeps_only_its_own_urls(cfg_data, profile):
+    urls = ["https://www.naukri.com/search-a", "https://www.naukri.com/search-b"]
+    cfg_data["sources"]["naukri"].update(enabled=True, search_urls=urls)
+    cfg_data["polling"]["close_after_cycles"] = 3
+    cfg_data["coordination"]["enabled"] = True
+    http, parser = FlakyHTTP(), PageParser()
+    workers = []
+    for _ in range(2):
+        ctx = AppContext.from_config(RootCfg(**cfg_data))
+        ctx.sources["naukri"].http, ctx.sources["naukri"].parser = http, parser
+        ctx.coordinator.register()
+        workers.append((ctx, PollingService(ctx, profile)))
+
+    def cycle():
+        for _, service in workers:
+            service.run_once(send_email=False)
+
+    cycle()
+    cycle()  # the first worker gives one URL to the second
+    (a, _), (b, _) = workers
+    [failing] = a.coordinator.acquire(urls)
+    [healthy] = b.coordinator.acquire(urls)
+
+    # The first worker's URL keeps failing; the second drops a job from its own.
+    http.failing = {failing}
+    parser.listed = {healthy: 4}
+    for _ in range(4):
+        cycle()
+
+    with a.job_repo() as repo:
+        rows = repo.session.execute(select(JobRecord.url, JobRecord.closed_at)).all()
+    assert len(rows) == 10
+    assert [url for url, closed in rows if closed is not None] == [f"{healthy}/job-4"]
+
+def test_sweep_uses_index(ctx, query_plan):
+    with ctx.job_repo() as repo:
+        before, now = datetime.now(pytz.UTC) - timedelta(hours=1), datetime.now(pytz.UTC)
+        for urls in (None, ["https://www.naukri.com/search-a"]):
+            plan = query_plan(ctx.engine, "UPDATE", lambda: repo.close_unseen(before, ["naukri"], now, urls))
+            assert "ix_jobs_last_seen" in plan
@@ -0,0 +1,117 @@
+import io
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from job_agent.core import logging as agent_logging
+from job_agent.core.logging import log_context, setup_logging, shutdown_logging
+
+class SlowStream(io.StringIO):
+    """A log destination that takes a while per write, like a congested log driver."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.writer = None
+
+    def write(self, s):
+        self.writer = threading.current_thread()
+        time.sleep(self.delay)
+        return super().write(s)
+
+@contextmanager
+def installed(**kwargs):
+    """Run setup_logging with the test runner's capture handlers moved aside for the block."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    root.handlers[:] = []
+    try:
+        setup_logging(**kwargs)
+        yield
+    finally:
+        shutdown_logging()
+        root.handlers[:] = handlers
+        root.setLevel(level)
+
+def _lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+def test_json_lines_carry_cycle_and_url_ids():
+    stream = io.StringIO()
+    log = logging.getLogger("job_agent.naukri")
+
+    with installed(fmt="json", stream=stream), log_context(cycle="c1"):
+        log.info("cycle started")
+        with log_context(url="u1"):
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                log.exception("fetch failed for %s", "page-1")
+
+    started, failed = _lines(stream)
+    assert started == {"ts": started["ts"], "level": "INFO", "logger": "job_agent.naukri",
+                       "msg": "cycle started", "cycle": "c1"}
+    assert (failed["msg"], failed["cycle"], failed["url"]) == ("fetch failed for page-1", "c1", "u1")
+    assert "ValueError: boom" in failed["exc"]
+
+def test_sampling_thins_info_but_keeps_warnings():
+    stream = io.StringIO()
+    noisy, other = logging.getLogger("job_agent.services.jobs"), logging.getLogger("job_agent.naukri")
+
+    with installed(fmt="json", sampling={"job_agent.services": 0.25}, stream=stream):
+        for i in range(8):
+            noisy.info("job %s", i)
+            other.info("page %s", i)
+        noisy.warning("kept")
+
+    msgs = [line["msg"] for line in _lines(stream)]
+    assert [m for m in msgs if m.startswith("job")] == ["job 0", "job 4"]
+    assert len([m for m in msgs if m.startswith("page")]) == 8
+    assert "kept" in msgs
+
+class YieldingCounter(Counter):
+    """Gives up the GIL between reading and writing a count, so unguarded updates collide."""
+
+    def __getitem__(self, key):
+        n = super().__getitem__(key)
+        time.sleep(0.0001)
+        return n
+
+def test_sampling_counts_are_exact_across_threads():
+    sampler = agent_logging.SamplingFilter({"job_agent.naukri": 0.1})
+    sampler._seen = YieldingCounter()
+    record = logging.LogRecord("job_agent.naukri", logging.INFO, __file__, 0, "page", None, None)
+    kept = []
+    start = threading.Barrier(8)
+
+    def log_pages():
+        start.wait()
+        kept.append(sum(sampler.filter(record) for _ in range(500)))
+
+    threads = [threading.Thread(target=log_pages) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sampler._seen["job_agent.naukri"] == 4000
+    assert sum(kept) == 400  # every 10th record
+
+def test_slow_output_does_not_block_callers():
+    stream = SlowStream(delay=0.05)
+    log = logging.getLogger("job_agent.services")
+
+    with installed(queue_size=10, stream=stream):
+        start = time.perf_counter()
+        for i in range(50):
+            log.info("job %s", i)
+        assert time.perf_counter() - start < 0.5  # synchronous writes would take 2.5s
+        assert agent_logging._handler.dropped > 0
+
+        time.sleep(0.8)  # let the writer catch up, then the next record reports the drops
+        log.info("after")
+    assert "dropped" in stream.getvalue()
+    assert stream.writer is not threading.current_thread()
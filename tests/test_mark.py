@@ -0,0 +1,69 @@
+import io
+from datetime import datetime
+
+import pytest
+import pytz
+import yaml
+from sqlalchemy import event, select
+
+from job_agent import cli
+from job_agent.models.job import JobPosting, ObservedJob
+from job_agent.models.score import ScoreResult
+from job_agent.store.models import JobRecord, JobStatRecord
+
+def _seed(repo, n=5):
+    now = datetime.now(pytz.UTC)
+    for i in range(n):
+        job = JobPosting("naukri", f"Engineer {i}", "Acme", "Pune", f"https://example.com/{i}")
+        repo.insert(ObservedJob(job, f"k{i}", now), ScoreResult(60, 0, (), "QUEUE"))
+
+def _statuses(repo):
+    return dict(repo.session.execute(select(JobRecord.job_key, JobRecord.status)).all())
+
+def test_read_marks():
+    lines = ["k1 applied", "# triaged on Monday", "", "k2,SKIPPED", "k3  # default", "k1 MANUAL"]
+    assert cli.read_marks(lines, "SKIPPED") == {"k1": "MANUAL", "k2": "SKIPPED", "k3": "SKIPPED"}
+    with pytest.raises(ValueError, match="line 1: no status"):
+        cli.read_marks(["k1"])
+    with pytest.raises(ValueError, match="unknown status"):
+        cli.read_marks(["k1 HIRED"])
+
+def test_bulk_mark_is_one_update(ctx):
+    with ctx.job_repo() as repo:
+        _seed(repo)
+        repo.mark_status("k4", "APPLIED")
+
+        updates = []
+        def count(conn, cursor, statement, params, context, executemany):
+            if statement.lstrip().upper().startswith("UPDATE JOBS"):
+                updates.append(statement)
+        event.listen(ctx.engine, "before_cursor_execute", count)
+        missing = repo.bulk_mark_status({"k0": "APPLIED", "nope": "APPLIED", "k1": "SKIPPED", "k4": "SKIPPED", "k9": "MANUAL"})
+        event.remove(ctx.engine, "before_cursor_execute", count)
+
+        assert missing == ["nope", "k9"]
+        assert len(updates) == 1
+        assert _statuses(repo) == {"k0": "APPLIED", "k1": "SKIPPED", "k2": "NEW", "k3": "NEW", "k4": "SKIPPED"}
+        # The aggregates moved with the statuses.
+        counts = repo.session.execute(
+            select(JobStatRecord.applied, JobStatRecord.skipped).where(JobStatRecord.dimension == "all")
+        ).one()
+        assert tuple(counts) == (1, 2)
+
+def test_mark_from_stdin(cfg_data, tmp_path, monkeypatch, capsys):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(cfg_data))
+    from job_agent.core.app import AppContext
+    from job_agent.core.config import load_config
+    ctx = AppContext.from_config(load_config(str(path)))
+    with ctx.job_repo() as repo:
+        _seed(repo, 3)
+
+    monkeypatch.setattr("sys.stdin", io.StringIO("k0\nk1 SKIPPED\nmissing\n"))
+    cli.main(["mark", "--config", str(path), "--file", "-", "--status", "APPLIED"])
+
+    out = capsys.readouterr()
+    assert out.out.strip() == "Marked 2 jobs."
+    assert out.err.strip() == "Not found (1): missing"
+    with ctx.job_repo() as repo:
+        assert _statuses(repo) == {"k0": "APPLIED", "k1": "SKIPPED", "k2": "NEW"}
@@ -0,0 +1,47 @@
+import json
+import pstats
+from types import SimpleNamespace
+
+from job_agent.adapters.naukri.source import NaukriSource
+from job_agent.core.profiling import NULL_PROFILER, STAGES, CycleProfiler
+from job_agent.core.services import PollingService
+from job_agent.models.config import NaukriCfg
+from job_agent.models.job import JobPosting
+
+class FakeHTTP:
+    def get(self, url):
+        return SimpleNamespace(text=url)
+
+class FakeParser:
+    def parse_jobs(self, html, base_url=""):
+        return [JobPosting("naukri", f"Backend Engineer {i}", "Acme", "Remote", f"{base_url}/job-{i}") for i in range(5)]
+
+def test_profiled_cycle_writes_stage_report(ctx, cfg_data, profile, tmp_path):
+    out = tmp_path / "profile"
+    ctx.profiler = CycleProfiler(str(out))
+    naukri = dict(cfg_data["sources"]["naukri"], search_urls=["https://www.naukri.com/a", "https://www.naukri.com/b"])
+    ctx.naukri_source = NaukriSource(NaukriCfg(**naukri), ctx.profiler)
+    ctx.naukri_source.http, ctx.naukri_source.parser = FakeHTTP(), FakeParser()
+
+    with ctx.profiler.cycle():
+        PollingService(ctx, profile).run_once(send_email=False)
+
+    report = json.loads((out / "stages.json").read_text(encoding="utf-8"))
+    stages = report["stages"]
+    assert list(stages) == list(STAGES)
+    assert stages["fetch"]["calls"] == 2
+    assert stages["parse"]["calls"] == 2
+    assert stages["score"]["calls"] == 10
+    assert stages["store"]["calls"] == 21  # existence check, then insert; then the lifecycle update
+    assert stages["notify"]["calls"] == 0
+    assert all(s["cpu_s"] <= report["cycle"]["cpu_s"] for s in stages.values())
+    assert stages["store"]["top_allocations"]
+
+    functions = {func for _, _, func in pstats.Stats(str(out / "cycle.pstats")).stats}
+    assert "run_once" in functions
+    assert (out / "cycle.txt").read_text(encoding="utf-8")
+
+def test_null_profiler_is_a_no_op():
+    with NULL_PROFILER.cycle():
+        with NULL_PROFILER.stage("score"):
+            pass
@@ -0,0 +1,147 @@
+import os
+from pathlib import Path
+
+import yaml
+
+from job_agent.adapters import registry
+from job_agent.core.app import AppContext
+from job_agent.core.config import load_config, load_profile
+from job_agent.core.reload import ConfigReloader
+from job_agent.core.services import PollingService
+from job_agent.models.config import SourceCfg
+
+ROOT = Path(__file__).resolve().parent.parent
+
+class FakeScheduler:
+    def __init__(self):
+        self.intervals = []
+        self.broken = False
+
+    def polling_trigger(self, polling_cfg):
+        return polling_cfg.interval_seconds
+
+    def reschedule_polling(self, polling_cfg, trigger=None):
+        if self.broken:
+            raise RuntimeError("scheduler is shutting down")
+        self.intervals.append(trigger)
+
+class BrokenSource:
+    def __init__(self, cfg, profiler=None):
+        raise ValueError("cannot build source")
+
+def _write(path: Path, data: dict):
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    # Make sure the stat check notices the rewrite even on coarse-mtime filesystems.
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+def _setup(tmp_path):
+    cfg_data = yaml.safe_load((ROOT / "config" / "config.example.yaml").read_text(encoding="utf-8"))
+    profile_data = yaml.safe_load((ROOT / "config" / "profile.example.yaml").read_text(encoding="utf-8"))
+    cfg_data["app"]["db_url"] = f"sqlite:///{tmp_path / 'agent.db'}"
+    cfg_data["email"]["enabled"] = False
+    cfg_data["profile_path"] = str(tmp_path / "profile.yaml")
+    _write(tmp_path / "config.yaml", cfg_data)
+    _write(tmp_path / "profile.yaml", profile_data)
+
+    cfg = load_config(str(tmp_path / "config.yaml"))
+    ctx = AppContext.from_config(cfg)
+    service = PollingService(ctx, load_profile(cfg.profile_path).profile)
+    scheduler = FakeScheduler()
+    reloader = ConfigReloader(ctx, service, str(tmp_path / "config.yaml"), scheduler=scheduler)
+    return cfg_data, profile_data, ctx, service, scheduler, reloader
+
+def test_unchanged_files_keep_components(tmp_path):
+    cfg_data, _, ctx, service, scheduler, reloader = _setup(tmp_path)
+    matcher, cfg, parser = service.matcher, ctx.cfg, ctx.naukri_source.parser
+
+    # Same content rewritten: stat changes, hash doesn't.
+    _write(tmp_path / "config.yaml", cfg_data)
+    reloader.check()
+
+    assert service.matcher is matcher
+    assert ctx.cfg is cfg
+    assert ctx.naukri_source.parser is parser
+    assert scheduler.intervals == []
+
+def test_changed_sections_are_swapped(tmp_path):
+    cfg_data, profile_data, ctx, service, scheduler, reloader = _setup(tmp_path)
+    http = ctx.naukri_source.http
+
+    cfg_data["scoring"]["min_score_to_email"] = 50
+    cfg_data["polling"]["interval_seconds"] = 60
+    cfg_data["sources"]["naukri"]["parsing"]["title_selectors"] = ["a.jobTitle"]
+    _write(tmp_path / "config.yaml", cfg_data)
+    profile_data["profile"]["target_titles"] = ["Staff Engineer"]
+    _write(tmp_path / "profile.yaml", profile_data)
+    reloader.check()
+
+    assert ctx.cfg.scoring.min_score_to_email == 50
+    assert service.matcher.cfg.min_score_to_email == 50
+    assert service.profile.target_titles == ["Staff Engineer"]
+    assert ctx.naukri_source.parser.cfg.title_selectors == ["a.jobTitle"]
+    assert ctx.naukri_source.http is http
+    assert scheduler.intervals == [60]
+
+def test_invalid_config_keeps_previous(tmp_path):
+    cfg_data, _, ctx, service, _, reloader = _setup(tmp_path)
+    cfg = ctx.cfg
+
+    cfg_data["scoring"]["min_score_to_email"] = "not-a-number"
+    _write(tmp_path / "config.yaml", cfg_data)
+    reloader.check()
+
+    assert ctx.cfg is cfg
+
+def test_config_change_waits_for_a_valid_profile(tmp_path):
+    cfg_data, profile_data, ctx, service, _, reloader = _setup(tmp_path)
+    cfg, profile = ctx.cfg, service.profile
+
+    cfg_data["scoring"]["min_score_to_email"] = 50
+    _write(tmp_path / "config.yaml", cfg_data)
+    _write(tmp_path / "profile.yaml", {"profile": {"target_titles": "not-a-list"}})
+    reloader.check()
+
+    assert ctx.cfg is cfg
+    assert service.profile is profile
+
+    # Fixing the profile applies both files' changes, the config edit included.
+    profile_data["profile"]["target_titles"] = ["Staff Engineer"]
+    _write(tmp_path / "profile.yaml", profile_data)
+    reloader.check()
+
+    assert ctx.cfg.scoring.min_score_to_email == 50
+    assert service.matcher.cfg.min_score_to_email == 50
+    assert service.profile.target_titles == ["Staff Engineer"]
+
+def test_failing_step_swaps_nothing(tmp_path, monkeypatch):
+    monkeypatch.setitem(registry._registered, "broken", (BrokenSource, SourceCfg))
+    cfg_data, _, ctx, service, scheduler, reloader = _setup(tmp_path)
+    cfg, matcher, naukri = ctx.cfg, service.matcher, ctx.naukri_source
+    parser = naukri.parser
+
+    # The matcher and naukri's replacement are built before the new source fails.
+    cfg_data["scoring"]["min_score_to_email"] = 50
+    cfg_data["sources"]["naukri"]["parsing"]["title_selectors"] = ["a.jobTitle"]
+    cfg_data["sources"]["broken"] = {"search_urls": ["https://b.example/1"]}
+    _write(tmp_path / "config.yaml", cfg_data)
+    reloader.check()
+
+    assert (ctx.cfg, service.matcher, ctx.naukri_source) == (cfg, matcher, naukri)
+    assert naukri.parser is parser
+
+    # Without the bad source, rescheduling fails instead: still nothing is swapped.
+    del cfg_data["sources"]["broken"]
+    cfg_data["polling"]["interval_seconds"] = 60
+    _write(tmp_path / "config.yaml", cfg_data)
+    scheduler.broken = True
+    reloader.check()
+
+    assert (ctx.cfg, service.matcher, ctx.naukri_source) == (cfg, matcher, naukri)
+    assert naukri.parser is parser
+
+    scheduler.broken = False
+    reloader.check()
+    assert ctx.cfg.scoring.min_score_to_email == 50
+    assert ctx.naukri_source.parser.cfg.title_selectors == ["a.jobTitle"]
+    assert scheduler.intervals == [60]
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import pytz
+
+from job_agent.core.services import RescoreService
+from job_agent.models.job import JobPosting, ObservedJob
+from job_agent.models.score import ScoreResult
+
+def _insert(ctx, key, title, score, action):
+    job = JobPosting("naukri", title, "Acme", "Remote", f"https://example.com/{key}", "Just now")
+    ctx.job_repo().insert(ObservedJob(job, key, datetime.now(pytz.UTC)), ScoreResult(score, 0, (), action))
+
+def _seed(ctx):
+    _insert(ctx, "a", "Senior Backend Engineer - Node.js AWS PostgreSQL", 10, "QUEUE")
+    _insert(ctx, "b", "Sales Intern", 0, "SKIP")
+    _insert(ctx, "c", "Platform Engineer", 90, "EMAIL")
+
+def _stored(ctx):
+    from job_agent.store.models import JobRecord
+    return {r.job_key: (r.score, r.action) for r in ctx.job_repo().session.query(JobRecord)}
+
+def test_dry_run_reports_without_writing(ctx, profile):
+    _seed(ctx)
+    before = _stored(ctx)
+
+    report = RescoreService(ctx, profile).run(chunk_size=2, workers=0, dry_run=True)
+
+    assert report.scanned == 3
+    assert report.transitions[("QUEUE", "EMAIL")] == 1
+    assert report.transitions[("EMAIL", "QUEUE")] == 1
+    assert "1 jobs would now be EMAIL (were QUEUE: 1)" in report.lines(dry_run=True)
+    assert _stored(ctx) == before
+
+def test_pool_writes_only_changed_rows(ctx, profile):
+    _seed(ctx)
+
+    report = RescoreService(ctx, profile).run(chunk_size=1, workers=2)
+
+    assert report.scanned == 3
+    assert report.changed == 2
+    stored = _stored(ctx)
+    assert stored["a"][1] == "EMAIL"
+    assert stored["b"] == (0, "SKIP")
+    assert stored["c"][1] == "QUEUE"
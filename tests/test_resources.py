@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import text
+
+from job_agent.adapters.notify.gmail_smtp import GmailSMTPClient
+from job_agent.core.app import AppContext
+from job_agent.core.services import PollingService
+from job_agent.models.config import GmailCfg, RootCfg
+from job_agent.models.job import JobPosting
+
+def test_cycle_returns_its_connection(cfg_data, profile):
+    cfg_data["sources"]["naukri"]["enabled"] = False
+    ctx = AppContext.from_config(RootCfg(**cfg_data))
+    ctx.sources["fake"] = type("Fake", (), {"search": lambda self, urls=None: iter(
+        [JobPosting("fake", "Platform Engineer", "Acme", "Remote", "https://a.example/1")]
+    )})()
+
+    for _ in range(3):
+        PollingService(ctx, profile).run_once(send_email=False)
+
+    assert ctx.engine.pool.checkedout() == 0
+    assert ctx.engine.pool.checkedin() == 1  # one connection, reused by every cycle
+
+def test_repo_rolls_back_and_closes_on_error(ctx):
+    with ctx.job_repo() as repo:
+        repo.session.execute(text("INSERT INTO schema_meta (version) VALUES (99)"))
+        repo.session.commit()
+    with pytest.raises(RuntimeError):
+        with ctx.job_repo() as repo:
+            repo.session.execute(text("UPDATE schema_meta SET version = 100 WHERE version = 99"))
+            raise RuntimeError("boom")
+
+    assert ctx.engine.pool.checkedout() == 0
+    with ctx.job_repo() as repo:
+        assert 100 not in repo.session.execute(text("SELECT version FROM schema_meta")).scalars().all()
+
+class FakeSMTP:
+    calls = []
+
+    def __init__(self, host, port, timeout=None):
+        self.calls.append(("connect", host, port))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def starttls(self):
+        self.calls.append(("starttls",))
+
+    def login(self, user, password):
+        self.calls.append(("login", user))
+
+    def send_message(self, msg):
+        self.calls.append(("send", msg["To"]))
+
+def test_smtp_relay_settings(monkeypatch):
+    monkeypatch.setattr("smtplib.SMTP", FakeSMTP)
+    monkeypatch.setattr(FakeSMTP, "calls", [])
+    relay = GmailCfg(enabled=True, username="me", smtp_host="relay.internal", smtp_port=25, starttls=False, gmail_app_password="")
+
+    GmailSMTPClient(relay).send_email("me@example.com", ["you@example.com"], "hi", "<p>hi</p>")
+
+    assert FakeSMTP.calls == [("connect", "relay.internal", 25), ("send", "you@example.com")]
@@ -0,0 +1,95 @@
+import threading
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, JobExecutionEvent
+
+from job_agent.adapters.naukri.source import NaukriSource
+from job_agent.adapters.scheduler import Scheduler
+from job_agent.core import deadline
+from job_agent.core.deadline import Deadline, DeadlineExceeded
+from job_agent.core.services import PollingService
+from job_agent.models.config import DigestCfg, NaukriCfg, PollingCfg
+from job_agent.models.job import JobPosting
+
+URLS = [f"https://www.naukri.com/search-{i}" for i in range(4)]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class SlowHTTP:
+    """Each request takes 10 fake seconds and records the timeout it was given."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.timeouts = []
+
+    def get(self, url):
+        self.timeouts.append(deadline.current().timeout(20))
+        self.clock.now += 10
+        return SimpleNamespace(text=url)
+
+class FakeParser:
+    def parse_jobs(self, html, base_url=""):
+        return [JobPosting("naukri", "Engineer", "Acme", "Remote", f"{base_url}/job")]
+
+def test_deadline_caps_timeouts_and_expires():
+    clock = FakeClock()
+    d = Deadline(30, clock=clock)
+    assert d.timeout(20) == 20
+    clock.now = 25
+    assert d.timeout(20) == 5
+    clock.now = 30
+    assert d.expired
+    with pytest.raises(DeadlineExceeded):
+        d.timeout(20)
+    assert deadline.current().timeout(20) == 20
+
+def test_cycle_stops_at_deadline_and_defers_the_rest(ctx, cfg_data, profile):
+    clock = FakeClock()
+    source = NaukriSource(NaukriCfg(**dict(cfg_data["sources"]["naukri"], search_urls=URLS)))
+    source.http, source.parser = SlowHTTP(clock), FakeParser()
+    ctx.naukri_source = source
+
+    with Deadline(25, clock=clock).active():
+        PollingService(ctx, profile).run_once(send_email=False)
+
+    assert source.http.timeouts == [20, 15, 5]
+    assert source._rotation_order(URLS) == URLS[3:] + URLS[:3]
+
+def test_overruns_and_skipped_fires_are_counted():
+    scheduler = Scheduler(PollingCfg(interval_seconds=60, jitter_seconds=0, max_jobs_per_run=10),
+                          DigestCfg(enabled=False, hour=0, minute=0))
+    scheduler._guarded("polling", lambda: 0.01, lambda: time.sleep(0.05))()
+    scheduler._on_event(JobExecutionEvent(EVENT_JOB_MAX_INSTANCES, "polling", None, datetime.now(timezone.utc)))
+
+    assert scheduler.stats[("polling", "overrun")] == 1
+    assert scheduler.stats[("polling", "skipped")] == 1
+
+def test_digest_runs_while_polling_is_stuck():
+    release, digest_ran = threading.Event(), threading.Event()
+    polling = SimpleNamespace(run_once=lambda: release.wait(10))
+    digest = SimpleNamespace(run_daily=digest_ran.set)
+    scheduler = Scheduler(PollingCfg(interval_seconds=1, jitter_seconds=0, max_jobs_per_run=10),
+                          DigestCfg(enabled=True, hour=0, minute=0))
+    thread = threading.Thread(target=scheduler.run, args=(polling, digest), daemon=True)
+    thread.start()
+    try:
+        for _ in range(50):
+            if "polling" in scheduler._running:
+                break
+            time.sleep(0.1)
+        assert "polling" in scheduler._running
+        scheduler.scheduler.modify_job("digest", next_run_time=datetime.now(timezone.utc))
+        assert digest_ran.wait(5)
+        assert "polling" in scheduler._running
+    finally:
+        release.set()
+        scheduler.scheduler.shutdown(wait=False)
+        thread.join(5)
@@ -1,3 +1,5 @@
+import pytest
+
 from job_agent.core.scoring import score
 from job_agent.models.job import JobPosting
 from job_agent.models.profile import Profile, CompanyPrefs
@@ -32,3 +34,41 @@ def test_high_match_scores_email():
 
     result = score(job, profile, cfg)
     assert result.action == "EMAIL"
+
+def test_reasons_are_rendered_from_factors():
+    from job_agent.models.score import Factor, ScoreResult, pack_points, unpack_points
+
+    result = ScoreResult(35, int(Factor.TITLE | Factor.COMPANY_AVOID | Factor.FRESHNESS), (25, 20, 10), "QUEUE")
+
+    assert result.reasons == ["Title match (+25)", "Avoided company (-20)", "Freshness (+10)"]
+    assert unpack_points(pack_points(result.points)) == result.points
+
+def test_similarity_factor_ranks_resume_like_descriptions(profile):
+    from job_agent.core.scoring import ScoringMatcher
+    from job_agent.core.similarity import ProfileSimilarity
+    from job_agent.models.config import FreshnessBoostCfg, HardFiltersCfg, ScoringCfg, WeightsCfg
+    from job_agent.models.score import Factor
+
+    cfg = ScoringCfg(
+        min_score_to_email=90,
+        freshness_boost=FreshnessBoostCfg(just_now=15, today=10, last_3_days=6),
+        weights=WeightsCfg(title_match=25, skill_match=45, seniority_match=12, location_match=8, company_pref=10, similarity=15),
+        hard_filters=HardFiltersCfg(reject_title_keywords=[], reject_desc_keywords=[]),
+    )
+    near = JobPosting("naukri", "Backend Engineer", "X", "Pune", "https://example.com/1", "",
+                      "Design scalable search architecture on PostgreSQL for a marketplace platform")
+    far = JobPosting("naukri", "Accountant", "X", "Pune", "https://example.com/2", "",
+                     "Prepare ledgers, reconcile invoices and file quarterly tax returns")
+    empty = JobPosting("naukri", "", "X", "Pune", "https://example.com/3")
+
+    sim = ProfileSimilarity(profile)
+    batch = sim.similarities([f"{j.title}\n{j.description}" for j in (near, far, empty)])
+    assert batch == pytest.approx([sim.similarity(f"{j.title}\n{j.description}") for j in (near, far, empty)])
+    assert batch[0] > 0.2 > batch[1] and batch[2] == 0.0
+
+    matcher = ScoringMatcher(profile, cfg)
+    results = matcher.score_many([near, far])
+    assert results == [matcher.score(near), matcher.score(far)]
+    assert results[0].factors & Factor.SIMILARITY
+    assert any(r.startswith("Profile similarity") for r in results[0].reasons)
+    assert not results[1].factors & Factor.SIMILARITY
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytz
+from sqlalchemy import text
+
+from job_agent.models.job import JobPosting, ObservedJob
+from job_agent.models.score import ScoreResult
+from job_agent.store.db import create_engine_from_url, create_session_factory, init_db
+from job_agent.store.models import Base
+from job_agent.store.repo import JobRepository
+
+def _insert(repo, key, title, company="Acme", description="", score=50):
+    job = JobPosting("naukri", title, company, "Bangalore", f"https://example.com/{key}", "", description)
+    repo.insert(ObservedJob(job, key, datetime.now(pytz.UTC)), ScoreResult(score, 0, (), "QUEUE"))
+
+def test_search_ranks_title_matches_first(ctx):
+    repo = ctx.job_repo()
+    _insert(repo, "a", "Java Developer", description="Some Kubernetes exposure")
+    _insert(repo, "b", "Kubernetes Platform Engineer")
+    _insert(repo, "c", "Frontend Engineer")
+
+    keys = [r.job_key for r in repo.search("kubernetes")]
+    assert keys == ["b", "a"]
+    assert [r.job_key for r in repo.search("platform kube*")] == ["b"]
+    assert repo.search("kubernetes", min_score=60) == []
+
+def test_search_index_follows_updates_and_deletes(ctx):
+    repo = ctx.job_repo()
+    _insert(repo, "a", "Data Engineer")
+    repo.session.execute(text("UPDATE jobs SET title = 'Search Engineer' WHERE job_key = 'a'"))
+    repo.session.commit()
+
+    assert repo.search("data") == []
+    assert [r.job_key for r in repo.search("search")] == ["a"]
+
+    repo.session.execute(text("DELETE FROM jobs WHERE job_key = 'a'"))
+    repo.session.commit()
+    assert repo.search("search") == []
+
+def test_existing_rows_are_backfilled(tmp_path):
+    # A database from before the search index existed.
+    engine = create_engine_from_url(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.tables["jobs"].create(engine)
+    Base.metadata.tables["job_stats"].create(engine)  # written by inserts
+    repo = JobRepository(create_session_factory(engine)())
+    for i in range(5):
+        _insert(repo, f"k{i}", f"Golang Engineer {i}")
+    repo.session.close()
+
+    init_db(engine)
+    repo = JobRepository(create_session_factory(engine)())
+    _insert(repo, "new", "Golang Lead")
+
+    assert len(repo.search("golang", limit=50)) == 6
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from job_agent import cli
+from job_agent.core import simulate
+from job_agent.core.scoring import ScoringMatcher
+from job_agent.models.job import JobPosting, ObservedJob
+from job_agent.models.score import ScoreResult
+
+np = pytest.importorskip("numpy")
+
+BASE = datetime(2024, 3, 1, 9, tzinfo=pytz.UTC)
+
+JOBS = [
+    ("Senior Backend Engineer", "Stripe", "Remote", "Just now", "Node.js AWS PostgreSQL marketplace search"),
+    ("Platform Engineer", "Acme", "Bangalore", "Today", "Kubernetes Docker platform"),
+    ("Senior Full Stack Engineer", "Confidential", "Pune", "2 days ago", "Node.js Redis e-commerce"),
+    ("Data Analyst", "Acme", "Mumbai", "30+ days ago", "Excel dashboards"),
+    ("Sales Intern", "Acme", "Remote", "Just now", "cold calling"),
+    ("Lead Platform Engineer", "Deliveroo", "Chennai", "1 day ago", "AWS platform search Elasticsearch"),
+]
+
+def _seed(ctx):
+    repo = ctx.job_repo()
+    for i, (title, company, location, posted, desc) in enumerate(JOBS):
+        job = JobPosting("naukri", title, company, location, f"https://example.com/{i}", posted, desc)
+        duplicate_of = "j0" if i == 5 else None
+        repo.insert(ObservedJob(job, f"j{i}", BASE + timedelta(days=i)), ScoreResult(0, 0, (), "QUEUE"),
+                    duplicate_of=duplicate_of)
+    repo.mark_status("j0", "APPLIED")
+    repo.mark_status("j2", "APPLIED")
+
+def _history(ctx, profile, variants):
+    from job_agent.core.similarity import ProfileSimilarity
+    matcher = ScoringMatcher(profile, ctx.cfg.scoring)
+    history = simulate.load_history(ctx.job_repo(), matcher, ctx.clock.tz, ProfileSimilarity(profile))
+    return matcher, history
+
+def test_vectorized_scores_match_the_scorer(ctx, profile):
+    _seed(ctx)
+    variants = simulate.grid(ctx.cfg.scoring, [
+        simulate.parse_axis("weights.skill_match=20,60"),
+        simulate.parse_axis("weights.similarity=0,15"),
+        simulate.parse_axis("freshness_boost.today=0,25"),
+    ])
+    matcher, history = _history(ctx, profile, variants)
+
+    got = simulate.scores(history, variants)
+
+    from job_agent.core.similarity import ProfileSimilarity
+    sim = ProfileSimilarity(profile)
+    for v, row in zip(variants, got):
+        expected = []
+        for title, company, location, posted, desc in JOBS:
+            job = JobPosting("naukri", title, company, location, "", posted, desc)
+            expected.append(matcher.weigh(matcher.match(job, sim.similarity(f"{title}\n{desc}")), v.cfg).score)
+        assert row.tolist() == expected, v.label
+
+def test_report_counts_emails_and_applied_overlap(ctx, profile):
+    _seed(ctx)
+    variants = simulate.grid(ctx.cfg.scoring, [simulate.parse_axis("min_score_to_email=0,101")])
+    _, history = _history(ctx, profile, variants)
+
+    report = simulate.simulate(history, variants, block_cells=len(history))  # one variant per block
+
+    assert (report.jobs, report.days, report.applied) == (6, 6, 2)
+    everything, nothing = report.results[1], report.results[2]
+    # The intern is hard-filtered and j5 is a repost, so at most four emails.
+    assert (everything.emails, everything.applied_caught) == (4, 2)
+    assert everything.per_day == pytest.approx(4 / 6)
+    assert (nothing.emails, nothing.applied_caught) == (0, 0)
+
+def test_cli_rejects_unknown_settings(cfg_data, tmp_path):
+    import yaml
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(cfg_data))
+    with pytest.raises(SystemExit):
+        cli.main(["simulate", "--config", str(path), "--vary", "weights.charisma=1,2"])
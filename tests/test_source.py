@@ -0,0 +1,145 @@
+from types import SimpleNamespace
+
+import pytest
+
+from job_agent.adapters.naukri.source import NaukriSource
+from job_agent.core.deadline import Deadline, DeadlineExceeded
+from job_agent.core.services import PollingService
+from job_agent.models.config import NaukriCfg
+from job_agent.models.job import JobPosting
+
+URLS = [f"https://www.naukri.com/search-{i}" for i in range(4)]
+
+class FakeHTTP:
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url):
+        self.requested.append(url)
+        return SimpleNamespace(text=url)
+
+class FakeParser:
+    def parse_jobs(self, html, base_url=""):
+        return [JobPosting("naukri", f"Engineer {i}", "Acme", "Remote", f"{base_url}/job-{i}") for i in range(2)]
+
+def _source(cfg_data):
+    naukri = dict(cfg_data["sources"]["naukri"], search_urls=URLS)
+    source = NaukriSource(NaukriCfg(**naukri))
+    source.http, source.parser = FakeHTTP(), FakeParser()
+    return source
+
+def test_search_is_lazy_and_rotates_unfetched_urls(cfg_data):
+    source = _source(cfg_data)
+
+    jobs = source.search()
+    assert [next(jobs).url for _ in range(3)][-1] == f"{URLS[1]}/job-0"
+    jobs.close()
+    assert source.http.requested == URLS[:2]
+
+    source.http.requested.clear()
+    list(source.search())
+    assert source.http.requested == URLS[2:] + URLS[:2]
+
+def test_poll_cycle_stops_requesting_at_max_jobs(ctx, cfg_data, profile):
+    ctx.cfg.polling.max_jobs_per_run = 3
+    ctx.naukri_source = _source(cfg_data)
+
+    PollingService(ctx, profile).run_once(send_email=False)
+
+    assert ctx.naukri_source.http.requested == URLS[:2]
+
+def _results_page(n):
+    cards = "".join(
+        f'<div class="cust-job-tuple"><a class="title" href="/job-{i}">Platform Engineer {i}</a>'
+        f'<span class="comp-name">Acme</span><span class="locWdth">Bengaluru</span>'
+        f'<span class="job-post-day">Just now</span></div>'
+        for i in range(n)
+    )
+    return f"<html><body>{cards}</body></html>".encode("utf-8")
+
+def test_parse_pool_matches_inline_and_skips_small_pages(cfg_data):
+    from job_agent.adapters.naukri.parse_pool import ParsePool
+    from job_agent.models.config import ParsingCfg
+
+    cfg = ParsingCfg(**dict(cfg_data["sources"]["naukri"]["parsing"], processes=2, process_min_bytes=4096))
+    pool = ParsePool(cfg)
+    try:
+        small = pool.parse(_results_page(2), "utf-8", URLS[0])
+        assert pool._pool is None and len(small) == 2
+
+        big = _results_page(200)
+        inline = pool.parser.parse_jobs(big, URLS[0], "utf-8")
+        assert len(inline) == 200
+        assert pool.parse(big, "utf-8", URLS[0]) == inline
+        assert pool._pool is not None
+    finally:
+        pool.close()
+
+def test_parse_pool_recovers_from_a_dead_worker_and_honours_the_deadline(cfg_data):
+    from job_agent.adapters.naukri.parse_pool import ParsePool
+    from job_agent.models.config import ParsingCfg
+
+    cfg = ParsingCfg(**dict(cfg_data["sources"]["naukri"]["parsing"], processes=1, process_min_bytes=4096))
+    pool = ParsePool(cfg)
+    big = _results_page(200)
+    try:
+        assert len(pool.parse(big, "utf-8", URLS[0])) == 200
+        broken = pool._pool
+        for process in list(broken._processes.values()):
+            process.kill()  # as if OOM-killed
+            process.join()
+
+        assert len(pool.parse(big, "utf-8", URLS[0])) == 200  # parsed inline
+        assert pool._pool is None
+        assert len(pool.parse(big, "utf-8", URLS[0])) == 200  # on a fresh pool
+        assert pool._pool is not None and pool._pool is not broken
+
+        with Deadline(0).active(), pytest.raises(DeadlineExceeded):
+            pool.parse(big, "utf-8", URLS[0])
+    finally:
+        pool.close()
+
+class StreamingResponse:
+    """Serves a page in small chunks and records how many were read."""
+
+    def __init__(self, body, chunk=64):
+        self.chunks = [body[i:i + chunk] for i in range(0, len(body), chunk)]
+        self.read = 0
+        self.encoding = "utf-8"
+        self.closed = False
+
+    def iter_content(self, size):
+        for c in self.chunks:
+            self.read += 1
+            yield c
+
+    def close(self):
+        self.closed = True
+
+class StreamingHTTP:
+    def __init__(self, body):
+        self.body = body
+        self.responses = []
+
+    def get(self, url, stream=False):
+        assert stream
+        self.responses.append(StreamingResponse(self.body))
+        return self.responses[-1]
+
+def test_streaming_parse_yields_cards_early_and_stops_after_results(cfg_data):
+    parsing = dict(cfg_data["sources"]["naukri"]["parsing"], streaming=True, results_selector="div.results")
+    source = NaukriSource(NaukriCfg(**dict(cfg_data["sources"]["naukri"], search_urls=URLS[:1], parsing=parsing)))
+    cards = _results_page(20).decode()[len("<html><body>"):-len("</body></html>")]
+    body = f'<html><body><div class="results">{cards}</div><footer>{"x" * 20000}</footer></body></html>'.encode()
+    source.http = StreamingHTTP(body)
+
+    jobs = source.search()
+    first = next(jobs)
+    response = source.http.responses[0]
+    assert first.url == "https://www.naukri.com/job-0"
+    assert response.read < len(response.chunks) // 10
+
+    rest = list(jobs)
+    assert [first] + rest == source.parser.parse_jobs(body, URLS[0], "utf-8")
+    assert response.read < len(response.chunks) // 2  # the footer was never downloaded
+    assert response.closed
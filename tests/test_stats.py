@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import pytz
+import yaml
+from sqlalchemy import select
+
+from job_agent import cli
+from job_agent.adapters.notify.render import EmailRenderer
+from job_agent.models.job import JobPosting, ObservedJob
+from job_agent.models.score import ScoreResult
+from job_agent.store.models import JobStatRecord
+
+SEARCH = "https://www.naukri.com/backend-jobs"
+
+def _insert(repo, key, company, score, seen, duplicate_of=None):
+    job = JobPosting("naukri", f"Engineer {key}", company, "Pune", f"https://example.com/{key}", search_url=SEARCH)
+    repo.insert(ObservedJob(job, key, seen), ScoreResult(score, 0, (), "QUEUE"), duplicate_of=duplicate_of)
+
+def _seed(repo):
+    now = datetime.now(pytz.UTC)
+    _insert(repo, "a", "Acme", 85, now)
+    _insert(repo, "b", "Acme", 45, now)
+    _insert(repo, "c", "Stripe", 70, now - timedelta(days=1))
+    _insert(repo, "d", "Acme", 85, now, duplicate_of="a")  # reposts are not counted
+    repo.mark_emailed("a")
+    repo.mark_emailed("a")
+    repo.mark_status("a", "APPLIED")
+    repo.mark_status("b", "SKIPPED")
+    repo.mark_status("b", "APPLIED")
+
+def _table(repo):
+    return sorted(tuple(r) for r in repo.session.execute(select(JobStatRecord.__table__)))
+
+def test_incremental_counts_match_a_rebuild(ctx):
+    with ctx.job_repo() as repo:
+        _seed(repo)
+        incremental = _table(repo)
+        repo.rebuild_stats()
+        assert _table(repo) == incremental
+
+        today = ctx.clock.now_local().date()
+        rows = {r.value: r for r in repo.stat_totals("company", today - timedelta(days=1), today)}
+        assert (rows["Acme"].new_jobs, rows["Acme"].emailed, rows["Acme"].applied, rows["Acme"].skipped) == (2, 1, 2, 0)
+        assert rows["Stripe"].new_jobs == 1
+        assert [(r.value, r.new_jobs) for r in repo.stat_totals("score_band", today, today)] == [("40-59", 1), ("80-100", 1)]
+        assert repo.stat_totals("search_url", today, today)[0].email_rate == 0.5
+
+def test_digest_header_reads_the_day(ctx):
+    with ctx.job_repo() as repo:
+        _seed(repo)
+        day = repo.day_stats(ctx.clock.now_local().date())
+
+    assert (day.new_jobs, day.emailed, day.applied) == (2, 1, 2)
+    html = EmailRenderer().render_digest([], day)
+    assert "Today: 2 new jobs, 1 emailed, 2 applied, 0 skipped." in html
+    assert "Acme (2)" in html
+
+def test_stats_command(cfg_data, tmp_path, capsys):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(cfg_data))
+    cli.main(["stats", "--config", str(path)])
+    assert "No jobs first seen" in capsys.readouterr().out
+
+    from job_agent.core.app import AppContext
+    from job_agent.core.config import load_config
+    with AppContext.from_config(load_config(str(path))).job_repo() as repo:
+        _seed(repo)
+    cli.main(["stats", "--config", str(path), "--by", "company", "--rebuild"])
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].startswith("Rebuilt ")
+    assert out[2].split() == ["Acme", "2", "1", "50%", "2", "0"]
+    assert out[3].split() == ["Stripe", "1", "0", "0%", "0", "0"]
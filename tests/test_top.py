@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+import pytz
+
+from job_agent.models.job import JobPosting, ObservedJob
+from job_agent.models.score import ScoreResult
+
+def _insert(repo, key, score, seen, action="QUEUE", location="Remote", company="Acme"):
+    job = JobPosting("naukri", f"Engineer {key}", company, location, f"https://example.com/{key}")
+    repo.insert(ObservedJob(job, key, seen), ScoreResult(score, 0, (), action))
+
+def test_keyset_pages_cover_backlog_in_order(ctx):
+    repo = ctx.job_repo()
+    base = datetime(2024, 1, 1, tzinfo=pytz.UTC)
+    for i in range(25):
+        _insert(repo, f"q{i:02d}", score=40 + i % 5, seen=base + timedelta(hours=i))
+    _insert(repo, "emailed", 95, base, action="EMAIL")
+    _insert(repo, "applied", 70, base)
+    repo.mark_status("applied", "APPLIED")
+
+    pages, after = [], None
+    while True:
+        rows = repo.top_backlog(limit=10, after=after)
+        pages.append([r.job_key for r in rows])
+        if len(rows) < 10:
+            break
+        last = rows[-1]
+        after = (last.score, last.first_seen_at, last.job_key)
+
+    keys = [k for page in pages for k in page]
+    expected = sorted(
+        (f"q{i:02d}" for i in range(25)),
+        key=lambda k: (40 + int(k[1:]) % 5, int(k[1:])),
+        reverse=True,
+    )
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert keys == expected
+
+def test_filters_and_index_use(ctx, query_plan):
+    repo = ctx.job_repo()
+    now = datetime.now(pytz.UTC)
+    _insert(repo, "a", 50, now, location="Bangalore", company="Stripe India")
+    _insert(repo, "b", 60, now, location="Pune", company="Stripe India")
+
+    assert [r.job_key for r in repo.top_backlog(location="bangalore")] == ["a"]
+    assert [r.job_key for r in repo.top_backlog(company="stripe")] == ["b", "a"]
+
+    for page in ({}, {"after": (60, now, "b")}):
+        plan = query_plan(ctx.engine, "SELECT", lambda: repo.top_backlog(**page))
+        assert "ix_jobs_backlog" in plan
+        assert "TEMP B-TREE" not in plan